@@ -17,8 +17,8 @@ class AcademicYearCreateSerializer(serializers.ModelSerializer):
         fields = ['name', 'start_date', 'end_date', 'is_current']
 
     def validate_name(self, value):
-        school = self.context['school']
-        if AcademicYear.objects.filter(school=school, name=value).exists():
+        school_id = self.context['school_id']
+        if AcademicYear.objects.filter(school_id=school_id, name=value).exists():
             raise serializers.ValidationError(
                 f"An academic year named '{value}' already exists for this school."
             )
@@ -61,8 +61,8 @@ class ClassLevelCreateSerializer(serializers.ModelSerializer):
         fields = ['name', 'custom_name', 'order', 'is_active']
 
     def validate_name(self, value):
-        school = self.context['school']
-        if ClassLevel.objects.filter(school=school, name=value).exists():
+        school_id = self.context['school_id']
+        if ClassLevel.objects.filter(school_id=school_id, name=value).exists():
             raise serializers.ValidationError(
                 f"Class level '{value}' already exists for this school."
             )
@@ -101,13 +101,13 @@ class ClassRoomCreateSerializer(serializers.ModelSerializer):
         ]
 
     def validate(self, attrs):
-        school = self.context['school']
+        school_id = self.context['school_id']
         academic_year = self.context['academic_year']
         class_level = attrs.get('class_level')
         section_name = attrs.get('section_name', '')
 
         qs = ClassRoom.objects.filter(
-            school=school,
+            school_id=school_id,
             academic_year=academic_year,
             class_level=class_level,
             section_name=section_name,
@@ -140,8 +140,8 @@ class SubjectCreateSerializer(serializers.ModelSerializer):
         fields = ['name', 'code', 'subject_type', 'elective_group', 'is_active']
 
     def validate_name(self, value):
-        school = self.context['school']
-        qs = Subject.objects.filter(school=school, name=value)
+        school_id = self.context['school_id']
+        qs = Subject.objects.filter(school_id=school_id, name=value)
         if self.instance:
             qs = qs.exclude(pk=self.instance.pk)
         if qs.exists():
@@ -189,4 +189,104 @@ class SubjectAssignmentCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 "This subject is already assigned to this classroom for this term."
             )
-        return attrs
\ No newline at end of file
+        return attrs
+
+
+# ── Bulk create ───────────────────────────────────────────────────────────
+# Item serializers only check shape. Foreign keys are plain ids and
+# uniqueness is not checked per item — apps.academics.services.bulk
+# resolves both for the whole batch in a handful of queries.
+
+class ClassRoomBulkItemSerializer(serializers.ModelSerializer):
+    class_level = serializers.IntegerField()
+    form_teacher = serializers.IntegerField(required=False, allow_null=True)
+    branch = serializers.IntegerField(required=False, allow_null=True)
+
+    class Meta:
+        model = ClassRoom
+        fields = [
+            'class_level', 'section_name', 'elective_group',
+            'form_teacher', 'branch', 'capacity', 'is_active',
+        ]
+        validators = []
+
+
+class SubjectBulkItemSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Subject
+        fields = ['name', 'code', 'subject_type', 'elective_group', 'is_active']
+        validators = []
+
+
+class SubjectAssignmentBulkItemSerializer(serializers.ModelSerializer):
+    subject = serializers.IntegerField()
+    classroom = serializers.IntegerField()
+    teacher = serializers.IntegerField(required=False, allow_null=True)
+    term = serializers.IntegerField()
+
+    class Meta:
+        model = SubjectAssignment
+        fields = ['subject', 'classroom', 'teacher', 'term', 'periods_per_week']
+        validators = []
+
+
+# ── Rollover ──────────────────────────────────────────────────────────────
+
+class RolloverTermSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Term
+        fields = ['name', 'start_date', 'end_date']
+        validators = []
+
+
+class AcademicYearRolloverSerializer(AcademicYearCreateSerializer):
+    terms = RolloverTermSerializer(many=True, required=False)
+    term_map = serializers.DictField(
+        child=serializers.ChoiceField(choices=Term.TERM_CHOICES), required=False
+    )
+    teacher_map = serializers.DictField(
+        child=serializers.IntegerField(allow_null=True), required=False
+    )
+    copy_assignments = serializers.BooleanField(default=True)
+
+    class Meta(AcademicYearCreateSerializer.Meta):
+        fields = AcademicYearCreateSerializer.Meta.fields + [
+            'terms', 'term_map', 'teacher_map', 'copy_assignments',
+        ]
+
+    def validate_terms(self, value):
+        names = [term['name'] for term in value]
+        if len(names) != len(set(names)):
+            raise serializers.ValidationError("Each term may only appear once.")
+        return value
+
+    def validate_term_map(self, value):
+        invalid = set(value) - {choice for choice, _ in Term.TERM_CHOICES}
+        if invalid:
+            raise serializers.ValidationError(
+                f"Unknown source terms: {', '.join(sorted(invalid))}."
+            )
+        return value
+
+    def validate_teacher_map(self, value):
+        school_id = self.context['school_id']
+        try:
+            mapping = {int(k): v for k, v in value.items()}
+        except ValueError:
+            raise serializers.ValidationError("Keys must be staff member ids.")
+        ids = {v for v in mapping.values() if v is not None}
+        found = set(SchoolMember.objects.filter(
+            school_id=school_id, is_active=True, pk__in=ids
+        ).values_list('pk', flat=True))
+        if ids - found:
+            raise serializers.ValidationError(
+                "Some replacement teachers are not active staff in your school."
+            )
+        return mapping
+
+    def validate(self, attrs):
+        if attrs['end_date'] <= attrs['start_date']:
+            raise serializers.ValidationError(
+                {'end_date': "End date must be after the start date."}
+            )
+        return attrs
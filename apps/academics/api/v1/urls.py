@@ -2,19 +2,25 @@ from django.urls import path
 from .views import (
     AcademicYearListCreateView,
     AcademicYearDetailView,
+    AcademicYearRolloverView,
     TermListCreateView,
     ClassLevelListCreateView,
     ClassRoomListCreateView,
     ClassRoomDetailView,
+    ClassRoomBulkCreateView,
     SubjectListCreateView,
     SubjectDetailView,
+    SubjectBulkCreateView,
     SubjectAssignmentListCreateView,
+    SubjectAssignmentBulkCreateView,
+    SubjectAssignmentExportView,
 )
 
 urlpatterns = [
     # Academic Years
     path('years/', AcademicYearListCreateView.as_view(), name='academic-year-list'),
     path('years/<int:pk>/', AcademicYearDetailView.as_view(), name='academic-year-detail'),
+    path('years/<int:pk>/rollover/', AcademicYearRolloverView.as_view(), name='academic-year-rollover'),
 
     # Terms (nested under academic year)
     path('years/<int:year_pk>/terms/', TermListCreateView.as_view(), name='term-list'),
@@ -24,12 +30,16 @@ urlpatterns = [
 
     # Classrooms (nested under academic year)
     path('years/<int:year_pk>/classrooms/', ClassRoomListCreateView.as_view(), name='classroom-list'),
+    path('years/<int:year_pk>/classrooms/bulk/', ClassRoomBulkCreateView.as_view(), name='classroom-bulk-create'),
     path('classrooms/<int:pk>/', ClassRoomDetailView.as_view(), name='classroom-detail'),
 
     # Subjects
     path('subjects/', SubjectListCreateView.as_view(), name='subject-list'),
+    path('subjects/bulk/', SubjectBulkCreateView.as_view(), name='subject-bulk-create'),
     path('subjects/<int:pk>/', SubjectDetailView.as_view(), name='subject-detail'),
 
     # Subject Assignments
     path('assignments/', SubjectAssignmentListCreateView.as_view(), name='assignment-list'),
+    path('assignments/bulk/', SubjectAssignmentBulkCreateView.as_view(), name='assignment-bulk-create'),
+    path('assignments/export/', SubjectAssignmentExportView.as_view(), name='assignment-export'),
 ]
\ No newline at end of file
@@ -2,10 +2,17 @@ from rest_framework import status
 from rest_framework.generics import GenericAPIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.exceptions import NotFound
+from rest_framework.exceptions import NotFound, ValidationError
 from drf_spectacular.utils import extend_schema
+from apps.core.mixins import ExportMixin, ListResponseMixin, SchoolScopedMixin
 from apps.core.renderers import IlimiAPIRenderer
-from apps.tenants.models import SchoolMember
+from apps.academics.services.bulk import (
+    BULK_MAX_ITEMS,
+    bulk_create_classrooms,
+    bulk_create_subjects,
+    bulk_create_subject_assignments,
+)
+from apps.academics.services.rollover import rollover_academic_year
 from apps.academics.models import (
     AcademicYear, Term, ClassLevel, ClassRoom, Subject, SubjectAssignment
 )
@@ -16,42 +23,44 @@ from .serializers import (
     ClassRoomSerializer, ClassRoomCreateSerializer,
     SubjectSerializer, SubjectCreateSerializer,
     SubjectAssignmentSerializer, SubjectAssignmentCreateSerializer,
+    ClassRoomBulkItemSerializer, SubjectBulkItemSerializer,
+    SubjectAssignmentBulkItemSerializer,
+    AcademicYearRolloverSerializer,
 )
 
 
-# ── Mixin ─────────────────────────────────────────────────────────────────
-
-class SchoolScopedMixin:
-    def get_school(self):
-        member = SchoolMember.objects.filter(
-            user=self.request.user, is_active=True
-        ).select_related('school').first()
-        if not member:
-            raise NotFound("No school found for your account.")
-        return member.school
+def _validated_bulk_items(request, item_serializer_class):
+    """Validate a JSON array body; per-item errors come back under 'items'."""
+    serializer = item_serializer_class(
+        data=request.data, many=True, allow_empty=False, max_length=BULK_MAX_ITEMS
+    )
+    if not serializer.is_valid():
+        errors = serializer.errors
+        raise ValidationError(errors if isinstance(errors, dict) else {'items': errors})
+    return serializer.validated_data
 
 
 # ── Academic Years ────────────────────────────────────────────────────────
 
 @extend_schema(tags=["Academics"])
-class AcademicYearListCreateView(SchoolScopedMixin, GenericAPIView):
+class AcademicYearListCreateView(SchoolScopedMixin, ListResponseMixin, GenericAPIView):
     permission_classes = [IsAuthenticated]
     renderer_classes = [IlimiAPIRenderer]
     serializer_class = AcademicYearSerializer
+    cursor_ordering = ('-start_date', '-id')
 
     def get(self, request, *args, **kwargs):
-        school = self.get_school()
-        years = AcademicYear.objects.filter(school=school)
-        serializer = AcademicYearSerializer(years, many=True)
-        return Response({'academic_years': serializer.data, 'count': years.count()})
+        school_id = self.get_school_id()
+        years = AcademicYear.objects.filter(school_id=school_id)
+        return self.list_response(years, AcademicYearSerializer, 'academic_years')
 
     def post(self, request, *args, **kwargs):
-        school = self.get_school()
+        school_id = self.get_school_id()
         serializer = AcademicYearCreateSerializer(
-            data=request.data, context={'school': school}
+            data=request.data, context={'school_id': school_id}
         )
         serializer.is_valid(raise_exception=True)
-        year = serializer.save(school=school)
+        year = serializer.save(school_id=school_id)
         return Response(
             {
                 'message': f"Academic year '{year.name}' created successfully.",
@@ -67,22 +76,22 @@ class AcademicYearDetailView(SchoolScopedMixin, GenericAPIView):
     renderer_classes = [IlimiAPIRenderer]
     serializer_class = AcademicYearSerializer
 
-    def get_object(self, school, pk):
+    def get_object(self, school_id, pk):
         try:
-            return AcademicYear.objects.get(school=school, pk=pk)
+            return AcademicYear.objects.get(school_id=school_id, pk=pk)
         except AcademicYear.DoesNotExist:
             raise NotFound("Academic year not found.")
 
     def get(self, request, pk, *args, **kwargs):
-        school = self.get_school()
-        year = self.get_object(school, pk)
+        school_id = self.get_school_id()
+        year = self.get_object(school_id, pk)
         return Response(AcademicYearSerializer(year).data)
 
     def patch(self, request, pk, *args, **kwargs):
-        school = self.get_school()
-        year = self.get_object(school, pk)
+        school_id = self.get_school_id()
+        year = self.get_object(school_id, pk)
         serializer = AcademicYearCreateSerializer(
-            year, data=request.data, partial=True, context={'school': school}
+            year, data=request.data, partial=True, context={'school_id': school_id}
         )
         serializer.is_valid(raise_exception=True)
         serializer.save()
@@ -92,30 +101,72 @@ class AcademicYearDetailView(SchoolScopedMixin, GenericAPIView):
         })
 
 
+@extend_schema(tags=["Academics"])
+class AcademicYearRolloverView(SchoolScopedMixin, GenericAPIView):
+    """
+    Start a new academic year from an existing one.
+
+    Copies terms (dates shifted, unless given), active classrooms and
+    subject assignments in a single transaction. Teachers who have left
+    the school are cleared unless ``teacher_map`` says otherwise.
+    """
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [IlimiAPIRenderer]
+    serializer_class = AcademicYearRolloverSerializer
+
+    def post(self, request, pk, *args, **kwargs):
+        school = self.get_school()
+        try:
+            source_year = AcademicYear.objects.get(school=school, pk=pk)
+        except AcademicYear.DoesNotExist:
+            raise NotFound("Academic year not found.")
+        serializer = AcademicYearRolloverSerializer(
+            data=request.data, context={'school_id': school.pk}
+        )
+        serializer.is_valid(raise_exception=True)
+        data = dict(serializer.validated_data)
+        options = {
+            'terms_data': data.pop('terms', None),
+            'term_map': data.pop('term_map', None),
+            'teacher_map': data.pop('teacher_map', None),
+            'copy_assignments': data.pop('copy_assignments'),
+        }
+        summary = rollover_academic_year(school, source_year, data, **options)
+        year = summary.pop('academic_year')
+        return Response(
+            {
+                'message': f"Academic year '{year.name}' created from '{source_year.name}'.",
+                **AcademicYearSerializer(year).data,
+                'copied': summary,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
 # ── Terms ─────────────────────────────────────────────────────────────────
 
 @extend_schema(tags=["Academics"])
-class TermListCreateView(SchoolScopedMixin, GenericAPIView):
+class TermListCreateView(SchoolScopedMixin, ListResponseMixin, GenericAPIView):
     permission_classes = [IsAuthenticated]
     renderer_classes = [IlimiAPIRenderer]
     serializer_class = TermSerializer
+    cursor_ordering = ('start_date', 'id')
 
-    def get_academic_year(self, school, year_pk):
+    def get_academic_year(self, school_id, year_pk):
         try:
-            return AcademicYear.objects.get(school=school, pk=year_pk)
+            return AcademicYear.objects.get(school_id=school_id, pk=year_pk)
         except AcademicYear.DoesNotExist:
             raise NotFound("Academic year not found.")
 
     def get(self, request, year_pk, *args, **kwargs):
-        school = self.get_school()
-        academic_year = self.get_academic_year(school, year_pk)
+        school_id = self.get_school_id()
+        academic_year = self.get_academic_year(school_id, year_pk)
         terms = Term.objects.filter(academic_year=academic_year)
-        serializer = TermSerializer(terms, many=True)
-        return Response({'terms': serializer.data, 'count': terms.count()})
+        return self.list_response(terms, TermSerializer, 'terms')
 
     def post(self, request, year_pk, *args, **kwargs):
-        school = self.get_school()
-        academic_year = self.get_academic_year(school, year_pk)
+        school_id = self.get_school_id()
+        academic_year = self.get_academic_year(school_id, year_pk)
         serializer = TermCreateSerializer(
             data=request.data, context={'academic_year': academic_year}
         )
@@ -133,24 +184,24 @@ class TermListCreateView(SchoolScopedMixin, GenericAPIView):
 # ── Class Levels ──────────────────────────────────────────────────────────
 
 @extend_schema(tags=["Academics"])
-class ClassLevelListCreateView(SchoolScopedMixin, GenericAPIView):
+class ClassLevelListCreateView(SchoolScopedMixin, ListResponseMixin, GenericAPIView):
     permission_classes = [IsAuthenticated]
     renderer_classes = [IlimiAPIRenderer]
     serializer_class = ClassLevelSerializer
+    cursor_ordering = ('order', 'id')
 
     def get(self, request, *args, **kwargs):
-        school = self.get_school()
-        levels = ClassLevel.objects.filter(school=school, is_active=True)
-        serializer = ClassLevelSerializer(levels, many=True)
-        return Response({'class_levels': serializer.data, 'count': levels.count()})
+        school_id = self.get_school_id()
+        levels = ClassLevel.objects.filter(school_id=school_id, is_active=True)
+        return self.list_response(levels, ClassLevelSerializer, 'class_levels')
 
     def post(self, request, *args, **kwargs):
-        school = self.get_school()
+        school_id = self.get_school_id()
         serializer = ClassLevelCreateSerializer(
-            data=request.data, context={'school': school}
+            data=request.data, context={'school_id': school_id}
         )
         serializer.is_valid(raise_exception=True)
-        level = serializer.save(school=school)
+        level = serializer.save(school_id=school_id)
         return Response(
             {
                 'message': f"Class level '{level.display_name}' created successfully.",
@@ -163,35 +214,34 @@ class ClassLevelListCreateView(SchoolScopedMixin, GenericAPIView):
 # ── Classrooms ────────────────────────────────────────────────────────────
 
 @extend_schema(tags=["Academics"])
-class ClassRoomListCreateView(SchoolScopedMixin, GenericAPIView):
+class ClassRoomListCreateView(SchoolScopedMixin, ListResponseMixin, GenericAPIView):
     permission_classes = [IsAuthenticated]
     renderer_classes = [IlimiAPIRenderer]
     serializer_class = ClassRoomSerializer
 
-    def get_academic_year(self, school, year_pk):
+    def get_academic_year(self, school_id, year_pk):
         try:
-            return AcademicYear.objects.get(school=school, pk=year_pk)
+            return AcademicYear.objects.get(school_id=school_id, pk=year_pk)
         except AcademicYear.DoesNotExist:
             raise NotFound("Academic year not found.")
 
     def get(self, request, year_pk, *args, **kwargs):
-        school = self.get_school()
-        academic_year = self.get_academic_year(school, year_pk)
+        school_id = self.get_school_id()
+        academic_year = self.get_academic_year(school_id, year_pk)
         classrooms = ClassRoom.objects.filter(
-            school=school, academic_year=academic_year, is_active=True
+            school_id=school_id, academic_year=academic_year, is_active=True
         ).select_related('class_level', 'form_teacher__user', 'branch')
-        serializer = ClassRoomSerializer(classrooms, many=True)
-        return Response({'classrooms': serializer.data, 'count': classrooms.count()})
+        return self.list_response(classrooms, ClassRoomSerializer, 'classrooms')
 
     def post(self, request, year_pk, *args, **kwargs):
-        school = self.get_school()
-        academic_year = self.get_academic_year(school, year_pk)
+        school_id = self.get_school_id()
+        academic_year = self.get_academic_year(school_id, year_pk)
         serializer = ClassRoomCreateSerializer(
             data=request.data,
-            context={'school': school, 'academic_year': academic_year}
+            context={'school_id': school_id, 'academic_year': academic_year}
         )
         serializer.is_valid(raise_exception=True)
-        classroom = serializer.save(school=school, academic_year=academic_year)
+        classroom = serializer.save(school_id=school_id, academic_year=academic_year)
         return Response(
             {
                 'message': f"Classroom '{classroom.full_name}' created successfully.",
@@ -207,23 +257,25 @@ class ClassRoomDetailView(SchoolScopedMixin, GenericAPIView):
     renderer_classes = [IlimiAPIRenderer]
     serializer_class = ClassRoomSerializer
 
-    def get_object(self, school, pk):
+    def get_object(self, school_id, pk):
         try:
-            return ClassRoom.objects.get(school=school, pk=pk)
+            return ClassRoom.objects.select_related(
+                'academic_year', 'class_level', 'form_teacher__user', 'branch'
+            ).get(school_id=school_id, pk=pk)
         except ClassRoom.DoesNotExist:
             raise NotFound("Classroom not found.")
 
     def get(self, request, pk, *args, **kwargs):
-        school = self.get_school()
-        classroom = self.get_object(school, pk)
+        school_id = self.get_school_id()
+        classroom = self.get_object(school_id, pk)
         return Response(ClassRoomSerializer(classroom).data)
 
     def patch(self, request, pk, *args, **kwargs):
-        school = self.get_school()
-        classroom = self.get_object(school, pk)
+        school_id = self.get_school_id()
+        classroom = self.get_object(school_id, pk)
         serializer = ClassRoomCreateSerializer(
             classroom, data=request.data, partial=True,
-            context={'school': school, 'academic_year': classroom.academic_year}
+            context={'school_id': school_id, 'academic_year': classroom.academic_year}
         )
         serializer.is_valid(raise_exception=True)
         serializer.save()
@@ -233,27 +285,57 @@ class ClassRoomDetailView(SchoolScopedMixin, GenericAPIView):
         })
 
 
+@extend_schema(tags=["Academics"])
+class ClassRoomBulkCreateView(SchoolScopedMixin, GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [IlimiAPIRenderer]
+    serializer_class = ClassRoomBulkItemSerializer
+
+    def get_academic_year(self, school_id, year_pk):
+        try:
+            return AcademicYear.objects.get(school_id=school_id, pk=year_pk)
+        except AcademicYear.DoesNotExist:
+            raise NotFound("Academic year not found.")
+
+    def post(self, request, year_pk, *args, **kwargs):
+        school = self.get_school()
+        academic_year = self.get_academic_year(school.pk, year_pk)
+        items = _validated_bulk_items(request, ClassRoomBulkItemSerializer)
+        created = bulk_create_classrooms(school, academic_year, items)
+        classrooms = ClassRoom.objects.filter(
+            pk__in=[c.pk for c in created]
+        ).select_related('class_level', 'form_teacher__user', 'branch')
+        return Response(
+            {
+                'message': f"{len(created)} classrooms created successfully.",
+                'classrooms': ClassRoomSerializer(classrooms, many=True).data,
+                'count': len(created),
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
 # ── Subjects ──────────────────────────────────────────────────────────────
 
 @extend_schema(tags=["Academics"])
-class SubjectListCreateView(SchoolScopedMixin, GenericAPIView):
+class SubjectListCreateView(SchoolScopedMixin, ListResponseMixin, GenericAPIView):
     permission_classes = [IsAuthenticated]
     renderer_classes = [IlimiAPIRenderer]
     serializer_class = SubjectSerializer
+    cursor_ordering = 'name'
 
     def get(self, request, *args, **kwargs):
-        school = self.get_school()
-        subjects = Subject.objects.filter(school=school, is_active=True)
-        serializer = SubjectSerializer(subjects, many=True)
-        return Response({'subjects': serializer.data, 'count': subjects.count()})
+        school_id = self.get_school_id()
+        subjects = Subject.objects.filter(school_id=school_id, is_active=True)
+        return self.list_response(subjects, SubjectSerializer, 'subjects')
 
     def post(self, request, *args, **kwargs):
-        school = self.get_school()
+        school_id = self.get_school_id()
         serializer = SubjectCreateSerializer(
-            data=request.data, context={'school': school}
+            data=request.data, context={'school_id': school_id}
         )
         serializer.is_valid(raise_exception=True)
-        subject = serializer.save(school=school)
+        subject = serializer.save(school_id=school_id)
         return Response(
             {
                 'message': f"Subject '{subject.name}' created successfully.",
@@ -269,23 +351,23 @@ class SubjectDetailView(SchoolScopedMixin, GenericAPIView):
     renderer_classes = [IlimiAPIRenderer]
     serializer_class = SubjectSerializer
 
-    def get_object(self, school, pk):
+    def get_object(self, school_id, pk):
         try:
-            return Subject.objects.get(school=school, pk=pk)
+            return Subject.objects.get(school_id=school_id, pk=pk)
         except Subject.DoesNotExist:
             raise NotFound("Subject not found.")
 
     def get(self, request, pk, *args, **kwargs):
-        school = self.get_school()
-        subject = self.get_object(school, pk)
+        school_id = self.get_school_id()
+        subject = self.get_object(school_id, pk)
         return Response(SubjectSerializer(subject).data)
 
     def patch(self, request, pk, *args, **kwargs):
-        school = self.get_school()
-        subject = self.get_object(school, pk)
+        school_id = self.get_school_id()
+        subject = self.get_object(school_id, pk)
         serializer = SubjectCreateSerializer(
             subject, data=request.data, partial=True,
-            context={'school': school}
+            context={'school_id': school_id}
         )
         serializer.is_valid(raise_exception=True)
         serializer.save()
@@ -295,28 +377,47 @@ class SubjectDetailView(SchoolScopedMixin, GenericAPIView):
         })
 
 
+@extend_schema(tags=["Academics"])
+class SubjectBulkCreateView(SchoolScopedMixin, GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [IlimiAPIRenderer]
+    serializer_class = SubjectBulkItemSerializer
+
+    def post(self, request, *args, **kwargs):
+        school = self.get_school()
+        items = _validated_bulk_items(request, SubjectBulkItemSerializer)
+        created = bulk_create_subjects(school, items)
+        return Response(
+            {
+                'message': f"{len(created)} subjects created successfully.",
+                'subjects': SubjectSerializer(created, many=True).data,
+                'count': len(created),
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
 # ── Subject Assignments ───────────────────────────────────────────────────
 
 @extend_schema(tags=["Academics"])
-class SubjectAssignmentListCreateView(SchoolScopedMixin, GenericAPIView):
+class SubjectAssignmentListCreateView(SchoolScopedMixin, ListResponseMixin, GenericAPIView):
     permission_classes = [IsAuthenticated]
     renderer_classes = [IlimiAPIRenderer]
     serializer_class = SubjectAssignmentSerializer
 
     def get(self, request, *args, **kwargs):
-        school = self.get_school()
+        school_id = self.get_school_id()
         assignments = SubjectAssignment.objects.filter(
-            classroom__school=school
+            classroom__school_id=school_id
         ).select_related(
             'subject', 'classroom__class_level', 'teacher__user', 'term'
         )
-        serializer = SubjectAssignmentSerializer(assignments, many=True)
-        return Response({'assignments': serializer.data, 'count': assignments.count()})
+        return self.list_response(assignments, SubjectAssignmentSerializer, 'assignments')
 
     def post(self, request, *args, **kwargs):
-        school = self.get_school()
+        school_id = self.get_school_id()
         serializer = SubjectAssignmentCreateSerializer(
-            data=request.data, context={'school': school}
+            data=request.data, context={'school_id': school_id}
         )
         serializer.is_valid(raise_exception=True)
         assignment = serializer.save()
@@ -326,4 +427,47 @@ class SubjectAssignmentListCreateView(SchoolScopedMixin, GenericAPIView):
                 **SubjectAssignmentSerializer(assignment).data,
             },
             status=status.HTTP_201_CREATED,
-        )
\ No newline at end of file
+        )
+
+
+@extend_schema(tags=["Academics"])
+class SubjectAssignmentBulkCreateView(SchoolScopedMixin, GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [IlimiAPIRenderer]
+    serializer_class = SubjectAssignmentBulkItemSerializer
+
+    def post(self, request, *args, **kwargs):
+        school = self.get_school()
+        items = _validated_bulk_items(request, SubjectAssignmentBulkItemSerializer)
+        created = bulk_create_subject_assignments(school, items)
+        assignments = SubjectAssignment.objects.filter(
+            pk__in=[a.pk for a in created]
+        ).select_related(
+            'subject', 'classroom__class_level', 'teacher__user', 'term'
+        )
+        return Response(
+            {
+                'message': f"{len(created)} subject assignments created successfully.",
+                'assignments': SubjectAssignmentSerializer(assignments, many=True).data,
+                'count': len(created),
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+@extend_schema(tags=["Academics"])
+class SubjectAssignmentExportView(SchoolScopedMixin, ExportMixin, GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [IlimiAPIRenderer]
+    serializer_class = SubjectAssignmentSerializer
+
+    def get(self, request, *args, **kwargs):
+        school_id = self.get_school_id()
+        assignments = SubjectAssignment.objects.filter(
+            classroom__school_id=school_id
+        ).select_related(
+            'subject', 'classroom__class_level', 'teacher__user', 'term'
+        ).order_by('id')
+        return self.export_response(
+            assignments, SubjectAssignmentSerializer, 'Subject assignments export.'
+        )
@@ -0,0 +1,30 @@
+# Generated by Django 5.0 on 2026-10-18 13:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academics', '0001_initial'),
+        ('tenants', '0003_member_active_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='classlevel',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['school', 'order'], name='academics_level_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='classroom',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['school', 'academic_year'], name='academics_classroom_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subject',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['school', 'name'], name='academics_subject_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subjectassignment',
+            index=models.Index(fields=['term', 'classroom'], name='academics_assign_term_idx'),
+        ),
+    ]
@@ -23,6 +23,6 @@ class AcademicYear(models.Model):
         # Only one current academic year per school
         if self.is_current:
             AcademicYear.objects.filter(
-                school=self.school, is_current=True
+                school_id=self.school_id, is_current=True
             ).exclude(pk=self.pk).update(is_current=False)
         super().save(*args, **kwargs)
\ No newline at end of file
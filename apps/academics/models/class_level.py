@@ -37,6 +37,12 @@ class ClassLevel(models.Model):
     class Meta:
         unique_together = ('school', 'name')
         ordering = ['order', 'name']
+        indexes = [
+            models.Index(
+                fields=['school', 'order'], condition=models.Q(is_active=True),
+                name='academics_level_active_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.custom_name or self.get_name_display()
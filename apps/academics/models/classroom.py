@@ -47,6 +47,12 @@ class ClassRoom(models.Model):
 
     class Meta:
         unique_together = ('school', 'academic_year', 'class_level', 'section_name')
+        indexes = [
+            models.Index(
+                fields=['school', 'academic_year'], condition=models.Q(is_active=True),
+                name='academics_classroom_active_idx',
+            ),
+        ]
         ordering = ['class_level__order', 'section_name']
 
     def __str__(self):
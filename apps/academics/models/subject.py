@@ -41,6 +41,12 @@ class Subject(models.Model):
     class Meta:
         unique_together = ('school', 'name')
         ordering = ['subject_type', 'name']
+        indexes = [
+            models.Index(
+                fields=['school', 'name'], condition=models.Q(is_active=True),
+                name='academics_subject_active_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.get_subject_type_display()})"
\ No newline at end of file
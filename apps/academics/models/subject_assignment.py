@@ -23,6 +23,10 @@ class SubjectAssignment(models.Model):
 
     class Meta:
         unique_together = ('classroom', 'subject', 'term')
+        indexes = [
+            # Per-term lookups (current term, rollover) across a school's classrooms
+            models.Index(fields=['term', 'classroom'], name='academics_assign_term_idx'),
+        ]
         ordering = ['classroom', 'subject__name']
 
     def __str__(self):
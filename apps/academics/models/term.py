@@ -28,6 +28,6 @@ class Term(models.Model):
         # Only one current term per academic year
         if self.is_current:
             Term.objects.filter(
-                academic_year=self.academic_year, is_current=True
+                academic_year_id=self.academic_year_id, is_current=True
             ).exclude(pk=self.pk).update(is_current=False)
         super().save(*args, **kwargs)
\ No newline at end of file
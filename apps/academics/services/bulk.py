@@ -0,0 +1,171 @@
+import logging
+from django.db import IntegrityError, transaction
+from rest_framework.exceptions import ValidationError
+from apps.tenants.models import Branch, SchoolMember
+from apps.academics.models import ClassLevel, ClassRoom, Subject, SubjectAssignment, Term
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on items per bulk request, to keep a single transaction short.
+BULK_MAX_ITEMS = 500
+
+
+def _ids(items, field):
+    return {item[field] for item in items if item.get(field) is not None}
+
+
+def _check_fk(errors, index, item, field, valid_ids, message):
+    value = item.get(field)
+    if value is not None and value not in valid_ids:
+        errors[index].setdefault(field, []).append(message)
+
+
+def _raise_if_errors(errors):
+    if any(errors):
+        raise ValidationError({'items': errors})
+
+
+def _bulk_insert(model, objects):
+    """Insert in one transaction; a concurrent duplicate aborts the batch."""
+    try:
+        with transaction.atomic():
+            return model.objects.bulk_create(objects)
+    except IntegrityError as e:
+        logger.warning(f"Bulk insert of {model.__name__} conflicted: {e}")
+        raise ValidationError({
+            'items': ['A conflicting record was created at the same time. Please retry.']
+        })
+
+
+def bulk_create_classrooms(school, academic_year, items):
+    """
+    Create many classrooms for an academic year.
+
+    Foreign keys and uniqueness are checked with one query each, against
+    the school, before anything is written. Any per-item error rejects
+    the whole batch; errors are returned aligned with the input list.
+    Returns the created ClassRoom instances.
+    """
+    errors = [{} for _ in items]
+
+    class_level_ids = set(ClassLevel.objects.filter(
+        school=school, pk__in=_ids(items, 'class_level')
+    ).order_by().values_list('pk', flat=True))
+    teacher_ids = set(SchoolMember.objects.filter(
+        school=school, pk__in=_ids(items, 'form_teacher')
+    ).order_by().values_list('pk', flat=True))
+    branch_ids = set(Branch.objects.filter(
+        school=school, pk__in=_ids(items, 'branch')
+    ).order_by().values_list('pk', flat=True))
+    existing = set(ClassRoom.objects.filter(
+        school=school,
+        academic_year=academic_year,
+        class_level_id__in=class_level_ids,
+        section_name__in={item['section_name'] for item in items},
+    ).order_by().values_list('class_level_id', 'section_name'))
+
+    seen = set()
+    for index, item in enumerate(items):
+        _check_fk(errors, index, item, 'class_level', class_level_ids, 'Class level not found in your school.')
+        _check_fk(errors, index, item, 'form_teacher', teacher_ids, 'Staff member not found in your school.')
+        _check_fk(errors, index, item, 'branch', branch_ids, 'Branch not found in your school.')
+        key = (item['class_level'], item['section_name'])
+        if key in existing or key in seen:
+            errors[index].setdefault('non_field_errors', []).append(
+                f"A classroom with section '{item['section_name']}' already exists "
+                f"for this class level and academic year."
+            )
+        seen.add(key)
+    _raise_if_errors(errors)
+
+    classrooms = [
+        ClassRoom(
+            school=school,
+            academic_year=academic_year,
+            class_level_id=item['class_level'],
+            section_name=item['section_name'],
+            elective_group=item.get('elective_group', ''),
+            form_teacher_id=item.get('form_teacher'),
+            branch_id=item.get('branch'),
+            capacity=item.get('capacity', 40),
+            is_active=item.get('is_active', True),
+        )
+        for item in items
+    ]
+    created = _bulk_insert(ClassRoom, classrooms)
+    logger.info(f"Bulk created {len(created)} classrooms for {school.name} ({academic_year.name})")
+    return created
+
+
+def bulk_create_subjects(school, items):
+    """Create many subjects for a school. See bulk_create_classrooms."""
+    errors = [{} for _ in items]
+
+    existing = set(Subject.objects.filter(
+        school=school, name__in={item['name'] for item in items}
+    ).order_by().values_list('name', flat=True))
+
+    seen = set()
+    for index, item in enumerate(items):
+        if item['name'] in existing or item['name'] in seen:
+            errors[index].setdefault('name', []).append(
+                f"A subject named '{item['name']}' already exists for this school."
+            )
+        seen.add(item['name'])
+    _raise_if_errors(errors)
+
+    subjects = [Subject(school=school, **item) for item in items]
+    created = _bulk_insert(Subject, subjects)
+    logger.info(f"Bulk created {len(created)} subjects for {school.name}")
+    return created
+
+
+def bulk_create_subject_assignments(school, items):
+    """Create many subject assignments for a school. See bulk_create_classrooms."""
+    errors = [{} for _ in items]
+
+    classroom_ids = set(ClassRoom.objects.filter(
+        school=school, pk__in=_ids(items, 'classroom')
+    ).order_by().values_list('pk', flat=True))
+    subject_ids = set(Subject.objects.filter(
+        school=school, pk__in=_ids(items, 'subject')
+    ).order_by().values_list('pk', flat=True))
+    term_ids = set(Term.objects.filter(
+        academic_year__school=school, pk__in=_ids(items, 'term')
+    ).order_by().values_list('pk', flat=True))
+    teacher_ids = set(SchoolMember.objects.filter(
+        school=school, pk__in=_ids(items, 'teacher')
+    ).order_by().values_list('pk', flat=True))
+    existing = set(SubjectAssignment.objects.filter(
+        classroom_id__in=classroom_ids,
+        subject_id__in=subject_ids,
+        term_id__in=term_ids,
+    ).order_by().values_list('classroom_id', 'subject_id', 'term_id'))
+
+    seen = set()
+    for index, item in enumerate(items):
+        _check_fk(errors, index, item, 'classroom', classroom_ids, 'Classroom not found in your school.')
+        _check_fk(errors, index, item, 'subject', subject_ids, 'Subject not found in your school.')
+        _check_fk(errors, index, item, 'term', term_ids, 'Term not found in your school.')
+        _check_fk(errors, index, item, 'teacher', teacher_ids, 'Staff member not found in your school.')
+        key = (item['classroom'], item['subject'], item['term'])
+        if key in existing or key in seen:
+            errors[index].setdefault('non_field_errors', []).append(
+                "This subject is already assigned to this classroom for this term."
+            )
+        seen.add(key)
+    _raise_if_errors(errors)
+
+    assignments = [
+        SubjectAssignment(
+            classroom_id=item['classroom'],
+            subject_id=item['subject'],
+            term_id=item['term'],
+            teacher_id=item.get('teacher'),
+            periods_per_week=item.get('periods_per_week', 5),
+        )
+        for item in items
+    ]
+    created = _bulk_insert(SubjectAssignment, assignments)
+    logger.info(f"Bulk created {len(created)} subject assignments for {school.name}")
+    return created
@@ -0,0 +1,82 @@
+import datetime
+from collections import namedtuple
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from apps.academics.models import AcademicYear, Term
+
+# The current year/term per school, cached for the rest of the local day.
+# Keys carry the local date, so date-based resolution rolls over at
+# midnight Africa/Accra time (settings.TIME_ZONE) without any sweep.
+CURRENT_PERIOD_TIMEOUT = 60 * 60 * 24
+
+# Years never move between schools, so their school id can be cached long.
+YEAR_SCHOOL_TIMEOUT = 60 * 60 * 24 * 30
+
+CurrentPeriod = namedtuple(
+    'CurrentPeriod', ['academic_year_id', 'academic_year_name', 'term_id', 'term_name']
+)
+NO_PERIOD = CurrentPeriod(None, None, None, None)
+
+
+def _current_key(school_id, today):
+    return f'academics:current:{school_id}:{today.isoformat()}'
+
+
+def _seconds_until_midnight(now):
+    tomorrow = datetime.datetime.combine(
+        now.date() + datetime.timedelta(days=1), datetime.time(), tzinfo=now.tzinfo
+    )
+    return max(1, min(CURRENT_PERIOD_TIMEOUT, int((tomorrow - now).total_seconds())))
+
+
+def _pick(queryset, today):
+    """Prefer the row flagged is_current, else the one whose dates contain today."""
+    return queryset.filter(
+        Q(is_current=True) | Q(start_date__lte=today, end_date__gte=today)
+    ).order_by('-is_current', '-start_date').values_list('id', 'name').first()
+
+
+def load_current_period(school_id, today=None):
+    """Resolve a school's current year and term from the database (two queries)."""
+    today = today or timezone.localdate()
+    year = _pick(AcademicYear.objects.filter(school_id=school_id), today)
+    if year is None:
+        return NO_PERIOD
+    term = _pick(Term.objects.filter(academic_year_id=year[0]), today)
+    return CurrentPeriod(*year, *(term or (None, None)))
+
+
+def get_current_period(school_id):
+    """Return a school's CurrentPeriod from the shared cache, loading it on a miss."""
+    if school_id is None:
+        return NO_PERIOD
+    now = timezone.localtime()
+    key = _current_key(school_id, now.date())
+    cached = cache.get(key)
+    if cached is None:
+        period = load_current_period(school_id, now.date())
+        cache.set(key, tuple(period), _seconds_until_midnight(now))
+        return period
+    return CurrentPeriod(*cached)
+
+
+def school_id_for_year(academic_year_id):
+    """The id of the school an academic year belongs to, from the shared cache."""
+    key = f'academics:year_school:{academic_year_id}'
+    school_id = cache.get(key)
+    if school_id is None:
+        school_id = AcademicYear.objects.filter(
+            pk=academic_year_id
+        ).values_list('school_id', flat=True).first()
+        if school_id is not None:
+            cache.set(key, school_id, YEAR_SCHOOL_TIMEOUT)
+    return school_id
+
+
+def invalidate_current_period(school_id):
+    """Drop a school's cached period once the current transaction commits."""
+    transaction.on_commit(
+        lambda: cache.delete(_current_key(school_id, timezone.localdate()))
+    )
@@ -0,0 +1,154 @@
+import logging
+from django.db import transaction
+from apps.tenants.models import SchoolMember
+from apps.academics.models import AcademicYear, ClassRoom, SubjectAssignment, Term
+
+logger = logging.getLogger(__name__)
+
+ROLLOVER_BATCH_SIZE = 1000
+
+
+def _report(progress, stage, done, total):
+    logger.info(f"Rollover {stage}: {done}/{total}")
+    if progress:
+        progress(stage, done, total)
+
+
+def _new_terms(source_year, source_terms, new_year, terms_data):
+    """Build the new year's terms — from ``terms_data``, or by shifting the source dates."""
+    if terms_data:
+        return [Term(academic_year=new_year, **data) for data in terms_data]
+    shift = new_year.start_date - source_year.start_date
+    return [
+        Term(
+            academic_year=new_year,
+            name=term.name,
+            start_date=term.start_date + shift,
+            end_date=term.end_date + shift,
+        )
+        for term in source_terms
+    ]
+
+
+@transaction.atomic
+def rollover_academic_year(school, source_year, year_data, terms_data=None,
+                           term_map=None, teacher_map=None,
+                           copy_assignments=True, progress=None):
+    """
+    Clone an academic year's structure into a new year.
+
+    Creates the new AcademicYear and its terms, copies every active
+    classroom (with its form teacher) and, optionally, every subject
+    assignment. Rows are inserted with bulk_create in batches, inside one
+    transaction, so the cost is a handful of queries per thousand rows.
+
+    - ``terms_data``: list of {name, start_date, end_date} for the new
+      terms; defaults to the source terms shifted by the year offset.
+    - ``term_map``: {source term name: new term name}; defaults to same name.
+    - ``teacher_map``: {source SchoolMember id: new id or None}. Unmapped
+      teachers are kept if still active in the school, otherwise cleared.
+    - ``progress``: optional callable(stage, done, total).
+
+    Returns a summary dict.
+    """
+    term_map = term_map or {}
+    teacher_map = {int(k): v for k, v in (teacher_map or {}).items()}
+
+    new_year = AcademicYear.objects.create(school=school, **year_data)
+
+    source_terms = list(source_year.terms.all())
+    terms = Term.objects.bulk_create(
+        _new_terms(source_year, source_terms, new_year, terms_data)
+    )
+    terms_by_name = {term.name: term.pk for term in terms}
+    term_targets = {
+        term.pk: terms_by_name.get(term_map.get(term.name, term.name))
+        for term in source_terms
+    }
+    _report(progress, 'terms', len(terms), len(terms))
+
+    active_members = set(SchoolMember.objects.filter(
+        school=school, is_active=True
+    ).order_by().values_list('pk', flat=True))
+
+    def map_teacher(member_id):
+        if member_id in teacher_map:
+            return teacher_map[member_id]
+        return member_id if member_id in active_members else None
+
+    source_classrooms = list(ClassRoom.objects.filter(
+        school=school, academic_year=source_year, is_active=True
+    ).order_by('id').values(
+        'id', 'branch_id', 'class_level_id', 'section_name',
+        'elective_group', 'form_teacher_id', 'capacity',
+    ))
+    classroom_map = {}
+    total = len(source_classrooms)
+    for start in range(0, total, ROLLOVER_BATCH_SIZE):
+        batch = source_classrooms[start:start + ROLLOVER_BATCH_SIZE]
+        created = ClassRoom.objects.bulk_create([
+            ClassRoom(
+                school=school,
+                academic_year=new_year,
+                branch_id=row['branch_id'],
+                class_level_id=row['class_level_id'],
+                section_name=row['section_name'],
+                elective_group=row['elective_group'],
+                form_teacher_id=map_teacher(row['form_teacher_id']),
+                capacity=row['capacity'],
+            )
+            for row in batch
+        ])
+        classroom_map.update(
+            (row['id'], classroom.pk) for row, classroom in zip(batch, created)
+        )
+        _report(progress, 'classrooms', start + len(batch), total)
+
+    copied = skipped = 0
+    if copy_assignments and classroom_map:
+        source_assignments = SubjectAssignment.objects.filter(
+            classroom_id__in=list(classroom_map), term__academic_year=source_year
+        ).order_by('id').values_list(
+            'classroom_id', 'subject_id', 'teacher_id', 'term_id', 'periods_per_week'
+        )
+        total = source_assignments.count()
+        batch = []
+        seen = set()
+        for classroom_id, subject_id, teacher_id, term_id, periods in source_assignments.iterator(
+            chunk_size=ROLLOVER_BATCH_SIZE
+        ):
+            target_term = term_targets.get(term_id)
+            key = (classroom_map[classroom_id], subject_id, target_term)
+            # Unmapped terms, or several source terms mapped onto one new term.
+            if target_term is None or key in seen:
+                skipped += 1
+                continue
+            seen.add(key)
+            batch.append(SubjectAssignment(
+                classroom_id=key[0],
+                subject_id=subject_id,
+                teacher_id=map_teacher(teacher_id),
+                term_id=target_term,
+                periods_per_week=periods,
+            ))
+            if len(batch) == ROLLOVER_BATCH_SIZE:
+                SubjectAssignment.objects.bulk_create(batch)
+                copied += len(batch)
+                batch = []
+                _report(progress, 'assignments', copied + skipped, total)
+        if batch:
+            SubjectAssignment.objects.bulk_create(batch)
+            copied += len(batch)
+        _report(progress, 'assignments', copied + skipped, total)
+
+    logger.info(
+        f"Rolled over {source_year.name} → {new_year.name} for {school.name}: "
+        f"{len(classroom_map)} classrooms, {copied} assignments"
+    )
+    return {
+        'academic_year': new_year,
+        'terms': len(terms),
+        'classrooms': len(classroom_map),
+        'assignments': copied,
+        'assignments_skipped': skipped,
+    }
@@ -0,0 +1,27 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from apps.academics.models import AcademicYear, Term
+from apps.academics.services.calendar import invalidate_current_period, school_id_for_year
+
+
+@receiver(post_save, sender=AcademicYear)
+@receiver(post_delete, sender=AcademicYear)
+def academic_year_changed(sender, instance, **kwargs):
+    """Saving a year may move is_current, so the school's period is stale."""
+    invalidate_current_period(instance.school_id)
+
+
+@receiver(post_save, sender=Term)
+@receiver(post_delete, sender=Term)
+def term_changed(sender, instance, **kwargs):
+    """
+    Uses the term's year when the caller already loaded it (the API
+    views do); otherwise the cached year-to-school lookup, so saving a
+    term never costs an extra query.
+    """
+    if Term.academic_year.is_cached(instance):
+        school_id = instance.academic_year.school_id
+    else:
+        school_id = school_id_for_year(instance.academic_year_id)
+    if school_id is not None:
+        invalidate_current_period(school_id)
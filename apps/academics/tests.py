@@ -1,3 +1,598 @@
+import json
+from datetime import date
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
+from apps.accounts.models import User
+from apps.core.mixins import ExportMixin
+from apps.core.testing import QueryBudgetMixin, QueryPlanMixin, requires_postgres
+from apps.academics.services.calendar import get_current_period, load_current_period
+from apps.tenants.models import Branch, School, SchoolMember
+from apps.academics.models import (
+    AcademicYear, Term, ClassLevel, ClassRoom, Subject, SubjectAssignment
+)
 
-# Create your tests here.
+
+class ListResponseQueryCountTests(TestCase):
+    """List endpoints should not issue a separate COUNT(*) for small lists."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'admin@school.test', 'pass12345!', first_name='Ama', last_name='Mensah'
+        )
+        cls.school = School.objects.create(
+            name='Accra Academy', email='info@school.test', phone='0200000000',
+            address='Accra', city='Accra', onboarding_complete=True,
+        )
+        SchoolMember.objects.create(user=cls.user, school=cls.school, role='school_admin')
+        Subject.objects.bulk_create(
+            Subject(school=cls.school, name=f'Subject {i:02d}') for i in range(5)
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_single_page_count_comes_from_page(self):
+        # membership + page
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/v1/academics/subjects/')
+        data = response.json()['data']
+        self.assertEqual(data['count'], 5)
+        self.assertEqual(len(data['subjects']), 5)
+        self.assertIsNone(data['next'])
+
+    def test_multi_page_count_is_exact(self):
+        # membership + page + count
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/v1/academics/subjects/?page_size=2')
+        data = response.json()['data']
+        self.assertEqual(data['count'], 5)
+        self.assertEqual(len(data['subjects']), 2)
+        self.assertIsNotNone(data['next'])
+
+    def test_count_can_be_skipped(self):
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/v1/academics/subjects/?page_size=2&count=false')
+        self.assertNotIn('count', response.json()['data'])
+
+
+class CursorOrderingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('admin@school.test', 'pass12345!')
+        cls.school = School.objects.create(
+            name='Accra Academy', email='info@school.test', phone='0200000000',
+            address='Accra', city='Accra', onboarding_complete=True,
+        )
+        SchoolMember.objects.create(user=cls.user, school=cls.school, role='school_admin')
+        cls.years = AcademicYear.objects.bulk_create(
+            AcademicYear(
+                school=cls.school, name=f'Cohort {i}',
+                start_date=date(2025, 9, 1), end_date=date(2026, 7, 31),
+            )
+            for i in range(7)
+        )
+
+    def test_pages_never_skip_or_repeat_tied_rows(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        seen, url = [], '/api/v1/academics/years/?page_size=2'
+        while url:
+            data = client.get(url).json()['data']
+            seen += [year['id'] for year in data['academic_years']]
+            url = data['next']
+        self.assertEqual(seen, sorted((y.pk for y in self.years), reverse=True))
+
+
+class SubjectAssignmentExportTests(TestCase):
+    """The streaming export must produce the standard envelope."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'admin@school.test', 'pass12345!', first_name='Ama', last_name='Mensah'
+        )
+        school = School.objects.create(
+            name='Accra Academy', email='info@school.test', phone='0200000000',
+            address='Accra', city='Accra', onboarding_complete=True,
+        )
+        SchoolMember.objects.create(user=cls.user, school=school, role='school_admin')
+        year = AcademicYear.objects.create(
+            school=school, name='2026/2027',
+            start_date=date(2026, 9, 1), end_date=date(2027, 7, 31),
+        )
+        term = Term.objects.create(
+            academic_year=year, name='term_1',
+            start_date=date(2026, 9, 1), end_date=date(2026, 12, 18),
+        )
+        level = ClassLevel.objects.create(school=school, name='jhs_1')
+        classroom = ClassRoom.objects.create(
+            school=school, academic_year=year, class_level=level, section_name='A'
+        )
+        subjects = Subject.objects.bulk_create(
+            Subject(school=school, name=f'Subject {i:02d}') for i in range(5)
+        )
+        SubjectAssignment.objects.bulk_create(
+            SubjectAssignment(classroom=classroom, subject=subject, term=term)
+            for subject in subjects
+        )
+
+    def test_export_streams_envelope_across_chunks(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        original = ExportMixin.export_chunk_size
+        ExportMixin.export_chunk_size = 2
+        try:
+            response = client.get('/api/v1/academics/assignments/export/')
+            body = json.loads(b''.join(response.streaming_content))
+        finally:
+            ExportMixin.export_chunk_size = original
+
+        self.assertEqual(body['status'], 'success')
+        self.assertIsNone(body['errors'])
+        self.assertEqual(
+            [row['subject_name'] for row in body['data']],
+            [f'Subject {i:02d}' for i in range(5)],
+        )
+
+
+class BulkCreateTests(TestCase):
+    """Bulk endpoints validate set-based and report errors per item."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'admin@school.test', 'pass12345!', first_name='Ama', last_name='Mensah'
+        )
+        cls.school = School.objects.create(
+            name='Accra Academy', email='info@school.test', phone='0200000000',
+            address='Accra', city='Accra', onboarding_complete=True,
+        )
+        SchoolMember.objects.create(user=cls.user, school=cls.school, role='school_admin')
+        cls.year = AcademicYear.objects.create(
+            school=cls.school, name='2026/2027',
+            start_date=date(2026, 9, 1), end_date=date(2027, 7, 31),
+        )
+        cls.level = ClassLevel.objects.create(school=cls.school, name='primary_1')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_bulk_classrooms_query_count_is_constant(self):
+        items = [{'class_level': self.level.pk, 'section_name': f'S{i}'} for i in range(60)]
+        # membership, year, class levels, uniqueness, savepoint + insert + release, refetch
+        with self.assertNumQueries(8):
+            response = self.client.post(
+                f'/api/v1/academics/years/{self.year.pk}/classrooms/bulk/', items, format='json'
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['data']['count'], 60)
+        self.assertEqual(ClassRoom.objects.filter(school=self.school).count(), 60)
+
+    def test_bulk_subjects_reports_per_item_errors(self):
+        Subject.objects.create(school=self.school, name='Mathematics')
+        items = [{'name': 'English'}, {'name': 'Mathematics'}, {'name': 'English'}]
+        response = self.client.post('/api/v1/academics/subjects/bulk/', items, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()['errors']['items']
+        self.assertEqual(errors[0], {})
+        self.assertIn('name', errors[1])
+        self.assertIn('name', errors[2])
+        self.assertFalse(Subject.objects.filter(name='English').exists())
+
+    def test_bulk_rejects_ids_from_another_school(self):
+        other = School.objects.create(
+            name='Other', email='other@school.test', phone='0', address='x', city='Kumasi',
+        )
+        foreign_level = ClassLevel.objects.create(school=other, name='primary_1')
+        items = [{'class_level': foreign_level.pk, 'section_name': 'A'}]
+        response = self.client.post(
+            f'/api/v1/academics/years/{self.year.pk}/classrooms/bulk/', items, format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('class_level', response.json()['errors']['items'][0])
+
+
+class RolloverTests(TestCase):
+    """Rolling a year over copies its structure in bulk."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'admin@school.test', 'pass12345!', first_name='Ama', last_name='Mensah'
+        )
+        cls.school = School.objects.create(
+            name='Accra Academy', email='info@school.test', phone='0200000000',
+            address='Accra', city='Accra', onboarding_complete=True,
+        )
+        SchoolMember.objects.create(user=cls.user, school=cls.school, role='school_admin')
+        teacher = User.objects.create_user('kofi@school.test', 'pass12345!')
+        cls.teacher = SchoolMember.objects.create(user=teacher, school=cls.school, role='teacher')
+        leaver = User.objects.create_user('yaw@school.test', 'pass12345!')
+        cls.leaver = SchoolMember.objects.create(
+            user=leaver, school=cls.school, role='teacher', is_active=False
+        )
+        cls.year = AcademicYear.objects.create(
+            school=cls.school, name='2025/2026',
+            start_date=date(2025, 9, 1), end_date=date(2026, 7, 31),
+        )
+        terms = [
+            Term.objects.create(
+                academic_year=cls.year, name=f'term_{i}',
+                start_date=date(2025, 9 + i, 1), end_date=date(2025, 9 + i, 20),
+            )
+            for i in (1, 2)
+        ]
+        level = ClassLevel.objects.create(school=cls.school, name='jhs_1')
+        subject = Subject.objects.create(school=cls.school, name='Mathematics')
+        for section, teacher in (('A', cls.teacher), ('B', cls.leaver)):
+            classroom = ClassRoom.objects.create(
+                school=cls.school, academic_year=cls.year, class_level=level,
+                section_name=section, form_teacher=teacher,
+            )
+            for term in terms:
+                SubjectAssignment.objects.create(
+                    classroom=classroom, subject=subject, term=term, teacher=teacher
+                )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_rollover_copies_classrooms_and_assignments(self):
+        response = self.client.post(
+            f'/api/v1/academics/years/{self.year.pk}/rollover/',
+            {'name': '2026/2027', 'start_date': '2026-09-01', 'end_date': '2027-07-31'},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 201)
+        data = response.json()['data']
+        self.assertEqual(data['copied']['classrooms'], 2)
+        self.assertEqual(data['copied']['assignments'], 4)
+
+        new_year = AcademicYear.objects.get(pk=data['id'])
+        self.assertEqual(
+            list(new_year.terms.values_list('start_date', flat=True)),
+            [date(2026, 10, 1), date(2026, 11, 1)],
+        )
+        teachers = dict(new_year.classrooms.values_list('section_name', 'form_teacher'))
+        self.assertEqual(teachers, {'A': self.teacher.pk, 'B': None})
+
+    def test_rollover_remaps_terms_and_teachers(self):
+        response = self.client.post(
+            f'/api/v1/academics/years/{self.year.pk}/rollover/',
+            {
+                'name': '2026/2027', 'start_date': '2026-09-01', 'end_date': '2027-07-31',
+                'terms': [{'name': 'term_1', 'start_date': '2026-09-08', 'end_date': '2026-12-18'}],
+                'term_map': {'term_2': 'term_1'},
+                'teacher_map': {str(self.leaver.pk): self.teacher.pk},
+            },
+            format='json',
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['data']['copied']['assignments'], 2)
+        assignments = SubjectAssignment.objects.filter(
+            classroom__academic_year_id=response.json()['data']['id']
+        )
+        # Both source terms collapse onto term_1 — one row per classroom.
+        self.assertEqual(assignments.count(), 2)
+        self.assertEqual(set(assignments.values_list('teacher', flat=True)), {self.teacher.pk})
+
+
+class CurrentPeriodTests(TestCase):
+    """The current year/term resolver is cached and follows the calendar."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = School.objects.create(
+            name='Accra Academy', email='info@school.test', phone='0200000000',
+            address='Accra', city='Accra', onboarding_complete=True,
+        )
+        cls.year = AcademicYear.objects.create(
+            school=cls.school, name='2026/2027',
+            start_date=date(2026, 9, 1), end_date=date(2027, 7, 31),
+        )
+        cls.term_1 = Term.objects.create(
+            academic_year=cls.year, name='term_1',
+            start_date=date(2026, 9, 1), end_date=date(2026, 12, 18),
+        )
+        cls.term_2 = Term.objects.create(
+            academic_year=cls.year, name='term_2',
+            start_date=date(2026, 12, 19), end_date=date(2027, 4, 2),
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_term_boundary_follows_local_date(self):
+        self.assertEqual(load_current_period(self.school.pk, date(2026, 12, 18)).term_id, self.term_1.pk)
+        self.assertEqual(load_current_period(self.school.pk, date(2026, 12, 19)).term_id, self.term_2.pk)
+        self.assertIsNone(load_current_period(self.school.pk, date(2027, 8, 1)).academic_year_id)
+
+    def test_is_current_flag_wins_and_invalidates_cache(self):
+        get_current_period(self.school.pk)
+        with self.assertNumQueries(0):
+            get_current_period(self.school.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.year.is_current = True
+            self.year.save()
+            self.term_2.is_current = True
+            self.term_2.save()
+        period = get_current_period(self.school.pk)
+        self.assertEqual(period.academic_year_id, self.year.pk)
+        self.assertEqual(period.term_id, self.term_2.pk)
+
+    def test_saving_a_term_does_not_load_its_year(self):
+        term = Term.objects.get(pk=self.term_1.pk)
+        with self.assertNumQueries(2):  # update + year-to-school lookup
+            term.save()
+        with self.assertNumQueries(1):
+            term.save()
+        with self.captureOnCommitCallbacks(execute=True), self.assertNumQueries(1):
+            self.term_2.save()  # year already loaded
+
+
+@requires_postgres
+class QueryPlanTests(QueryPlanMixin, TestCase):
+    """Hot tenant queries must stay on indexes as the tables grow."""
+
+    SCHOOLS = 500
+    PER_SCHOOL = 20
+
+    @classmethod
+    def setUpTestData(cls):
+        n = cls.PER_SCHOOL
+        schools = School.objects.bulk_create(
+            School(
+                name=f'School {i}', slug=f'school-{i}', email=f'school{i}@plan.test',
+                phone='0200000000', address='Accra', city='Accra',
+            )
+            for i in range(cls.SCHOOLS)
+        )
+        users = User.objects.bulk_create(
+            User(
+                email=f'user{i}@plan.test', phone_number=f'024{i:07d}',
+                first_name='Ama', last_name='Mensah', password='!',
+            )
+            for i in range(cls.SCHOOLS * n)
+        )
+        members = SchoolMember.objects.bulk_create(
+            SchoolMember(user=user, school=schools[i // n], role='teacher', is_active=i % 5 != 0)
+            for i, user in enumerate(users)
+        )
+        level_names = [name for name, _ in ClassLevel.LEVEL_CHOICES][:10]
+        levels = ClassLevel.objects.bulk_create(
+            ClassLevel(school=school, name=name, order=order)
+            for school in schools for order, name in enumerate(level_names)
+        )
+        subjects = Subject.objects.bulk_create(
+            Subject(school=school, name=f'Subject {j}', is_active=j % 4 != 0)
+            for school in schools for j in range(n)
+        )
+        years = AcademicYear.objects.bulk_create(
+            AcademicYear(
+                school=school, name='2026/2027',
+                start_date=date(2026, 9, 1), end_date=date(2027, 7, 31),
+            )
+            for school in schools
+        )
+        terms = Term.objects.bulk_create(
+            Term(
+                academic_year=year, name='term_1',
+                start_date=date(2026, 9, 1), end_date=date(2026, 12, 18),
+            )
+            for year in years
+        )
+        classrooms = ClassRoom.objects.bulk_create(
+            ClassRoom(
+                school=school, academic_year=years[s], class_level=levels[s * 10 + j % 10],
+                section_name=f'S{j}', form_teacher=members[s * n + j],
+            )
+            for s, school in enumerate(schools) for j in range(n)
+        )
+        SubjectAssignment.objects.bulk_create(
+            SubjectAssignment(
+                classroom=classroom, subject=subjects[c // n * n + j],
+                term=terms[c // n], teacher=classroom.form_teacher,
+            )
+            for c, classroom in enumerate(classrooms) for j in range(5)
+        )
+        cls.analyze_tables(
+            User, School, SchoolMember, ClassLevel, Subject,
+            AcademicYear, Term, ClassRoom, SubjectAssignment,
+        )
+        cls.school, cls.year, cls.user = schools[7], years[7], users[7 * n + 1]
+
+    def test_membership_lookups(self):
+        self.assertNoSeqScan(
+            SchoolMember.objects.filter(user=self.user, is_active=True), SchoolMember
+        )
+        self.assertNoSeqScan(
+            SchoolMember.objects.filter(school=self.school, is_active=True), SchoolMember
+        )
+
+    def test_user_by_phone_number(self):
+        self.assertNoSeqScan(User.objects.filter(phone_number=self.user.phone_number), User)
+
+    def test_academics_lists(self):
+        self.assertNoSeqScan(
+            ClassRoom.objects.filter(
+                school=self.school, academic_year=self.year, is_active=True
+            ),
+            ClassRoom,
+        )
+        self.assertNoSeqScan(Subject.objects.filter(school=self.school, is_active=True), Subject)
+        self.assertNoSeqScan(
+            ClassLevel.objects.filter(school=self.school, is_active=True), ClassLevel
+        )
+        self.assertNoSeqScan(
+            SubjectAssignment.objects.filter(classroom__school=self.school),
+            SubjectAssignment, ClassRoom,
+        )
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Academics endpoints stay within their query budgets as data grows."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'admin@school.test', 'pass12345!', first_name='Ama', last_name='Mensah'
+        )
+        cls.school = School.objects.create(
+            name='Accra Academy', email='info@school.test', phone='0200000000',
+            address='Accra', city='Accra', onboarding_complete=True,
+        )
+        cls.member = SchoolMember.objects.create(
+            user=cls.user, school=cls.school, role='school_admin'
+        )
+        cls.branch = Branch.objects.create(school=cls.school, name='Main')
+        cls.year = AcademicYear.objects.create(
+            school=cls.school, name='2026/2027',
+            start_date=date(2026, 9, 1), end_date=date(2027, 7, 31),
+        )
+        cls.term = Term.objects.create(
+            academic_year=cls.year, name='term_1',
+            start_date=date(2026, 9, 1), end_date=date(2026, 12, 18),
+        )
+        cls.level = ClassLevel.objects.create(school=cls.school, name='jhs_1')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def seed(self, n):
+        """Grow years, subjects, classrooms and assignments to ``n`` each."""
+        have = Subject.objects.filter(school=self.school).count()
+        new = range(have, n)
+        AcademicYear.objects.bulk_create(
+            AcademicYear(
+                school=self.school, name=f'Y{i}',
+                start_date=date(2000, 9, 1), end_date=date(2001, 7, 31),
+            )
+            for i in new
+        )
+        subjects = Subject.objects.bulk_create(
+            Subject(school=self.school, name=f'Subject {i}') for i in new
+        )
+        classrooms = ClassRoom.objects.bulk_create(
+            ClassRoom(
+                school=self.school, academic_year=self.year, class_level=self.level,
+                section_name=f'S{i}', form_teacher=self.member, branch=self.branch,
+            )
+            for i in new
+        )
+        SubjectAssignment.objects.bulk_create(
+            SubjectAssignment(
+                classroom=classroom, subject=subject, term=self.term, teacher=self.member
+            )
+            for classroom, subject in zip(classrooms, subjects)
+        )
+
+    def assertGetBudget(self, route, url):
+        self.assertBudgetAtScale(route, 'GET', self.seed, lambda: self.client.get(url))
+
+    def test_academic_years(self):
+        self.assertGetBudget('academic-year-list', '/api/v1/academics/years/')
+        self.assertGetBudget('academic-year-detail', f'/api/v1/academics/years/{self.year.pk}/')
+        self.assertGetBudget('term-list', f'/api/v1/academics/years/{self.year.pk}/terms/')
+
+    def test_class_levels_and_classrooms(self):
+        self.assertGetBudget('class-level-list', '/api/v1/academics/class-levels/')
+        self.assertGetBudget('classroom-list', f'/api/v1/academics/years/{self.year.pk}/classrooms/')
+        self.seed(1)
+        classroom = ClassRoom.objects.filter(school=self.school).first()
+        self.assertGetBudget('classroom-detail', f'/api/v1/academics/classrooms/{classroom.pk}/')
+
+    def test_subjects(self):
+        self.assertGetBudget('subject-list', '/api/v1/academics/subjects/')
+        self.seed(1)
+        subject = Subject.objects.filter(school=self.school).first()
+        self.assertGetBudget('subject-detail', f'/api/v1/academics/subjects/{subject.pk}/')
+
+    def test_assignments(self):
+        self.assertGetBudget('assignment-list', '/api/v1/academics/assignments/')
+        self.assertGetBudget('assignment-export', '/api/v1/academics/assignments/export/')
+
+    def assertWrite(self, route, method, url, data):
+        call = getattr(self.client, method.lower())
+        self.assertWriteBudget(route, method, self.seed, lambda: call(url, data, format='json'))
+
+    def test_writes(self):
+        year_url = f'/api/v1/academics/years/{self.year.pk}/'
+        self.assertWrite('academic-year-list', 'POST', '/api/v1/academics/years/', {
+            'name': '2027/2028', 'start_date': '2027-09-01', 'end_date': '2028-07-31',
+            'is_current': True,
+        })
+        self.assertWrite('academic-year-detail', 'PATCH', year_url, {'name': '2026/27'})
+        self.assertWrite('term-list', 'POST', f'{year_url}terms/', {
+            'name': 'term_2', 'start_date': '2027-01-05', 'end_date': '2027-04-02',
+            'is_current': True,
+        })
+        self.assertWrite('class-level-list', 'POST', '/api/v1/academics/class-levels/', {
+            'name': 'jhs_2', 'order': 2,
+        })
+        self.assertWrite('classroom-list', 'POST', f'{year_url}classrooms/', {
+            'class_level': self.level.pk, 'section_name': 'New',
+            'form_teacher': self.member.pk, 'branch': self.branch.pk,
+        })
+        classroom = ClassRoom.objects.get(section_name='New')
+        self.assertWrite(
+            'classroom-detail', 'PATCH', f'/api/v1/academics/classrooms/{classroom.pk}/',
+            {'capacity': 40},
+        )
+        self.assertWrite('subject-list', 'POST', '/api/v1/academics/subjects/', {
+            'name': 'Ga Language', 'code': 'GA',
+        })
+        subject = Subject.objects.get(name='Ga Language')
+        self.assertWrite(
+            'subject-detail', 'PATCH', f'/api/v1/academics/subjects/{subject.pk}/',
+            {'name': 'Ga'},
+        )
+        self.assertWrite('assignment-list', 'POST', '/api/v1/academics/assignments/', {
+            'subject': subject.pk, 'classroom': classroom.pk, 'teacher': self.member.pk,
+            'term': self.term.pk,
+        })
+
+    def test_bulk_create(self):
+        for size in (1, 10, 500):
+            with self.subTest(items=size):
+                cache.clear()
+                response = self.assertQueryBudget('subject-bulk-create', 'POST', lambda: self.client.post(
+                    '/api/v1/academics/subjects/bulk/',
+                    [{'name': f'Bulk {size}-{i}'} for i in range(size)], format='json',
+                ))
+                self.assertEqual(response.status_code, 201)
+                response = self.assertQueryBudget('classroom-bulk-create', 'POST', lambda: self.client.post(
+                    f'/api/v1/academics/years/{self.year.pk}/classrooms/bulk/',
+                    [{'class_level': self.level.pk, 'section_name': f'B{size}-{i}',
+                      'form_teacher': self.member.pk, 'branch': self.branch.pk}
+                     for i in range(size)], format='json',
+                ))
+                self.assertEqual(response.status_code, 201)
+        self.seed(10)
+        classroom_ids = list(
+            ClassRoom.objects.filter(school=self.school).values_list('pk', flat=True)[:10]
+        )
+        subject = Subject.objects.create(school=self.school, name='Bulk subject')
+        response = self.assertQueryBudget('assignment-bulk-create', 'POST', lambda: self.client.post(
+            '/api/v1/academics/assignments/bulk/',
+            [{'classroom': pk, 'subject': subject.pk, 'term': self.term.pk,
+              'teacher': self.member.pk} for pk in classroom_ids], format='json',
+        ))
+        self.assertEqual(response.status_code, 201)
+
+    def test_rollover(self):
+        self.seed(1000)
+        response = self.assertQueryBudget('academic-year-rollover', 'POST', lambda: self.client.post(
+            f'/api/v1/academics/years/{self.year.pk}/rollover/',
+            {'name': '2027/2028', 'start_date': '2027-09-01', 'end_date': '2028-07-31'},
+            format='json',
+        ))
+        self.assertEqual(response.json()['data']['copied']['assignments'], 1000)
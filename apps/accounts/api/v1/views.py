@@ -8,12 +8,16 @@ from rest_framework.generics import GenericAPIView
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 from drf_spectacular.utils import extend_schema
 
 from apps.core.renderers import IlimiAPIRenderer
+from apps.accounts.tokens import (
+    IlimiRefreshToken,
+    IlimiTokenObtainPairSerializer,
+    IlimiTokenRefreshSerializer,
+)
 from apps.accounts.services.registration import create_user_account, resend_otp
 from apps.accounts.services.verification import verify_phone_otp
 from apps.tenants.services.onboarding import create_school_with_owner
@@ -32,7 +36,7 @@ User = get_user_model()
 
 
 def _tokens_for_user(user):
-    refresh = RefreshToken.for_user(user)
+    refresh = IlimiRefreshToken.for_user(user)
     return {
         "refresh": str(refresh),
         "access": str(refresh.access_token),
@@ -170,6 +174,7 @@ class OTPResendView(GenericAPIView):
 
 @extend_schema(tags=["Auth"])
 class IlimiTokenObtainView(TokenObtainPairView):
+    serializer_class = IlimiTokenObtainPairSerializer
     renderer_classes = [IlimiAPIRenderer]
 
     def post(self, request, *args, **kwargs):
@@ -186,6 +191,7 @@ class IlimiTokenObtainView(TokenObtainPairView):
 
 @extend_schema(tags=["Auth"])
 class IlimiTokenRefreshView(TokenRefreshView):
+    serializer_class = IlimiTokenRefreshSerializer
     renderer_classes = [IlimiAPIRenderer]
 
 
@@ -0,0 +1,67 @@
+from django.utils.functional import cached_property
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from apps.accounts.tokens import TENANT_CLAIMS
+from apps.tenants.services.roles import RoleGrant, RoleSet
+
+
+class TenantTokenUser(TokenUser):
+    """
+    Stateless principal built from an access token's tenant claims.
+
+    Exposes ``role_set`` so TenantContext and the permission classes can
+    authorise the request without touching the database.
+    """
+
+    @cached_property
+    def school_id(self):
+        return self.token.get('school_id')
+
+    @cached_property
+    def branch_id(self):
+        return self.token.get('branch_id')
+
+    @cached_property
+    def roles(self):
+        return frozenset(self.token.get('roles', []))
+
+    @cached_property
+    def role_set(self):
+        if self.school_id is None:
+            return RoleSet(())
+        return RoleSet(
+            RoleGrant(0, self.school_id, branch_id, role)
+            for role, branch_id in self.token.get('grants', [])
+        )
+
+
+class TenantClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that trusts the token's tenant claims.
+
+    Requests are authenticated as a TenantTokenUser with no user or
+    membership lookup. Tokens issued before tenant claims existed fall
+    back to the regular database lookup, as do unsafe requests to views
+    that set ``verify_user_for_writes = True``.
+    """
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is None:
+            return None
+        user, validated_token = result
+        if isinstance(user, TenantTokenUser) and self._verify_write(request):
+            user = super().get_user(validated_token)
+        return user, validated_token
+
+    def get_user(self, validated_token):
+        if not all(claim in validated_token for claim in TENANT_CLAIMS):
+            return super().get_user(validated_token)
+        return TenantTokenUser(validated_token)
+
+    def _verify_write(self, request):
+        if request.method in SAFE_METHODS:
+            return False
+        view = (getattr(request, 'parser_context', None) or {}).get('view')
+        return getattr(view, 'verify_user_for_writes', False)
@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-18 13:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_user_is_email_verified_user_is_phone_verified_and_more'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['phone_number'], name='accounts_user_phone_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0 on 2026-10-18 13:38
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_user_phone_index'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='phoneverificationotp',
+            name='otp',
+        ),
+    ]
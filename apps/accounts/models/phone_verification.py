@@ -1,31 +1,30 @@
-import random
 from django.db import models
 from django.utils import timezone
 from datetime import timedelta
 
 
-def generate_otp():
-    return str(random.randint(100000, 999999))
-
-
 def otp_expiry():
     return timezone.now() + timedelta(minutes=10)
 
 
 class PhoneVerificationOTP(models.Model):
+    """
+    Audit record of the latest phone OTP issued to a user.
+
+    The code itself lives (hashed) in the cache; see
+    apps.accounts.services.otp. These rows are written only when
+    OTP_AUDIT_TO_DB is on, and never read when verifying.
+    """
     user = models.OneToOneField(
         'accounts.User',
         on_delete=models.CASCADE,
         related_name='phone_otp'
     )
-    otp = models.CharField(max_length=6)
     created_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField(default=otp_expiry)
     is_used = models.BooleanField(default=False)
     attempts = models.IntegerField(default=0)
 
-    MAX_ATTEMPTS = 3
-
     def __str__(self):
         return f"OTP for {self.user.email}"
 
@@ -33,42 +32,17 @@ class PhoneVerificationOTP(models.Model):
     def is_expired(self):
         return timezone.now() > self.expires_at
 
-    @property
-    def is_valid(self):
-        return not self.is_used and not self.is_expired and self.attempts < self.MAX_ATTEMPTS
-
-    def verify(self, code):
-        """
-        Attempt to verify the OTP code.
-        Returns (success: bool, message: str)
-        """
-        if self.is_used:
-            return False, 'This code has already been used.'
-        if self.is_expired:
-            return False, 'This code has expired. Please request a new one.'
-        if self.attempts >= self.MAX_ATTEMPTS:
-            return False, 'Maximum attempts exceeded. Please request a new code.'
-
-        self.attempts += 1
-
-        if self.otp != code:
-            self.save()
-            remaining = self.MAX_ATTEMPTS - self.attempts
-            return False, f'Invalid code. {remaining} attempt(s) remaining.'
-
-        self.is_used = True
-        self.save()
-        return True, 'Phone number verified successfully.'
-
     @classmethod
-    def create_for_user(cls, user):
-        """Create or replace OTP for a user."""
-        cls.objects.filter(user=user).delete()
-        return cls.objects.create(
-            user=user,
-            otp=generate_otp()
+    def record_issued(cls, user, ttl_seconds):
+        """Create or reset the user's record in a single upsert."""
+        now = timezone.now()
+        cls.objects.bulk_create(
+            [cls(user=user, created_at=now, expires_at=now + timedelta(seconds=ttl_seconds))],
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=['created_at', 'expires_at', 'is_used', 'attempts'],
         )
 
     class Meta:
         verbose_name = 'Phone Verification OTP'
-        verbose_name_plural = 'Phone Verification OTPs'
\ No newline at end of file
+        verbose_name_plural = 'Phone Verification OTPs'
@@ -37,6 +37,10 @@ class User(AbstractBaseUser, PermissionsMixin):
     class Meta:
         verbose_name = 'User'
         verbose_name_plural = 'Users'
+        indexes = [
+            # OTP send/verify and phone-based registration look users up by phone
+            models.Index(fields=['phone_number'], name='accounts_user_phone_idx'),
+        ]
 
     def __str__(self):
         return self.email
@@ -0,0 +1,176 @@
+"""
+Phone OTP store.
+
+Codes live in the default cache, never in the database, so every worker
+must share it (production settings require REDIS_URL):
+
+* ``otp:<user id>`` holds an HMAC of the code and disappears after
+  OTP_TTL_SECONDS — expiry is the cache's TTL;
+* ``otp:attempts:<user id>`` counts guesses with the cache's atomic
+  increment, so concurrent submissions can't share an attempt;
+* ``otp:resend:<user id>`` spaces out new codes by OTP_RESEND_SECONDS.
+
+Checking a guess is one cache round trip (a correct one adds the delete
+that uses the code up), and hashes are compared in constant time.
+
+With the Redis cache the lookup and the attempt count run as one Lua
+script. Other caches go through Django's cache API.
+
+PhoneVerificationOTP rows record each code issued and how it ended when
+OTP_AUDIT_TO_DB is on; they are never read when verifying.
+"""
+import secrets
+import time
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.redis import RedisCache
+from django.db import transaction
+from django.utils.crypto import constant_time_compare, salted_hmac
+from apps.accounts.models import PhoneVerificationOTP
+
+KEY_PREFIX = 'otp'
+
+# KEYS: code hash, attempt counter
+# Returns nil if there is no live code, else {hash, attempts including this one}.
+LOOKUP_SCRIPT = """
+local digest = redis.call('GET', KEYS[1])
+if not digest then
+  return nil
+end
+local attempts = redis.call('INCR', KEYS[2])
+if attempts == 1 then
+  redis.call('PEXPIRE', KEYS[2], math.max(redis.call('PTTL', KEYS[1]), 1))
+end
+return {digest, attempts}
+"""
+
+
+class CacheOTPStore:
+    """Codes in any Django cache, using its atomic ``incr``."""
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def keys(self, user_id):
+        return f'{KEY_PREFIX}:{user_id}', f'{KEY_PREFIX}:attempts:{user_id}'
+
+    def save(self, user_id, digest, ttl):
+        code_key, attempts_key = self.keys(user_id)
+        self.cache.set_many({code_key: digest, attempts_key: 0}, ttl)
+
+    def lookup(self, user_id):
+        """Count one guess. Returns ``(hash, attempts)``, or ``(None, 0)`` without a live code."""
+        code_key, attempts_key = self.keys(user_id)
+        digest = self.cache.get(code_key)
+        if digest is None:
+            return None, 0
+        try:
+            return digest, self.cache.incr(attempts_key)
+        except ValueError:
+            return None, 0
+
+    def consume(self, user_id):
+        """Delete the code. True for exactly one caller."""
+        return self.cache.delete(self.keys(user_id)[0])
+
+
+class RedisOTPStore(CacheOTPStore):
+    """Codes in the Redis cache, looked up and counted by LOOKUP_SCRIPT."""
+
+    def client(self, key):
+        return self.cache._cache.get_client(key, write=True)
+
+    def save(self, user_id, digest, ttl):
+        code_key, attempts_key = (self.cache.make_and_validate_key(k) for k in self.keys(user_id))
+        pipe = self.client(code_key).pipeline()
+        pipe.set(code_key, digest, ex=ttl)
+        pipe.set(attempts_key, 0, ex=ttl)
+        pipe.execute()
+
+    def lookup(self, user_id):
+        keys = [self.cache.make_and_validate_key(k) for k in self.keys(user_id)]
+        # Runs by SHA (EVALSHA), loading the script on first use.
+        script = self.client(keys[0]).register_script(LOOKUP_SCRIPT)
+        found = script(keys=keys)
+        if not found:
+            return None, 0
+        digest, attempts = found
+        return digest.decode(), int(attempts)
+
+
+def get_otp_store():
+    """The store for the default cache."""
+    default = caches['default']
+    return RedisOTPStore(default) if isinstance(default, RedisCache) else CacheOTPStore(default)
+
+
+def generate_code():
+    return str(secrets.randbelow(900000) + 100000)
+
+
+def hash_code(user_id, code):
+    return salted_hmac('apps.accounts.otp', f'{user_id}:{code}', algorithm='sha256').hexdigest()
+
+
+def issue_otp(user):
+    """
+    Give ``user`` a new code, replacing any previous one, and return it.
+
+    The code goes live when the current transaction commits, like the
+    SMS that carries it; a rolled-back signup or resend leaves nothing
+    to verify against.
+    """
+    code = generate_code()
+    digest = hash_code(user.pk, code)
+    ttl, resend_ttl = settings.OTP_TTL_SECONDS, settings.OTP_RESEND_SECONDS
+
+    def save():
+        get_otp_store().save(user.pk, digest, ttl)
+        cache.set(f'{KEY_PREFIX}:resend:{user.pk}', time.time(), resend_ttl)
+
+    transaction.on_commit(save)
+    if settings.OTP_AUDIT_TO_DB:
+        PhoneVerificationOTP.record_issued(user, settings.OTP_TTL_SECONDS)
+    return code
+
+
+def resend_wait(user):
+    """
+    Claim the right to send ``user`` a new code now.
+
+    Returns 0 if granted, else the seconds until the next one may go.
+    """
+    key = f'{KEY_PREFIX}:resend:{user.pk}'
+    now = time.time()
+    if cache.add(key, now, settings.OTP_RESEND_SECONDS):
+        return 0
+    sent_at = cache.get(key) or now
+    return max(1, int(settings.OTP_RESEND_SECONDS - (now - sent_at)))
+
+
+def check_otp(user, code):
+    """
+    Check a guess against ``user``'s live code.
+
+    Returns ``(outcome, attempts_left)``; outcome is one of
+    ``verified``, ``invalid``, ``locked`` or ``missing`` (never issued,
+    expired or already used).
+    """
+    store = get_otp_store()
+    digest, attempts = store.lookup(user.pk)
+    if digest is None:
+        return 'missing', 0
+    max_attempts = settings.OTP_MAX_ATTEMPTS
+    if attempts > max_attempts:
+        return 'locked', 0
+
+    if not constant_time_compare(digest, hash_code(user.pk, str(code))):
+        if attempts == max_attempts and settings.OTP_AUDIT_TO_DB:
+            PhoneVerificationOTP.objects.filter(user=user).update(attempts=attempts)
+        return 'invalid', max_attempts - attempts
+
+    if not store.consume(user.pk):
+        return 'missing', 0  # a concurrent request used it first
+    if settings.OTP_AUDIT_TO_DB:
+        PhoneVerificationOTP.objects.filter(user=user).update(attempts=attempts, is_used=True)
+    return 'verified', max_attempts - attempts
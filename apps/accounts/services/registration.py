@@ -1,9 +1,8 @@
 import logging
 from django.db import transaction
-from django.utils import timezone
-from datetime import timedelta
-from apps.accounts.models import User, PhoneVerificationOTP
-from apps.notifications.services.sms import send_otp_sms
+from apps.accounts.models import User
+from apps.accounts.services.otp import issue_otp, resend_wait
+from apps.notifications.services.outbox import queue_otp_sms
 
 logger = logging.getLogger(__name__)
 
@@ -12,8 +11,9 @@ logger = logging.getLogger(__name__)
 def create_user_account(step1_data):
     """
     Create a new user account from step 1 registration data.
-    User is inactive until phone is verified.
-    Returns (user, otp) tuple.
+    User is inactive until phone is verified. The OTP SMS is queued in
+    the outbox within the same transaction.
+    Returns (user, otp_code) tuple.
     """
     user = User.objects.create_user(
         email=step1_data['email'],
@@ -24,27 +24,24 @@ def create_user_account(step1_data):
         is_active=False,
     )
 
-    otp = PhoneVerificationOTP.create_for_user(user)
-    send_otp_sms(user.phone_number, otp.otp)
+    otp_code = issue_otp(user)
+    queue_otp_sms(user.phone_number, otp_code)
 
     logger.info(f"New user account created: {user.email}")
-    return user, otp
+    return user, otp_code
 
 
 def resend_otp(user):
     """
-    Resend OTP to user's phone number.
+    Resend OTP to user's phone number (queued in the SMS outbox).
     Rate limited — can only resend once per minute.
     Returns (success, message)
     """
-    existing = PhoneVerificationOTP.objects.filter(user=user).first()
-
-    if existing:
-        time_since_creation = timezone.now() - existing.created_at
-        if time_since_creation < timedelta(minutes=1):
-            seconds_left = 60 - int(time_since_creation.total_seconds())
-            return False, f'Please wait {seconds_left} seconds before requesting a new code.'
-
-    otp = PhoneVerificationOTP.create_for_user(user)
-    send_otp_sms(user.phone_number, otp.otp)
-    return True, 'A new verification code has been sent to your phone.'
\ No newline at end of file
+    seconds_left = resend_wait(user)
+    if seconds_left:
+        return False, f'Please wait {seconds_left} seconds before requesting a new code.'
+
+    with transaction.atomic():
+        otp_code = issue_otp(user)
+        queue_otp_sms(user.phone_number, otp_code)
+    return True, 'A new verification code has been sent to your phone.'
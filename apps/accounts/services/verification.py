@@ -1,27 +1,32 @@
 import logging
-from django.db import transaction
-from apps.accounts.models import User, PhoneVerificationOTP
+from apps.accounts.services.otp import check_otp
+from apps.core.metrics import record_otp_verification
 
 logger = logging.getLogger(__name__)
 
+MESSAGES = {
+    'verified': 'Phone number verified successfully.',
+    'locked': 'Maximum attempts exceeded. Please request a new code.',
+    'missing': 'No valid verification code found. Please request a new one.',
+    'used': 'This code has already been used.',
+}
+
 
-@transaction.atomic
 def verify_phone_otp(user, code):
     """
     Verify a phone OTP code for a user.
     Returns (success: bool, message: str)
     """
-    try:
-        otp_record = PhoneVerificationOTP.objects.get(user=user)
-    except PhoneVerificationOTP.DoesNotExist:
-        return False, 'No verification code found. Please request a new one.'
-
-    success, message = otp_record.verify(code)
+    outcome, attempts_left = check_otp(user, code)
+    if outcome == 'missing' and user.is_phone_verified:
+        outcome = 'used'
+    record_otp_verification(outcome)
 
-    if success:
+    if outcome == 'invalid':
+        return False, f'Invalid code. {attempts_left} attempt(s) remaining.'
+    if outcome == 'verified':
         user.is_phone_verified = True
         user.is_active = True
         user.save(update_fields=['is_phone_verified', 'is_active'])
         logger.info(f"Phone verified for user: {user.email}")
-
-    return success, message
\ No newline at end of file
+    return outcome == 'verified', MESSAGES[outcome]
@@ -1,3 +1,234 @@
-from django.test import TestCase
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from prometheus_client import REGISTRY
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.accounts.authentication import TenantTokenUser
+from apps.accounts.models import PhoneVerificationOTP, User
+from apps.accounts.services.otp import check_otp, issue_otp
+from apps.accounts.services.registration import resend_otp
+from apps.accounts.services.verification import verify_phone_otp
+from apps.accounts.tokens import IlimiRefreshToken
+from apps.core.testing import QueryBudgetMixin
+from apps.tenants.models import Branch, School, SchoolMember
 
-# Create your tests here.
+
+@override_settings(SMS_OUTBOX_EAGER=False)
+class AuthQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """The registration and token flow stays within its query budgets."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def post(self, route, url, data):
+        # Commit hooks (the OTP going live) run after the count.
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.assertQueryBudget(
+                route, 'POST', lambda: self.client.post(url, data, format='json')
+            )
+        self.assertLess(response.status_code, 400, response.content)
+        return response
+
+    def test_registration_and_login(self):
+        phone = '+233240000001'
+        self.post('auth-v1:register-step1', '/api/v1/auth/register/step1/', {
+            'first_name': 'Ama', 'last_name': 'Mensah', 'email': 'ama@school.test',
+            'phone_number': phone, 'password': 'S3cure-pass!', 'confirm_password': 'S3cure-pass!',
+        })
+        self.post('auth-v1:register-step2', '/api/v1/auth/register/step2/', {
+            'phone_number': phone, 'school_name': 'Accra Academy',
+            'school_email': 'info@school.test', 'school_phone': '0200000000', 'city': 'Accra',
+        })
+        cache.clear()  # lifts the one-minute resend limit
+        with patch('apps.accounts.services.otp.generate_code', return_value='246810'):
+            self.post('auth-v1:otp-resend', '/api/v1/auth/verify/otp/resend/', {'phone_number': phone})
+        self.post('auth-v1:otp-verify', '/api/v1/auth/verify/otp/', {
+            'phone_number': phone, 'otp_code': '246810',
+        })
+
+        response = self.post('auth-v1:token-obtain', '/api/v1/auth/token/', {
+            'email': 'ama@school.test', 'password': 'S3cure-pass!',
+        })
+        refresh = response.json()['data']['refresh']
+        self.post('auth-v1:token-refresh', '/api/v1/auth/token/refresh/', {'refresh': refresh})
+
+    def test_password_reset(self):
+        user = User.objects.create_user(
+            'ama@school.test', 'S3cure-pass!', first_name='Ama', last_name='Mensah'
+        )
+        self.post('auth-v1:password-reset', '/api/v1/auth/password/reset/', {
+            'email': user.email,
+        })
+        self.post('auth-v1:password-reset-confirm', '/api/v1/auth/password/reset/confirm/', {
+            'uid': urlsafe_base64_encode(force_bytes(user.pk)),
+            'token': default_token_generator.make_token(user),
+            'new_password': 'N3w-secure-pass!', 'confirm_password': 'N3w-secure-pass!',
+        })
+
+
+class OTPStoreTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('ama@school.test', 'S3cure-pass!')
+
+    def issue(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return issue_otp(self.user)
+
+    def wrong(self, code):
+        return '000000' if code != '000000' else '111111'
+
+    def test_code_is_hashed_and_verified_once(self):
+        code = self.issue()
+        self.assertNotIn(code, [str(v) for v in cache._cache.values()])
+        with self.assertNumQueries(1):  # the audit row; the check itself is cache only
+            self.assertEqual(check_otp(self.user, code), ('verified', 2))
+        self.assertEqual(check_otp(self.user, code)[0], 'missing')
+        self.assertTrue(PhoneVerificationOTP.objects.get(user=self.user).is_used)
+
+    def test_wrong_guesses_do_not_touch_the_database_until_locked(self):
+        code = self.issue()
+        with self.assertNumQueries(0):
+            self.assertEqual(check_otp(self.user, self.wrong(code)), ('invalid', 2))
+            self.assertEqual(check_otp(self.user, self.wrong(code)), ('invalid', 1))
+        self.assertEqual(check_otp(self.user, self.wrong(code)), ('invalid', 0))
+        self.assertEqual(check_otp(self.user, code)[0], 'locked')
+        self.assertEqual(PhoneVerificationOTP.objects.get(user=self.user).attempts, 3)
+
+    @override_settings(OTP_AUDIT_TO_DB=False)  # keep the threads off the test database
+    def test_concurrent_guesses_each_use_an_attempt(self):
+        code = self.issue()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            outcomes = list(pool.map(lambda _: check_otp(self.user, self.wrong(code))[0], range(8)))
+        self.assertEqual(outcomes.count('invalid'), 3)
+        self.assertEqual(outcomes.count('locked'), 5)
+
+    def test_expired_codes_are_gone(self):
+        with override_settings(OTP_TTL_SECONDS=0):
+            code = self.issue()
+        self.assertEqual(check_otp(self.user, code)[0], 'missing')
+
+    def test_new_code_replaces_the_old_and_resets_attempts(self):
+        old = self.issue()
+        check_otp(self.user, self.wrong(old))
+        new = self.issue()
+        if new != old:
+            self.assertEqual(check_otp(self.user, old)[0], 'invalid')
+        self.assertEqual(check_otp(self.user, new)[0], 'verified')
+        self.assertEqual(PhoneVerificationOTP.objects.filter(user=self.user).count(), 1)
+
+    def test_rolled_back_codes_never_go_live(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(IntegrityError), transaction.atomic():
+                code = issue_otp(self.user)
+                raise IntegrityError('signup failed')
+        self.assertEqual(check_otp(self.user, code)[0], 'missing')
+        self.assertIsNone(cache.get(f'otp:resend:{self.user.pk}'))
+
+    def test_resend_is_limited_to_once_a_minute(self):
+        self.issue()
+        success, message = resend_otp(self.user)
+        self.assertFalse(success)
+        self.assertIn('seconds', message)
+
+    @override_settings(OTP_AUDIT_TO_DB=False)
+    def test_audit_rows_are_optional(self):
+        code = self.issue()
+        with self.assertNumQueries(0):
+            self.assertEqual(check_otp(self.user, code)[0], 'verified')
+        self.assertFalse(PhoneVerificationOTP.objects.exists())
+
+
+class OTPMetricsTests(TestCase):
+    def outcome_count(self, outcome):
+        return REGISTRY.get_sample_value(
+            'ilimi_otp_verifications_total', {'outcome': outcome}
+        ) or 0
+
+    def test_outcomes_are_counted(self):
+        user = User.objects.create_user('ama@school.test', 'S3cure-pass!')
+        with self.captureOnCommitCallbacks(execute=True):
+            code = issue_otp(user)
+        before = {o: self.outcome_count(o) for o in ('invalid', 'verified', 'used')}
+        wrong = '000000' if code != '000000' else '111111'
+        verify_phone_otp(user, wrong)
+        verify_phone_otp(user, code)
+        verify_phone_otp(user, code)
+        for outcome in before:
+            self.assertEqual(self.outcome_count(outcome), before[outcome] + 1, outcome)
+
+
+class TenantClaimsAuthenticationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = School.objects.create(
+            name='Accra Academy', email='info@school.test', phone='0200000000',
+            address='Accra', city='Accra', onboarding_complete=True,
+        )
+        cls.main, cls.annex, cls.north = Branch.objects.bulk_create([
+            Branch(school=cls.school, name=name, branch_code=name.upper(), address='Accra', city='Accra')
+            for name in ('Main', 'Annex', 'North')
+        ])
+        cls.user = User.objects.create_user('manager@school.test', 'S3cure-pass!')
+        for branch, role in ((cls.main, 'branch_manager'), (cls.annex, 'teacher')):
+            SchoolMember.objects.create(user=cls.user, school=cls.school, branch=branch, role=role)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def authorize(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_claims_cover_every_grant(self):
+        access = IlimiRefreshToken.for_user(self.user).access_token
+        self.assertEqual(access['school_id'], self.school.pk)
+        self.assertEqual(access['roles'], ['branch_manager', 'teacher'])
+        self.assertCountEqual(
+            access['grants'], [['branch_manager', self.main.pk], ['teacher', self.annex.pk]],
+        )
+        # One role held in two branches keeps both grants.
+        access['grants'] = [['branch_manager', self.main.pk], ['branch_manager', self.north.pk]]
+        role_set = TenantTokenUser(access).role_set
+        for branch, expected in ((self.main, True), (self.north, True), (self.annex, False)):
+            self.assertIs(role_set.has_role('branch_manager', branch_id=branch.pk), expected)
+
+    def test_claims_authenticate_without_user_or_membership_queries(self):
+        self.authorize(IlimiRefreshToken.for_user(self.user).access_token)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/v1/schools/me/branches/')
+            for branch, expected in ((self.main, 200), (self.annex, 403), (self.north, 403)):
+                patched = self.client.patch(
+                    f'/api/v1/schools/me/branches/{branch.pk}/', {'city': 'Tema'},
+                )
+                self.assertEqual(patched.status_code, expected, branch.name)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.wsgi_request.user, TenantTokenUser)
+        tables = ' '.join(q['sql'] for q in queries.captured_queries)
+        self.assertNotIn('accounts_user', tables)
+        self.assertNotIn('tenants_schoolmember', tables)
+
+    def test_tokens_without_claims_fall_back_to_the_database(self):
+        self.authorize(RefreshToken.for_user(self.user).access_token)
+        response = self.client.get('/api/v1/schools/me/branches/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.wsgi_request.user, User)
+        self.assertEqual(len(response.data['branches']), 3)
+
+    def test_writes_that_verify_the_user_reject_inactive_users(self):
+        self.authorize(IlimiRefreshToken.for_user(self.user).access_token)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.client.get('/api/v1/schools/me/members/').status_code, 200)
+        response = self.client.post('/api/v1/schools/me/members/', {
+            'email': 'new@school.test', 'first_name': 'Kofi', 'last_name': 'Boateng',
+            'phone': '0244000000', 'role': 'teacher',
+        })
+        self.assertEqual(response.status_code, 401)
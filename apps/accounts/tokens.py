@@ -0,0 +1,62 @@
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.tenants.services.roles import get_role_set
+
+TENANT_CLAIMS = ('school_id', 'branch_id', 'roles', 'grants')
+
+
+def tenant_claims(user_id):
+    """
+    Build the tenant claims for a user's current school.
+
+    ``roles`` lists the roles held in that school, and ``grants`` lists
+    each ``[role, branch_id]`` pair (branch null for school-level roles),
+    so branch-scoped checks work from the token alone — including one
+    role held in several branches.
+    """
+    role_set = get_role_set(user_id)
+    school_id = role_set.school_id
+    grants = [g for g in role_set.grants if g.school_id == school_id]
+    return {
+        'school_id': school_id,
+        'branch_id': grants[0].branch_id if grants else None,
+        'roles': sorted({g.role for g in grants}),
+        'grants': [[g.role, g.branch_id] for g in grants],
+    }
+
+
+class IlimiRefreshToken(RefreshToken):
+    """
+    Refresh token whose access tokens carry tenant and role claims.
+
+    Claims are stamped whenever an access token is minted — on login and
+    on every refresh — so a role change reaches the client within one
+    access-token lifetime. Staff users also get a ``debug`` claim, which
+    enables the Server-Timing header (see RequestTimingMiddleware).
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        if user.is_staff:
+            token['debug'] = True
+        return token
+
+    @property
+    def access_token(self):
+        access = super().access_token
+        for claim, value in tenant_claims(self[api_settings.USER_ID_CLAIM]).items():
+            access[claim] = value
+        return access
+
+
+class IlimiTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = IlimiRefreshToken
+
+
+class IlimiTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = IlimiRefreshToken
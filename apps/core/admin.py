@@ -0,0 +1,60 @@
+from django.contrib import admin
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html, format_html_join
+from .models import RequestProfile
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = [
+        'created_at', 'method', 'path', 'route', 'school', 'status_code',
+        'duration_ms', 'query_count', 'user', 'download_link',
+    ]
+    list_filter = ['method', 'status_code', 'route']
+    search_fields = ['path', 'route', 'school__name', 'user__email']
+    list_select_related = ['school', 'user']
+    readonly_fields = [
+        'created_at', 'user', 'school', 'method', 'path', 'route', 'status_code',
+        'duration_ms', 'query_count', 'download_link', 'summary_block', 'sql_log',
+    ]
+    fields = readonly_fields
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        return [
+            path(
+                '<int:pk>/download/',
+                self.admin_site.admin_view(self.download_view),
+                name='core_requestprofile_download',
+            ),
+        ] + super().get_urls()
+
+    def download_view(self, request, pk):
+        if not self.has_view_permission(request):
+            return HttpResponse(status=403)
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        response = HttpResponse(bytes(profile.stats), content_type='application/octet-stream')
+        response['Content-Disposition'] = f'attachment; filename="profile-{profile.pk}.prof"'
+        return response
+
+    @admin.display(description='Profile')
+    def download_link(self, obj):
+        url = reverse('admin:core_requestprofile_download', args=[obj.pk])
+        return format_html('<a href="{}">Download .prof</a>', url)
+
+    @admin.display(description='Top functions')
+    def summary_block(self, obj):
+        return format_html('<pre>{}</pre>', obj.summary)
+
+    @admin.display(description='SQL')
+    def sql_log(self, obj):
+        return format_html_join(
+            '', '<pre>[{} ms] {}</pre>', ((q['time_ms'], q['sql']) for q in obj.sql)
+        )
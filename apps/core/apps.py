@@ -0,0 +1,19 @@
+from django.apps import AppConfig
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.core'
+
+    def ready(self):
+        # Per-user answers (onboarding, role sets, OTP codes) are cached and
+        # invalidated on change; with a per-process cache only the worker
+        # that made the change would see it. Fine for runserver, not beyond.
+        if not settings.DEBUG and isinstance(caches['default'], LocMemCache):
+            raise ImproperlyConfigured(
+                'The default cache is per-process; set REDIS_URL (or DEBUG for local development).'
+            )
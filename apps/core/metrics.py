@@ -0,0 +1,116 @@
+"""
+Prometheus metrics, served at /metrics.
+
+Under gunicorn, set PROMETHEUS_MULTIPROC_DIR to an empty directory
+writable by every worker (config/gunicorn.py clears it on start and
+marks exited workers dead); each worker then writes its samples there
+and the /metrics view merges them. Without it, metrics are per-process,
+which is fine for runserver and tests.
+"""
+import os
+from django.conf import settings
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram,
+    generate_latest, multiprocess,
+)
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+
+# Unresolved paths and unknown methods share one label each, so
+# scanners can't blow up cardinality.
+UNMATCHED_ROUTE = 'unmatched'
+METHODS = frozenset(['GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'])
+OTHER_TENANT = 'other'
+
+REQUEST_LATENCY = Histogram(
+    'ilimi_http_request_duration_seconds', 'Request latency by URL name.',
+    ['route', 'method'], buckets=LATENCY_BUCKETS,
+)
+REQUESTS = Counter(
+    'ilimi_http_requests', 'Responses by URL name and status code.',
+    ['route', 'method', 'status'],
+)
+REQUEST_QUERIES = Histogram(
+    'ilimi_http_request_db_queries', 'Database queries per request by URL name.',
+    ['route'], buckets=QUERY_BUCKETS,
+)
+TENANT_LATENCY = Histogram(
+    'ilimi_tenant_request_duration_seconds',
+    'Request latency by school: listed schools by id, the rest by bucket.',
+    ['school'], buckets=LATENCY_BUCKETS,
+)
+SMS_SENDS = Counter(
+    'ilimi_sms_sends', 'SMS send attempts by backend and result.',
+    ['backend', 'result'],
+)
+SMS_PROVIDER_SENDS = Counter(
+    'ilimi_sms_provider_sends', 'Sends through the routing backend by provider and result.',
+    ['provider', 'result'],
+)
+OTP_VERIFICATIONS = Counter(
+    'ilimi_otp_verifications', 'Phone OTP verification attempts by outcome.',
+    ['outcome'],
+)
+
+
+class TenantLabeler:
+    """
+    Maps school ids to a fixed set of metric labels.
+
+    Schools in ``allow`` get their own label; the rest share ``buckets``
+    labels by id (``bucket-0``…), or "other" without buckets. The labels
+    depend only on settings, so every worker emits the same bounded set
+    and the multiprocess files stop growing once each label has been
+    seen. A slow bucket narrows a problem down to its schools.
+    """
+
+    def __init__(self, allow=(), buckets=0):
+        self.allow = frozenset(allow)
+        self.buckets = buckets
+
+    def label(self, school_id):
+        if school_id is None:
+            return OTHER_TENANT
+        if school_id in self.allow:
+            return str(school_id)
+        if self.buckets:
+            return f'bucket-{school_id % self.buckets}'
+        return OTHER_TENANT
+
+
+tenant_labeler = TenantLabeler(
+    getattr(settings, 'METRICS_TENANTS', ()), getattr(settings, 'METRICS_TENANT_BUCKETS', 0),
+)
+
+
+def observe_request(route, method, status_code, seconds, db_queries, school_id=None):
+    """Record one finished request (called by RequestTimingMiddleware)."""
+    route = route or UNMATCHED_ROUTE
+    method = method if method in METHODS else 'other'
+    REQUEST_LATENCY.labels(route, method).observe(seconds)
+    REQUESTS.labels(route, method, str(status_code)).inc()
+    REQUEST_QUERIES.labels(route).observe(db_queries)
+    TENANT_LATENCY.labels(tenant_labeler.label(school_id)).observe(seconds)
+
+
+def record_sms_send(backend, result):
+    SMS_SENDS.labels(type(backend).__name__, result).inc()
+
+
+def record_sms_provider_send(provider, result):
+    SMS_PROVIDER_SENDS.labels(provider, result).inc()
+
+
+def record_otp_verification(outcome):
+    OTP_VERIFICATIONS.labels(outcome).inc()
+
+
+def render_metrics():
+    """Return ``(body, content_type)`` for every worker's metrics."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,174 @@
+import cProfile
+import io
+import logging
+import marshal
+import pstats
+import time
+from contextlib import ExitStack
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from apps.core import metrics
+from apps.core.models import RequestProfile
+from apps.core.timing import RequestTimings, activate, deactivate
+
+logger = logging.getLogger('ilimi.requests')
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILE_PARAM = '_profile'
+PROFILE_MAX_QUERIES = 1000
+PROFILE_SUMMARY_LINES = 40
+
+
+class RequestTimingMiddleware:
+    """
+    Measures each request: DB queries (count and time), serializer and
+    renderer time, view time and the total.
+
+    Every request is logged to the ``ilimi.requests`` logger as a
+    key=value line tagged with school_id, route and role (also set on the
+    record for structured handlers), and recorded in the Prometheus
+    metrics (apps.core.metrics). Staff users and JWTs carrying a
+    ``debug`` claim additionally get the spans as a ``Server-Timing``
+    header, which browser dev tools display per request.
+
+    Place it near the top of MIDDLEWARE so ``total`` covers the rest of
+    the stack. Streaming bodies are produced after the response leaves
+    the middleware, so their queries are not counted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = RequestTimings()
+        token = activate(timings)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timings.db_wrapper))
+                response = self.get_response(request)
+            now = time.perf_counter()
+            timings.add('total', now - started)
+            view_started = getattr(request, '_view_started', None)
+            if view_started is not None:
+                timings.add('view', now - view_started)
+        finally:
+            deactivate(token)
+
+        if _wants_server_timing(request):
+            response['Server-Timing'] = timings.server_timing()
+        self._record(request, response, timings)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._view_started = time.perf_counter()
+
+    def _record(self, request, response, timings):
+        match = getattr(request, 'resolver_match', None)
+        route = (match.view_name if match else None) or '-'
+        tenant = getattr(request, 'tenant', None)
+        school_id, roles = tenant.peek() if tenant is not None else (None, ())
+        role = ','.join(sorted(roles)) or '-'
+        metrics.observe_request(
+            match.view_name if match else None, request.method, response.status_code,
+            timings.spans['total'], timings.db_queries, school_id,
+        )
+        logger.info(
+            f"route={route} method={request.method} status={response.status_code} "
+            f"school_id={school_id or '-'} role={role} "
+            f"db_queries={timings.db_queries} db_ms={timings.ms('db')} "
+            f"serialize_ms={timings.ms('serialize')} render_ms={timings.ms('render')} "
+            f"view_ms={timings.ms('view')} total_ms={timings.ms('total')}",
+            extra={
+                'route': route, 'school_id': school_id, 'role': role,
+                'status_code': response.status_code, 'db_queries': timings.db_queries,
+                'timings_ms': {name: timings.ms(name) for name in timings.spans},
+            },
+        )
+
+
+def _wants_server_timing(request):
+    """Staff users, or JWTs issued with the ``debug`` claim."""
+    user = getattr(request, 'user', None)
+    if user is not None and getattr(user, 'is_staff', False):
+        return True
+    auth = getattr(request, 'auth', None)
+    return bool(auth is not None and hasattr(auth, 'get') and auth.get('debug'))
+
+
+class ProfilingMiddleware:
+    """
+    Profiles single requests on demand for staff users.
+
+    Send ``X-Profile: 1`` (or add ``?_profile=1``) as a staff user —
+    session or JWT — and the request runs under cProfile with its SQL
+    captured. The result is saved as a RequestProfile (Admin → Request
+    profiles) and its id returned in ``X-Profile-Id``.
+
+    Requests without the trigger pay one dict lookup and one substring
+    check; the user is only looked up when the trigger is present.
+    Must run after TenantContextMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if PROFILE_HEADER not in request.META and PROFILE_PARAM not in request.META.get('QUERY_STRING', ''):
+            return self.get_response(request)
+        user = _staff_user(request)
+        if user is None:
+            return self.get_response(request)
+        return self._profile(request, user)
+
+    def _profile(self, request, user):
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        with CaptureQueriesContext(connection) as queries:
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+                if getattr(response, 'streaming', False):
+                    # Exports do their work while streaming; profile that too.
+                    response.streaming_content = [b''.join(response.streaming_content)]
+            finally:
+                profiler.disable()
+        duration = time.perf_counter() - started
+
+        summary = io.StringIO()
+        stats = pstats.Stats(profiler, stream=summary)
+        stats.sort_stats('cumulative').print_stats(PROFILE_SUMMARY_LINES)
+        match = getattr(request, 'resolver_match', None)
+        school_id, _ = request.tenant.peek()
+        profile = RequestProfile.objects.create(
+            user=user, school_id=school_id, method=request.method,
+            path=request.get_full_path()[:500], route=(match.view_name if match else '') or '',
+            status_code=response.status_code, duration_ms=round(duration * 1000, 2),
+            query_count=len(queries),
+            sql=[
+                {'sql': q['sql'], 'time_ms': round(float(q['time']) * 1000, 2)}
+                for q in queries.captured_queries[:PROFILE_MAX_QUERIES]
+            ],
+            summary=summary.getvalue(), stats=marshal.dumps(stats.stats),
+        )
+        logger.info(f"Saved request profile {profile.pk} for {request.method} {request.path}")
+        response['X-Profile-Id'] = str(profile.pk)
+        return response
+
+
+def _staff_user(request):
+    """The requesting staff user (session or JWT), or None."""
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated and user.is_staff:
+        return user
+    try:
+        result = JWTAuthentication().authenticate(request)
+    except (InvalidToken, AuthenticationFailed):
+        return None
+    if result is not None and result[0].is_staff:
+        return result[0]
+    return None
@@ -0,0 +1,104 @@
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import NotFound
+from apps.accounts.authentication import TenantTokenUser
+from apps.core.renderers import IlimiStreamingRenderer
+from apps.core.timing import timed
+from apps.tenants.context import get_tenant_context
+from apps.tenants.models import School
+
+
+class SchoolScopedMixin:
+    """
+    Scopes an API view to the requesting user's school.
+
+    Token users carry their school and branch as claims, so views that
+    only need the ids (``get_school_id``, ``get_branch_id``) make no
+    tenant query at all. Other users — sessions, tokens issued before
+    the claims existed — fall back to the request's TenantContext, whose
+    membership lookup is shared with anything else that ran earlier.
+    ``get_school`` loads the School row for views that need more than
+    its id.
+    """
+
+    def _claims(self):
+        user = self.request.user
+        return user if isinstance(user, TenantTokenUser) else None
+
+    def get_membership(self):
+        membership = get_tenant_context(self.request).membership
+        if not membership:
+            raise NotFound("No school found for your account.")
+        return membership
+
+    def get_school_id(self):
+        claims = self._claims()
+        if claims is None:
+            return self.get_membership().school_id
+        if claims.school_id is None:
+            raise NotFound("No school found for your account.")
+        return claims.school_id
+
+    def get_branch_id(self):
+        claims = self._claims()
+        if claims is None:
+            return self.get_membership().branch_id
+        self.get_school_id()
+        return claims.branch_id
+
+    def get_school(self):
+        if self._claims() is None:
+            return self.get_membership().school
+        try:
+            return School.objects.get(pk=self.get_school_id())
+        except School.DoesNotExist:
+            raise NotFound("No school found for your account.")
+
+
+class ListResponseMixin:
+    """
+    Builds a paginated list response for GenericAPIView subclasses.
+
+    The page is materialised once for serialization; the paginator derives
+    the count from it where it can, so list endpoints avoid a separate
+    COUNT(*) in the common case.
+    """
+
+    def list_response(self, queryset, serializer_class, key):
+        page = self.paginate_queryset(queryset)
+        with timed('serialize'):
+            data = serializer_class(page, many=True).data
+        return self.get_paginated_response({key: data})
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+class ExportMixin:
+    """
+    Streams an entire queryset in the standard envelope.
+
+    Rows are read with ``queryset.iterator()`` (a server-side cursor on
+    PostgreSQL) and serialized ``chunk_size`` at a time.
+    """
+    export_chunk_size = EXPORT_CHUNK_SIZE
+
+    def export_response(self, queryset, serializer_class, message='Export successful'):
+        renderer = IlimiStreamingRenderer()
+        return StreamingHttpResponse(
+            renderer.stream(self._serialized_chunks(queryset, serializer_class), message),
+            content_type=f'{renderer.media_type}; charset={renderer.charset}',
+        )
+
+    def _serialized_chunks(self, queryset, serializer_class):
+        batch = []
+        for obj in queryset.iterator(chunk_size=self.export_chunk_size):
+            batch.append(obj)
+            if len(batch) == self.export_chunk_size:
+                yield self._serialize_chunk(serializer_class, batch)
+                batch = []
+        if batch:
+            yield self._serialize_chunk(serializer_class, batch)
+
+    def _serialize_chunk(self, serializer_class, batch):
+        with timed('serialize'):
+            return serializer_class(batch, many=True).data
@@ -0,0 +1,41 @@
+from django.db import models
+
+
+class RequestProfile(models.Model):
+    """
+    A cProfile capture of one request, made on demand by a staff user
+    (see ProfilingMiddleware).
+
+    ``stats`` holds the marshalled pstats data — the same bytes
+    ``cProfile.Profile.dump_stats`` writes — so a download opens in
+    ``python -m pstats`` or snakeviz.
+    """
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    user = models.ForeignKey(
+        'accounts.User',
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='request_profiles'
+    )
+    school = models.ForeignKey(
+        'tenants.School',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='request_profiles'
+    )
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500)
+    route = models.CharField(max_length=200, blank=True)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    query_count = models.PositiveIntegerField()
+    sql = models.JSONField(default=list)
+    summary = models.TextField(blank=True)
+    stats = models.BinaryField()
+
+    def __str__(self):
+        return f'{self.method} {self.path} ({self.duration_ms:.0f}ms)'
+
+    class Meta:
+        ordering = ['-created_at']
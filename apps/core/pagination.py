@@ -0,0 +1,92 @@
+import hashlib
+import json
+from django.core.cache import cache
+from django.db import connections
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+# Counts at or above this size are cached briefly instead of being
+# recomputed on every request; smaller ones are cheap enough to run exact.
+LARGE_COUNT_THRESHOLD = 1000
+COUNT_CACHE_TIMEOUT = 60
+
+
+def _count_cache_key(queryset):
+    sql = f'{queryset.db}:{queryset.order_by().query}'
+    return f'core:count:{hashlib.md5(sql.encode()).hexdigest()}'
+
+
+def cached_count(queryset):
+    """Exact count, cached for COUNT_CACHE_TIMEOUT once it gets large."""
+    key = _count_cache_key(queryset)
+    count = cache.get(key)
+    if count is None:
+        count = queryset.order_by().count()
+        if count >= LARGE_COUNT_THRESHOLD:
+            cache.set(key, count, COUNT_CACHE_TIMEOUT)
+    return count
+
+
+def estimated_count(queryset):
+    """Planner row estimate on PostgreSQL; cached exact count elsewhere."""
+    if connections[queryset.db].vendor != 'postgresql':
+        return cached_count(queryset)
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class IlimiCursorPagination(CursorPagination):
+    """
+    Keyset pagination for Ilimi list endpoints.
+
+    Pages are fetched with ``WHERE <ordering> > <position>`` rather than
+    OFFSET, so deep pages cost the same as the first one. Cursors are
+    opaque and page size is capped.
+
+    Views choose the keyset with ``cursor_ordering`` — an unchanging,
+    indexed field (``id`` by default). A field that can repeat needs
+    ``id`` after it, e.g. ``('name', 'id')``, so rows that tie keep one
+    order from page to page.
+
+    ``count`` is included in every response and costs no extra query when
+    the whole list fits on the first page. Otherwise it is an exact count,
+    cached once large. Clients can pass ``?count=estimate`` for a planner
+    estimate, or ``?count=false`` to skip it.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = 'id'
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        count_mode = request.query_params.get(self.count_query_param, 'true').lower()
+        page = super().paginate_queryset(queryset, request, view)
+        self.count = self.get_count(queryset, page, count_mode)
+        return page
+
+    def get_count(self, queryset, page, count_mode):
+        if count_mode in ('0', 'false', 'no'):
+            return None
+        if self.cursor is None and not self.has_next:
+            return len(page)
+        if count_mode == 'estimate':
+            return estimated_count(queryset)
+        return cached_count(queryset)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, 'cursor_ordering', None) or self.ordering
+        if isinstance(ordering, str):
+            return (ordering,)
+        return tuple(ordering)
+
+    def get_paginated_response(self, data):
+        """
+        ``data`` is the view's usual payload, e.g. ``{'classrooms': [...]}``;
+        cursor links and the count are added alongside it.
+        """
+        payload = dict(data)
+        payload['next'] = self.get_next_link()
+        payload['previous'] = self.get_previous_link()
+        if self.count is not None:
+            payload['count'] = self.count
+        return Response(payload)
@@ -1,60 +1,64 @@
-from rest_framework.permissions import BasePermission
+from rest_framework.permissions import SAFE_METHODS, BasePermission
+from apps.tenants.context import get_tenant_context
 
 
-class IsSchoolMember(BasePermission):
-    """User must belong to at least one school."""
+class SchoolRolePermission(BasePermission):
+    """
+    Base class for role checks against the request's cached RoleSet.
+
+    Checks are pure set lookups — no queries once the role set is cached.
+    Views may set ``permission_branch_kwarg`` to the URL kwarg holding a
+    branch id, in which case only grants for that branch (or school-level
+    grants) count.
+    """
+    roles = ()
+
     def has_permission(self, request, view):
-        return (
-            request.user and
-            request.user.is_authenticated and
-            request.user.school_memberships.filter(is_active=True).exists()
-        )
+        if not (request.user and request.user.is_authenticated):
+            return False
+        role_set = get_tenant_context(request).role_set
+        roles = self.get_roles(request)
+        if not roles:
+            return bool(role_set)
+        return role_set.has_role(*roles, branch_id=self.get_branch_id(view))
+
+    def get_roles(self, request):
+        return self.roles
+
+    def get_branch_id(self, view):
+        kwarg = getattr(view, 'permission_branch_kwarg', None)
+        if kwarg is None:
+            return None
+        return getattr(view, 'kwargs', {}).get(kwarg)
+
+
+class IsSchoolMember(SchoolRolePermission):
+    """User must belong to at least one school."""
 
 
-class IsSchoolAdmin(BasePermission):
+class IsSchoolAdmin(SchoolRolePermission):
     """User must have school_admin role."""
-    def has_permission(self, request, view):
-        return (
-            request.user and
-            request.user.is_authenticated and
-            request.user.school_memberships.filter(
-                role='school_admin', is_active=True
-            ).exists()
-        )
+    roles = ('school_admin',)
 
 
-class IsBranchManager(BasePermission):
+class IsBranchManager(SchoolRolePermission):
     """User must have branch_manager role."""
-    def has_permission(self, request, view):
-        return (
-            request.user and
-            request.user.is_authenticated and
-            request.user.school_memberships.filter(
-                role='branch_manager', is_active=True
-            ).exists()
-        )
+    roles = ('branch_manager',)
 
 
-class IsTeacher(BasePermission):
+class IsTeacher(SchoolRolePermission):
     """User must have teacher role."""
-    def has_permission(self, request, view):
-        return (
-            request.user and
-            request.user.is_authenticated and
-            request.user.school_memberships.filter(
-                role='teacher', is_active=True
-            ).exists()
-        )
+    roles = ('teacher',)
 
 
-class IsSchoolAdminOrBranchManager(BasePermission):
+class IsSchoolAdminOrBranchManager(SchoolRolePermission):
     """User must be school_admin or branch_manager."""
-    def has_permission(self, request, view):
-        return (
-            request.user and
-            request.user.is_authenticated and
-            request.user.school_memberships.filter(
-                role__in=['school_admin', 'branch_manager'],
-                is_active=True
-            ).exists()
-        )
\ No newline at end of file
+    roles = ('school_admin', 'branch_manager')
+
+
+class IsSchoolMemberOrBranchEditor(SchoolRolePermission):
+    """Any member may read; writes need school_admin or branch_manager."""
+    roles = ('school_admin', 'branch_manager')
+
+    def get_roles(self, request):
+        return () if request.method in SAFE_METHODS else self.roles
@@ -1,5 +1,44 @@
+import datetime
+import decimal
 import json
+import uuid
+from django.utils.functional import Promise
 from rest_framework.renderers import JSONRenderer
+from apps.core.timing import timed
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def _default(obj):
+    """Encode the types serializers may leave in ``data`` that JSON can't."""
+    if isinstance(obj, decimal.Decimal):
+        # Keep full precision — these are usually fee amounts.
+        return str(obj)
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, Promise):
+        return str(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def _orjson_dumps(obj):
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _stdlib_dumps(obj):
+    return json.dumps(
+        obj, default=_default, ensure_ascii=False, separators=(',', ':')
+    ).encode('utf-8')
+
+
+# orjson when installed (several times faster on large list payloads),
+# stdlib json otherwise. Both produce compact UTF-8 bytes.
+dumps = _orjson_dumps if orjson is not None else _stdlib_dumps
 
 
 class IlimiAPIRenderer(JSONRenderer):
@@ -11,31 +50,70 @@ class IlimiAPIRenderer(JSONRenderer):
         "data": {...} | null,
         "errors": {...} | null
     }
+
+    The envelope only references the view's payload — nested data is
+    never copied and the view's dict is never mutated.
     """
     charset = 'utf-8'
+    dumps = staticmethod(dumps)
 
     def render(self, data, accepted_media_type=None, renderer_context=None):
         response = renderer_context.get('response') if renderer_context else None
         status_code = response.status_code if response else 200
 
+        with timed('render'):
+            return self.dumps(self.build_envelope(data, status_code))
+
+    def build_envelope(self, data, status_code):
         is_error = status_code >= 400
 
         if isinstance(data, dict) and 'status' in data and 'data' in data:
             # Already formatted — pass through
-            envelope = data
-        elif is_error:
-            envelope = {
+            return data
+        if is_error:
+            return {
                 'status': 'error',
                 'message': data.get('detail', 'An error occurred') if isinstance(data, dict) else 'An error occurred',
                 'data': None,
                 'errors': data if isinstance(data, dict) else None,
             }
+        if isinstance(data, dict) and 'message' in data:
+            # Shallow copy of the top-level keys only.
+            message = data['message']
+            data = {key: value for key, value in data.items() if key != 'message'}
         else:
-            envelope = {
-                'status': 'success',
-                'message': data.pop('message', 'Request successful') if isinstance(data, dict) else 'Request successful',
-                'data': data,
-                'errors': None,
-            }
+            message = 'Request successful'
+        return {
+            'status': 'success',
+            'message': message,
+            'data': data,
+            'errors': None,
+        }
+
+
+class IlimiStreamingRenderer:
+    """
+    Streams the standard envelope for very large list payloads:
+
+        {"status": "success", "message": "...", "data": [...], "errors": null}
+
+    Rows arrive in chunks (lists of already-serialized dicts) and are
+    encoded one chunk at a time, so memory stays flat however large the
+    tenant is. Once streaming starts the status code is fixed, so errors
+    part-way through end the response early rather than changing it.
+    """
+    media_type = 'application/json'
+    charset = 'utf-8'
+    dumps = staticmethod(dumps)
 
-        return json.dumps(envelope, ensure_ascii=False, indent=None).encode(self.charset)
\ No newline at end of file
+    def stream(self, chunks, message='Request successful'):
+        yield b'{"status":"success","message":' + self.dumps(message) + b',"data":['
+        first = True
+        for rows in chunks:
+            if not rows:
+                continue
+            # Encode the chunk as one list, then drop the brackets.
+            body = self.dumps(rows)[1:-1]
+            yield body if first else b',' + body
+            first = False
+        yield b'],"errors":null}'
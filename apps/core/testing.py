@@ -0,0 +1,140 @@
+import json
+import unittest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def _plan_nodes(node):
+    yield node
+    for child in node.get('Plans', ()):
+        yield from _plan_nodes(child)
+
+
+def requires_postgres(test_item):
+    """Skip a test (or test case) unless the default database is Postgres."""
+    return unittest.skipUnless(
+        connection.vendor == 'postgresql', 'Query plans are only checked on Postgres.'
+    )(test_item)
+
+
+class QueryPlanMixin:
+    """
+    Assertions over Postgres query plans, for TestCase subclasses.
+
+    Seed enough rows for the planner to prefer an index, run ANALYZE
+    (``analyze_tables``), then assert that hot queries never fall back
+    to a sequential scan of the tables they filter.
+    """
+
+    @staticmethod
+    def analyze_tables(*models):
+        with connection.cursor() as cursor:
+            for model in models:
+                cursor.execute(f'ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
+
+    def assertNoSeqScan(self, queryset, *models):
+        """Fail if the plan for ``queryset`` seq-scans any of ``models``' tables."""
+        plan = json.loads(queryset.explain(format='json'))
+        if isinstance(plan, list):
+            plan = plan[0]
+        tables = {model._meta.db_table for model in models}
+        scanned = {
+            node.get('Relation Name')
+            for node in _plan_nodes(plan['Plan'])
+            if node['Node Type'] == 'Seq Scan'
+        }
+        self.assertFalse(
+            scanned & tables,
+            f"Sequential scan on {', '.join(sorted(scanned & tables))}:\n"
+            f"{json.dumps(plan, indent=2)}",
+        )
+
+
+# ── Query budgets ─────────────────────────────────────────────────────────
+# Maximum queries per request for every route in config/api_urls.py, by
+# URL name and method; every method a route's view allows needs one.
+# Budgets are absolute: they must hold at 1, 10 and 1000 rows, so a
+# query-per-row regression fails at the larger sizes. Writes are
+# measured once, at the largest size.
+# Session-authenticated worst case: cold role cache, multi-page count.
+
+QUERY_BUDGETS = {
+    # Auth
+    'auth-v1:register-step1': {'POST': 6},
+    'auth-v1:register-step2': {'POST': 7},
+    'auth-v1:otp-verify': {'POST': 5},
+    'auth-v1:otp-resend': {'POST': 6},
+    'auth-v1:token-obtain': {'POST': 4},
+    'auth-v1:token-refresh': {'POST': 13},  # rotation + blacklist
+    'auth-v1:password-reset': {'POST': 1},
+    'auth-v1:password-reset-confirm': {'POST': 2},
+    # Schools
+    'tenants-v1:school-me': {'GET': 2, 'PATCH': 3},
+    'tenants-v1:branch-list-create': {'GET': 3, 'POST': 3},
+    'tenants-v1:branch-detail': {'GET': 3, 'PATCH': 4},  # + role set for the branch check
+    'tenants-v1:member-list-invite': {'GET': 3, 'POST': 8},  # new user + welcome SMS
+    'tenants-v1:member-export': {'GET': 2},
+    # Academics
+    'academic-year-list': {'GET': 3, 'POST': 4},
+    'academic-year-detail': {'GET': 2, 'PATCH': 4},
+    'academic-year-rollover': {'POST': 30},
+    'term-list': {'GET': 3, 'POST': 5},
+    'class-level-list': {'GET': 2, 'POST': 3},
+    'classroom-list': {'GET': 4, 'POST': 8},
+    'classroom-bulk-create': {'POST': 14},
+    'classroom-detail': {'GET': 2, 'PATCH': 4},
+    'subject-list': {'GET': 3, 'POST': 3},
+    'subject-bulk-create': {'POST': 8},
+    'subject-detail': {'GET': 2, 'PATCH': 4},
+    'assignment-list': {'GET': 3, 'POST': 10},
+    'assignment-bulk-create': {'POST': 10},
+    'assignment-export': {'GET': 2},
+}
+
+BUDGET_SIZES = (1, 10, 1000)
+
+
+class QueryBudgetMixin:
+    """
+    Query-count assertions against QUERY_BUDGETS, for TestCase subclasses.
+
+        def test_subject_list(self):
+            self.assertBudgetAtScale(
+                'subject-list', 'GET', self.seed_subjects,
+                lambda: self.client.get('/api/v1/academics/subjects/'),
+            )
+
+    ``seed(n)`` must grow the data to ``n`` rows; it runs outside the
+    query capture. Streaming responses are consumed inside it, since
+    their queries run while the body is produced.
+    """
+    budget_sizes = BUDGET_SIZES
+
+    def assertQueryBudget(self, route, method, call):
+        budget = QUERY_BUDGETS[route][method]
+        with CaptureQueriesContext(connection) as queries:
+            response = call()
+            if getattr(response, 'streaming', False):
+                response.streaming_content = [b''.join(response.streaming_content)]
+        self.assertLessEqual(
+            len(queries), budget,
+            f"{method} {route} ran {len(queries)} queries (budget {budget}):\n"
+            + '\n'.join(query['sql'] for query in queries.captured_queries),
+        )
+        return response
+
+    def assertBudgetAtScale(self, route, method, seed, call):
+        for size in self.budget_sizes:
+            seed(size)
+            with self.subTest(route=route, rows=size):
+                response = self.assertQueryBudget(route, method, call)
+                self.assertLess(response.status_code, 400)
+
+    def assertWriteBudget(self, route, method, seed, call):
+        """Writes change the data, so they are measured once, at the largest size."""
+        seed(self.budget_sizes[-1])
+        cache.clear()
+        with self.subTest(route=route, method=method):
+            response = self.assertQueryBudget(route, method, call)
+            self.assertLess(response.status_code, 400, getattr(response, 'data', None))
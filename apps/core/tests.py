@@ -0,0 +1,197 @@
+import copy
+import datetime
+import decimal
+import json
+import marshal
+import uuid
+from types import SimpleNamespace
+from unittest import skipUnless
+from django.apps import apps
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework.test import APIClient
+from apps.accounts.models import User
+from apps.accounts.tokens import IlimiRefreshToken
+from apps.core.metrics import TenantLabeler
+from apps.core import renderers
+from apps.core.models import RequestProfile
+from apps.tenants.models import School, SchoolMember
+
+
+class ProfilingMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = School.objects.create(
+            name='Accra Academy', email='info@school.test', phone='0200000000',
+            address='Accra', city='Accra', onboarding_complete=True,
+        )
+        cls.staff = User.objects.create_user('ops@ilimi.test', 'pass12345!', is_staff=True)
+        cls.admin = User.objects.create_user('admin@school.test', 'pass12345!')
+        for user in (cls.staff, cls.admin):
+            SchoolMember.objects.create(user=user, school=cls.school, role='school_admin')
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, user, url='/api/v1/schools/me/branches/', **headers):
+        client = APIClient()
+        access = IlimiRefreshToken.for_user(user).access_token
+        return client.get(url, HTTP_AUTHORIZATION=f'Bearer {access}', **headers)
+
+    def test_staff_request_is_profiled(self):
+        response = self.get(self.staff, HTTP_X_PROFILE='1')
+        self.assertEqual(response.status_code, 200)
+        profile = RequestProfile.objects.get(pk=response['X-Profile-Id'])
+        self.assertEqual(profile.route, 'tenants-v1:branch-list-create')
+        self.assertEqual(profile.school_id, self.school.pk)
+        self.assertEqual(profile.query_count, len(profile.sql))
+        self.assertTrue(marshal.loads(bytes(profile.stats)))
+
+    def test_query_param_trigger(self):
+        response = self.get(self.staff, url='/api/v1/schools/me/branches/?_profile=1')
+        self.assertIn('X-Profile-Id', response)
+
+    def test_non_staff_and_untriggered_requests_are_not_profiled(self):
+        self.assertNotIn('X-Profile-Id', self.get(self.admin, HTTP_X_PROFILE='1'))
+        self.assertNotIn('X-Profile-Id', self.get(self.staff))
+        self.assertFalse(RequestProfile.objects.exists())
+
+    @override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+    def test_admin_download(self):
+        profile_id = self.get(self.staff, HTTP_X_PROFILE='1')['X-Profile-Id']
+        User.objects.filter(pk=self.staff.pk).update(is_superuser=True)
+        self.client.force_login(self.staff)
+        listing = self.client.get('/admin/core/requestprofile/')
+        self.assertContains(listing, f'/admin/core/requestprofile/{profile_id}/download/')
+        download = self.client.get(f'/admin/core/requestprofile/{profile_id}/download/')
+        self.assertEqual(download['Content-Type'], 'application/octet-stream')
+
+
+class RequestTimingTests(TestCase):
+    """RequestTimingMiddleware logs every request; Server-Timing is opt-in."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = School.objects.create(
+            name='Accra Academy', email='info@school.test', phone='0200000000',
+            address='Accra', city='Accra', onboarding_complete=True,
+        )
+        cls.admin = User.objects.create_user(
+            'admin@school.test', 'pass12345!', first_name='Ama', last_name='Mensah'
+        )
+        cls.staff = User.objects.create_user(
+            'ops@ilimi.test', 'pass12345!', first_name='Kofi', last_name='Boateng', is_staff=True
+        )
+        for user in (cls.admin, cls.staff):
+            SchoolMember.objects.create(user=user, school=cls.school, role='school_admin')
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, user):
+        client = APIClient()
+        access = IlimiRefreshToken.for_user(user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        return client.get('/api/v1/schools/me/branches/')
+
+    def test_debug_claim_gets_server_timing(self):
+        response = self.get(self.staff)
+        self.assertEqual(response.status_code, 200)
+        header = response['Server-Timing']
+        for span in ('db;', 'serialize;', 'render;', 'view;', 'total;'):
+            self.assertIn(span, header)
+
+    def test_regular_users_get_no_header_but_are_logged(self):
+        with self.assertLogs('ilimi.requests', 'INFO') as logs:
+            response = self.get(self.admin)
+        self.assertNotIn('Server-Timing', response)
+        record = logs.records[-1]
+        self.assertEqual(record.route, 'tenants-v1:branch-list-create')
+        self.assertEqual(record.school_id, self.school.pk)
+        self.assertEqual(record.role, 'school_admin')
+
+
+class MetricsTests(TestCase):
+    @override_settings(METRICS_TOKEN='scrape-secret')
+    def test_scrape_requires_token_and_reports_routes(self):
+        self.client.get('/api/v1/schools/me/')
+        self.assertEqual(self.client.get('/metrics').status_code, 404)
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            'ilimi_http_requests_total{method="GET",route="tenants-v1:school-me",status="401"}',
+            response.content.decode(),
+        )
+
+    def test_tenant_labels_are_bounded(self):
+        labeler = TenantLabeler(allow=[7], buckets=4)
+        self.assertEqual(
+            [labeler.label(i) for i in (7, 1, 5, 1002, None)],
+            ['7', 'bucket-1', 'bucket-1', 'bucket-2', 'other'],
+        )
+        self.assertEqual({labeler.label(i) for i in range(10000)}, {'7'} | {f'bucket-{b}' for b in range(4)})
+        self.assertEqual(TenantLabeler().label(3), 'other')
+
+
+class RendererTests(SimpleTestCase):
+    payload = {
+        'fee': decimal.Decimal('1250.50'),
+        'due': datetime.date(2026, 9, 1),
+        'paid_at': datetime.datetime(2026, 9, 1, 8, 30, 15, 250000, tzinfo=datetime.timezone.utc),
+        'reference': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'label': gettext_lazy('Term fees'),
+        'payer': 'Kwabena Ɔsei',
+        'by_term': {1: 0.1, 2: [True, None]},
+    }
+
+    def render(self, data, status_code=200):
+        renderer = renderers.IlimiAPIRenderer()
+        body = renderer.render(data, renderer_context={'response': SimpleNamespace(status_code=status_code)})
+        return json.loads(body)
+
+    def test_envelope_leaves_the_payload_alone(self):
+        data = {'message': 'Branch created.', 'branch': {'id': 1, 'tags': ['main']}}
+        original = copy.deepcopy(data)
+        envelope = renderers.IlimiAPIRenderer().build_envelope(data, 201)
+        self.assertIs(envelope['data']['branch'], data['branch'])  # referenced, not copied
+        self.assertEqual(self.render(data, 201), {
+            'status': 'success', 'message': 'Branch created.',
+            'data': {'branch': {'id': 1, 'tags': ['main']}}, 'errors': None,
+        })
+        self.assertEqual(data, original)
+
+    def test_errors_and_preformatted_payloads(self):
+        self.assertEqual(self.render({'detail': 'Not found.'}, 404), {
+            'status': 'error', 'message': 'Not found.', 'data': None, 'errors': {'detail': 'Not found.'},
+        })
+        formatted = {'status': 'success', 'message': 'Done', 'data': [1], 'errors': None}
+        self.assertEqual(self.render(formatted), formatted)
+
+    def test_values_serializers_leave_behind(self):
+        expected = {
+            'fee': '1250.50', 'due': '2026-09-01', 'paid_at': '2026-09-01T08:30:15.250000+00:00',
+            'reference': '12345678-1234-5678-1234-567812345678', 'label': 'Term fees',
+            'payer': 'Kwabena Ɔsei', 'by_term': {'1': 0.1, '2': [True, None]},
+        }
+        self.assertEqual(json.loads(renderers._stdlib_dumps(self.payload)), expected)
+        if renderers.orjson is not None:
+            self.assertEqual(json.loads(renderers._orjson_dumps(self.payload)), expected)
+        with self.assertRaises(TypeError):
+            renderers.dumps({'value': object()})
+
+    @skipUnless(renderers.orjson, 'orjson is not installed')
+    def test_orjson_and_stdlib_output_match(self):
+        self.assertEqual(renderers._orjson_dumps(self.payload), renderers._stdlib_dumps(self.payload))
+        rows = [{'id': i, 'name': f'Class {i}'} for i in range(3)]
+        self.assertEqual(renderers._orjson_dumps(rows), renderers._stdlib_dumps(rows))
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    def test_local_cache_is_refused_outside_debug(self):
+        config = apps.get_app_config('core')
+        with override_settings(DEBUG=True):
+            config.ready()
+        with override_settings(DEBUG=False), self.assertRaises(ImproperlyConfigured):
+            config.ready()
@@ -0,0 +1,70 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current = ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    """
+    Accumulated timings for one request.
+
+    Spans (``serialize``, ``render``...) are summed in seconds; the DB
+    span also counts queries. RequestTimingMiddleware creates one per
+    request and makes it current for code that has no request handle.
+    """
+
+    def __init__(self):
+        self.spans = {}
+        self.db_queries = 0
+
+    def add(self, name, seconds):
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def ms(self, name):
+        return round(self.spans.get(name, 0.0) * 1000, 2)
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        """connection.execute_wrapper hook: time and count every query."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.add('db', time.perf_counter() - started)
+            self.db_queries += 1
+
+    def server_timing(self):
+        """Format as a Server-Timing header value."""
+        parts = []
+        for name in sorted(self.spans):
+            entry = f'{name};dur={self.ms(name)}'
+            if name == 'db':
+                entry += f';desc="{self.db_queries} queries"'
+            parts.append(entry)
+        return ', '.join(parts)
+
+
+def current_timings():
+    return _current.get()
+
+
+def activate(timings):
+    return _current.set(timings)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+@contextmanager
+def timed(name):
+    """Add the time spent in the block to the current request's ``name`` span."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
@@ -0,0 +1,22 @@
+import hmac
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from apps.core.metrics import render_metrics
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint.
+
+    Requires ``Authorization: Bearer <METRICS_TOKEN>`` when METRICS_TOKEN
+    is set; without a token it is only served in DEBUG.
+    """
+    token = settings.METRICS_TOKEN
+    if token:
+        supplied = request.headers.get('Authorization', '').removeprefix('Bearer ')
+        if not hmac.compare_digest(supplied.encode(), token.encode()):
+            raise Http404
+    elif not settings.DEBUG:
+        raise Http404
+    body, content_type = render_metrics()
+    return HttpResponse(body, content_type=content_type)
@@ -1,6 +1,7 @@
 import logging
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
+from apps.tenants.context import get_tenant_context
 
 logger = logging.getLogger(__name__)
 
@@ -19,11 +20,7 @@ def dashboard_home(request):
     Role-aware router — redirects authenticated users to their
     role-specific portal based on their SchoolMember role.
     """
-    from apps.tenants.models import SchoolMember
-
-    membership = SchoolMember.objects.filter(
-        user=request.user, is_active=True
-    ).select_related('school').first()
+    membership = get_tenant_context(request).membership
 
     if not membership:
         logger.warning(f"User {request.user.email} has no active school membership.")
@@ -1,7 +1,7 @@
 import logging
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
-from apps.tenants.models import SchoolMember
+from apps.tenants.context import get_tenant_context
 from apps.tenants.models import SchoolMember
 
 logger = logging.getLogger(__name__)
@@ -9,9 +9,7 @@ logger = logging.getLogger(__name__)
 
 def _get_membership(request):
     """Helper — returns the user's active membership or None."""
-    return SchoolMember.objects.filter(
-        user=request.user, is_active=True
-    ).select_related('school', 'branch').first()
+    return get_tenant_context(request).membership
 
 
 def _base_context(request, membership):
@@ -1,3 +1,48 @@
 from django.contrib import admin
+from .models import Broadcast, BroadcastRecipient, OutboxSMS
+from .services.broadcast import requeue_failed
+from .services.outbox import retry_messages
 
-# Register your models here.
+
+@admin.register(OutboxSMS)
+class OutboxSMSAdmin(admin.ModelAdmin):
+    list_display = ['recipient', 'kind', 'status', 'attempts', 'next_attempt_at', 'sent_at', 'delivered_at', 'created_at']
+    list_filter = ['status', 'kind']
+    search_fields = ['recipient', 'provider_message_id']
+    readonly_fields = ['created_at', 'sent_at', 'delivered_at', 'provider_message_id', 'last_error']
+    # Messages can hold OTP codes and temporary passwords.
+    exclude = ['message']
+    actions = ['retry_now']
+
+    @admin.action(description='Retry selected messages now')
+    def retry_now(self, request, queryset):
+        updated = retry_messages(queryset)
+        self.message_user(request, f'{updated} message(s) queued for retry.')
+
+
+@admin.register(Broadcast)
+class BroadcastAdmin(admin.ModelAdmin):
+    list_display = ['school', 'status', 'total', 'sent', 'failed', 'created_by', 'created_at', 'completed_at']
+    list_filter = ['status']
+    search_fields = ['school__name', 'message']
+    list_select_related = ['school', 'created_by']
+    raw_id_fields = ['school', 'created_by']
+    readonly_fields = ['total', 'sent', 'failed', 'created_at', 'claimed_at', 'completed_at']
+    actions = ['resend_failed']
+
+    @admin.action(description='Queue failed and unsent recipients again')
+    def resend_failed(self, request, queryset):
+        updated = requeue_failed(queryset)
+        skipped = queryset.count() - updated
+        message = f'{updated} broadcast(s) queued again.'
+        if skipped:
+            message += f' {skipped} still sending, skipped.'
+        self.message_user(request, message)
+
+
+@admin.register(BroadcastRecipient)
+class BroadcastRecipientAdmin(admin.ModelAdmin):
+    list_display = ['phone', 'broadcast', 'status', 'provider_message_id', 'sent_at']
+    list_filter = ['status']
+    search_fields = ['phone', 'provider_message_id']
+    raw_id_fields = ['broadcast']
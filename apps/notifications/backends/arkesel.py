@@ -1,6 +1,9 @@
 import requests
 import logging
 from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from apps.notifications.services.sms import normalize_phone
 
 logger = logging.getLogger(__name__)
 
@@ -9,53 +12,103 @@ class ArkeselSMSBackend:
     """
     Production SMS backend using Arkesel API v2.
     https://developers.arkesel.com
+
+    The endpoint comes from settings.ARKESEL_API_URL, so load tests can
+    point it at the local stub in benchmarks.sms_stub. ``api_url``,
+    ``api_key``, ``retries`` and ``read_timeout`` override the settings
+    per instance, e.g. for providers behind the routing backend.
+
+    One instance lives per process (see get_sms_backend) and sends
+    through a pooled keep-alive Session, so only the first message per
+    pooled connection pays for the TCP and TLS handshakes. Failed
+    connections and 429/503 answers are retried by the adapter; read
+    timeouts are not, since the gateway may already have sent the SMS.
+
+    Errors carry ``retryable``: False when the gateway rejected the
+    request outright (a 4xx other than 429), so the outbox gives up on
+    it instead of backing off.
     """
 
     API_URL = 'https://sms.arkesel.com/api/v2/sms/send'
 
-    def send(self, recipient, message, sender_id=None):
-        api_key = settings.ARKESEL_API_KEY
-        sender = sender_id or settings.SMS_SENDER_ID
+    def __init__(self, api_url=None, api_key=None, retries=2, read_timeout=None):
+        self.api_url = api_url
+        self.api_key = api_key
+        self.timeout = (settings.SMS_CONNECT_TIMEOUT, read_timeout or settings.SMS_READ_TIMEOUT)
+        retry = Retry(
+            total=retries, connect=retries, read=0, status=retries, other=0,
+            status_forcelist=(429, 503), allowed_methods=None,
+            backoff_factor=0.25, respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=settings.SMS_HTTP_POOL_SIZE, max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers['Content-Type'] = 'application/json'
 
+    def send(self, recipient, message, sender_id=None):
         # Normalize Ghana phone numbers to international format
         phone = self._normalize_phone(recipient)
+        result = self._post([phone], message, sender_id, phone)
+        if result['status'] == 'success':
+            sent = result['data'].get('data') or [{}]
+            result['message_id'] = sent[0].get('id', '')
+        return result
+
+    def send_bulk(self, recipients, message, sender_id=None):
+        """
+        Send one message to already-normalized numbers in a single request.
+        On success ``data`` lists ``{'recipient', 'id'}`` per number.
+        """
+        result = self._post(list(recipients), message, sender_id, f'{len(recipients)} recipients')
+        if result['status'] == 'success':
+            result['data'] = result['data'].get('data') or []
+        return result
+
+    def _post(self, phones, message, sender_id, label):
+        api_key = self.api_key or settings.SMS_API_KEY
+        api_url = self.api_url or getattr(settings, 'ARKESEL_API_URL', self.API_URL)
+        sender = sender_id or settings.SMS_SENDER_ID
 
         payload = {
             'sender': sender,
             'message': message,
-            'recipients': [phone],
+            'recipients': phones,
         }
 
-        headers = {
-            'api-key': api_key,
-            'Content-Type': 'application/json',
-        }
+        headers = {'api-key': api_key}
 
         try:
-            response = requests.post(
-                self.API_URL,
+            response = self.session.post(
+                api_url,
                 json=payload,
                 headers=headers,
-                timeout=10
+                timeout=self.timeout,
             )
             response.raise_for_status()
             data = response.json()
-            logger.info(f"SMS sent to {phone}: {data}")
+            logger.info(f"SMS sent to {label}: {data}")
             return {'status': 'success', 'data': data}
 
         except requests.exceptions.Timeout:
-            logger.error(f"SMS timeout sending to {phone}")
-            return {'status': 'error', 'message': 'SMS gateway timeout'}
+            logger.error(f"SMS timeout sending to {label}")
+            return {'status': 'error', 'message': 'SMS gateway timeout', 'retryable': True}
+
+        except requests.exceptions.HTTPError as e:
+            status_code = e.response.status_code
+            logger.error(f"SMS rejected sending to {label}: {str(e)}")
+            return {
+                'status': 'error', 'message': str(e),
+                'retryable': status_code == 429 or status_code >= 500,
+            }
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"SMS error sending to {phone}: {str(e)}")
-            return {'status': 'error', 'message': str(e)}
+            logger.error(f"SMS error sending to {label}: {str(e)}")
+            return {'status': 'error', 'message': str(e), 'retryable': True}
 
     def _normalize_phone(self, phone):
         """Convert Ghana numbers to international format."""
-        phone = phone.strip().replace(' ', '').replace('-', '')
-        if phone.startswith('0'):
-            return f'+233{phone[1:]}'
-        if phone.startswith('233'):
-            return f'+{phone}'
-        return phone
\ No newline at end of file
+        return normalize_phone(phone)
@@ -12,4 +12,11 @@ class ConsoleSMSBackend:
             f"Message: {message}\n"
             f"{'='*50}\n"
         )
-        return {'status': 'success', 'message_id': 'console-dev', 'recipient': recipient}
\ No newline at end of file
+        return {'status': 'success', 'message_id': 'console-dev', 'recipient': recipient}
+
+    def send_bulk(self, recipients, message, sender_id=None):
+        self.send(', '.join(recipients), message, sender_id)
+        return {
+            'status': 'success',
+            'data': [{'recipient': r, 'id': 'console-dev'} for r in recipients],
+        }
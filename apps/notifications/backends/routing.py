@@ -0,0 +1,181 @@
+import logging
+import threading
+import time
+from collections import deque
+from django.conf import settings
+from django.utils.module_loading import import_string
+from apps.core.metrics import record_sms_provider_send
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderHealth:
+    """
+    Rolling health of one provider, with a circuit breaker.
+
+    Keeps the outcome and duration of the last ``window`` sends. The
+    circuit opens after ``failure_threshold`` failures in a row, or when
+    a full window fails at ``error_rate_threshold`` or worse, and stays
+    open for ``cooldown`` seconds. After that it is half-open: one send
+    at a time goes through as a probe, which closes the circuit if it
+    succeeds and opens it again if it fails. The probe is the send
+    holding the ticket allow() handed out, so a concurrent send that
+    finishes first can't take its place.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, name, window=50, failure_threshold=5, error_rate_threshold=0.5,
+                 cooldown=30, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.outcomes = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.probe = None  # ticket of the send probing a half-open circuit
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return self.CLOSED
+        if self.clock() - self.opened_at >= self.cooldown:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    @property
+    def latency(self):
+        """Mean seconds per successful send; 0 until there is one, so new providers get tried."""
+        with self.lock:
+            durations = [seconds for ok, seconds in self.outcomes if ok]
+        return sum(durations) / len(durations) if durations else 0.0
+
+    @property
+    def error_rate(self):
+        with self.lock:
+            if not self.outcomes:
+                return 0.0
+            return sum(1 for ok, _ in self.outcomes if not ok) / len(self.outcomes)
+
+    def allow(self):
+        """
+        Whether a send may go to this provider now.
+
+        Returns a ticket to pass to record(), or False. When half-open
+        the ticket is the probe slot, taken by one send at a time.
+        """
+        with self.lock:
+            state = self.state
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and self.probe is None:
+                self.probe = object()
+                return self.probe
+            return False
+
+    def record(self, ok, seconds, ticket=True):
+        with self.lock:
+            probe = ticket is self.probe
+            if probe:
+                self.probe = None
+            self.outcomes.append((ok, seconds))
+            if ok:
+                self.consecutive_failures = 0
+                if self.opened_at is not None:
+                    logger.warning(f"SMS provider {self.name} recovered; circuit closed")
+                    self.opened_at = None
+                    self.outcomes.clear()
+                    self.outcomes.append((ok, seconds))
+                return
+
+            self.consecutive_failures += 1
+            failures = sum(1 for ok, _ in self.outcomes if not ok)
+            window_failing = (
+                len(self.outcomes) == self.outcomes.maxlen
+                and failures / len(self.outcomes) >= self.error_rate_threshold
+            )
+            if probe or self.consecutive_failures >= self.failure_threshold or window_failing:
+                if self.opened_at is None:
+                    logger.warning(
+                        f"SMS provider {self.name} circuit opened after "
+                        f"{self.consecutive_failures} consecutive failures"
+                    )
+                self.opened_at = self.clock()
+
+
+class RoutingSMSBackend:
+    """
+    Sends through several SMS providers, failing over between them.
+
+    Providers come from settings.SMS_PROVIDERS, a dict of name to
+    ``{'BACKEND': path, 'OPTIONS': {...}}`` (options are passed to the
+    backend's constructor). Each send goes to the fastest provider whose
+    circuit is closed — see ProviderHealth — and on a retryable error
+    moves on to the next, so one degraded gateway costs a single
+    timeout per send until its circuit opens, then nothing.
+
+    An error the gateway marks as not retryable (a rejected number, say)
+    is returned as is: the provider answered, and another would refuse
+    it too. If every provider fails or is open, the result is a
+    retryable error and the outbox backs off.
+
+    A read timeout is ambiguous — the first gateway may have sent the
+    message — so failover can deliver twice; that is the outbox's
+    at-least-once contract anyway. Health is tracked per process.
+    """
+
+    def __init__(self, providers=None, clock=time.monotonic):
+        providers = settings.SMS_PROVIDERS if providers is None else providers
+        self.providers = []
+        for name, config in providers.items():
+            backend = import_string(config['BACKEND'])(**config.get('OPTIONS', {}))
+            health = ProviderHealth(
+                name,
+                window=settings.SMS_ROUTING_WINDOW,
+                failure_threshold=settings.SMS_CIRCUIT_FAILURES,
+                error_rate_threshold=settings.SMS_CIRCUIT_ERROR_RATE,
+                cooldown=settings.SMS_CIRCUIT_COOLDOWN_SECONDS,
+                clock=clock,
+            )
+            self.providers.append((name, backend, health))
+
+    def ranked(self):
+        """Providers in the order to try them: due probes first, then the fastest healthy."""
+        def key(provider):
+            health = provider[2]
+            return (health.state != ProviderHealth.HALF_OPEN, health.latency)
+        return sorted(self.providers, key=key)
+
+    def send(self, recipient, message, sender_id=None):
+        return self._route('send', recipient, message, sender_id)
+
+    def send_bulk(self, recipients, message, sender_id=None):
+        return self._route('send_bulk', recipients, message, sender_id)
+
+    def _route(self, method, *args):
+        errors = []
+        for name, backend, health in self.ranked():
+            ticket = health.allow()
+            if not ticket:
+                continue
+            started = time.perf_counter()
+            try:
+                result = getattr(backend, method)(*args)
+            except Exception as e:
+                logger.exception(f"SMS provider {name} raised")
+                result = {'status': 'error', 'message': str(e) or type(e).__name__, 'retryable': True}
+            ok = result.get('status') == 'success' or not result.get('retryable', True)
+            health.record(ok, time.perf_counter() - started, ticket)
+            record_sms_provider_send(name, result.get('status', 'unknown'))
+            if ok:
+                result['provider'] = name
+                return result
+            errors.append(f"{name}: {result.get('message') or 'Gateway error'}")
+
+        message = '; '.join(errors) or 'No SMS provider available'
+        logger.error(f"SMS not sent: {message}")
+        return {'status': 'error', 'message': message, 'retryable': True}
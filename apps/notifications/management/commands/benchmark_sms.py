@@ -0,0 +1,57 @@
+import json
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from apps.notifications.backends.arkesel import ArkeselSMSBackend
+from apps.notifications.services.sms import get_sms_backend
+from benchmarks.sms import run_sms_benchmark
+from benchmarks.sms_stub import start_stub
+
+ARKESEL_BACKEND = 'apps.notifications.backends.arkesel.ArkeselSMSBackend'
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark bulk SMS sends through the Arkesel backend against a local '
+        'gateway stub, comparing a new connection per message with the pooled '
+        'process-wide backend.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=500)
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--latency-ms', type=float, default=20, help='Stub processing time per request.')
+        parser.add_argument('--jitter-ms', type=float, default=5)
+        parser.add_argument('--url', help='Send to this gateway URL instead of starting a local stub.')
+        parser.add_argument('--output', help='Write the JSON report to this path.')
+
+    def handle(self, *args, **options):
+        stub = None
+        url = options['url']
+        if not url:
+            stub = start_stub(latency_ms=options['latency_ms'], jitter_ms=options['jitter_ms'], seed=1)
+            url = stub.url
+
+        with override_settings(SMS_BACKEND=ARKESEL_BACKEND, ARKESEL_API_URL=url):
+            report = run_sms_benchmark(
+                ArkeselSMSBackend, get_sms_backend(),
+                messages=options['messages'], concurrency=options['concurrency'],
+            )
+        if stub:
+            stub.shutdown()
+            report['sms_stub'] = stub.config.stats
+
+        self.stdout.write(f'{report["messages"]} messages, {report["concurrency"]} threads, gateway {url}')
+        header = f'{"mode":<12}{"errs":>6}{"msg/s":>9}{"mean":>9}{"p50":>9}{"p95":>9}{"p99":>9}'
+        self.stdout.write(header)
+        self.stdout.write('─' * len(header))
+        for mode, stats in report['modes'].items():
+            latency = stats['latency_ms']
+            self.stdout.write(
+                f'{mode:<12}{stats["errors"]:>6}{stats["throughput_rps"]:>9}{latency["mean"]:>9}'
+                f'{latency["p50"]:>9}{latency["p95"]:>9}{latency["p99"]:>9}'
+            )
+        self.stdout.write('Latencies in ms per send.')
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'Report written to {options["output"]}'))
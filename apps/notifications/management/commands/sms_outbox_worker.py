@@ -0,0 +1,102 @@
+import signal
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+from apps.notifications.services.broadcast import claim_broadcast, send_broadcast_in_worker
+from apps.notifications.services.delivery import apply_delivery_reports
+from apps.notifications.services.outbox import drain_outbox, purge_outbox
+
+
+class Command(BaseCommand):
+    help = (
+        'Send queued SMS from the outbox. Claims due messages in batches, sends '
+        'each batch concurrently and reschedules failures with exponential '
+        'backoff. Queued broadcasts are sent one at a time on a side thread, so '
+        'outbox messages never wait behind them, and gateway delivery reports '
+        'are applied in batches. Finished messages are redacted and purged '
+        'per the SMS_OUTBOX retention settings. Run one or more alongside the '
+        'web workers; SIGTERM finishes the current batch and exits.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100, help='Messages claimed per batch.')
+        parser.add_argument('--concurrency', type=int, default=8, help='Messages sent in parallel.')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to sleep when idle.')
+        parser.add_argument('--once', action='store_true', help='Drain what is due now, then exit.')
+        parser.add_argument(
+            '--purge-interval', type=float, default=300,
+            help='Seconds between outbox retention purges.',
+        )
+        parser.add_argument(
+            '--no-broadcasts', action='store_true',
+            help='Only send outbox messages; leave broadcasts to other workers.',
+        )
+
+    def handle(self, *args, **options):
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        totals = Counter()
+        broadcasts = None if options['no_broadcasts'] else ThreadPoolExecutor(max_workers=1)
+        running = None
+        next_purge = 0
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            while not self.stopping:
+                try:
+                    outcome = drain_outbox(executor, options['batch_size'])
+                except KeyboardInterrupt:
+                    break
+                totals.update(outcome)
+                if outcome['claimed']:
+                    self.stdout.write(
+                        f"Sent {outcome['sent']}, retrying {outcome['pending']}, "
+                        f"failed {outcome['failed']} of {outcome['claimed']}"
+                    )
+                reports = apply_delivery_reports()
+                if reports['claimed']:
+                    self.stdout.write(
+                        f"Delivery reports: {reports['delivered']} delivered, "
+                        f"{reports['retried']} resending, {reports['failed']} failed, "
+                        f"{reports['unmatched']} unmatched"
+                    )
+                if time.monotonic() >= next_purge:
+                    next_purge = time.monotonic() + options['purge_interval']
+                    purged = purge_outbox()
+                    if purged['redacted'] or purged['deleted']:
+                        self.stdout.write(
+                            f"Outbox retention: {purged['redacted']} redacted, {purged['deleted']} deleted"
+                        )
+
+                if running is not None and running.done():
+                    self.report_broadcast(running.result())
+                    running = None
+                if broadcasts is not None and running is None:
+                    broadcast = claim_broadcast()
+                    if broadcast:
+                        running = broadcasts.submit(send_broadcast_in_worker, broadcast)
+
+                if outcome['claimed'] or reports['claimed']:
+                    continue
+                if options['once'] and running is None:
+                    break
+                try:
+                    time.sleep(options['poll_interval'])
+                except KeyboardInterrupt:
+                    break
+        if broadcasts is not None:
+            # Let the broadcast in flight finish; its unsent numbers would stay pending.
+            broadcasts.shutdown()
+            if running is not None:
+                self.report_broadcast(running.result())
+        self.stdout.write(self.style.SUCCESS(
+            f"Outbox worker stopped: {totals['sent']} sent, {totals['failed']} failed."
+        ))
+
+    def report_broadcast(self, broadcast):
+        self.stdout.write(
+            f"Broadcast {broadcast.pk}: {broadcast.sent} sent, "
+            f"{broadcast.failed} failed of {broadcast.total}"
+        )
+
+    def stop(self, signum, frame):
+        self.stopping = True
@@ -0,0 +1,56 @@
+# Generated by Django 5.0 on 2026-10-18 13:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_broadcast'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeliveryReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider_message_id', models.CharField(max_length=100)),
+                ('status', models.CharField(choices=[('delivered', 'Delivered'), ('failed', 'Failed')], max_length=10)),
+                ('detail', models.CharField(blank=True, max_length=50)),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='outboxsms',
+            name='delivered_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='outboxsms',
+            name='kind',
+            field=models.CharField(choices=[('otp', 'OTP'), ('transactional', 'Transactional')], default='transactional', max_length=15),
+        ),
+        migrations.AddField(
+            model_name='outboxsms',
+            name='provider_message_id',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='broadcastrecipient',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('sent', 'Sent'), ('delivered', 'Delivered'), ('failed', 'Failed')], default='pending', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='outboxsms',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('sent', 'Sent'), ('delivered', 'Delivered'), ('failed', 'Failed')], default='pending', max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='broadcastrecipient',
+            index=models.Index(fields=['provider_message_id'], name='notif_bcast_provider_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='outboxsms',
+            index=models.Index(fields=['provider_message_id'], name='notif_outbox_provider_id_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-18 14:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0003_delivery_reports'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='broadcast',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
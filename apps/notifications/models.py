@@ -1,3 +1,177 @@
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class OutboxSMS(models.Model):
+    """
+    An SMS waiting to be sent by the outbox worker.
+
+    Rows are written in the caller's transaction, so a message exists if
+    and only if the work that triggered it committed. The worker
+    (``manage.py sms_outbox_worker``) claims due rows, sends them and
+    reschedules failures with exponential backoff.
+
+    ``sent`` means the gateway accepted the message; the gateway's
+    delivery report later moves it to ``delivered``, or back to
+    ``pending`` for another attempt if the handset never got it (OTPs
+    are ``failed`` instead; see apps.notifications.services.delivery).
+
+    Messages can carry OTP codes and temporary passwords, so ``message``
+    is blanked once the row won't be sent again — see
+    apps.notifications.services.outbox.REDACTED — and finished rows are
+    purged by the worker.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_SENDING = 'sending'
+    STATUS_SENT = 'sent'
+    STATUS_DELIVERED = 'delivered'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_SENDING, 'Sending'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_DELIVERED, 'Delivered'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    KIND_OTP = 'otp'
+    KIND_TRANSACTIONAL = 'transactional'
+    KIND_CHOICES = [
+        (KIND_OTP, 'OTP'),
+        (KIND_TRANSACTIONAL, 'Transactional'),
+    ]
+
+    recipient = models.CharField(max_length=20)
+    message = models.TextField()
+    sender_id = models.CharField(max_length=11, blank=True)
+    kind = models.CharField(max_length=15, choices=KIND_CHOICES, default=KIND_TRANSACTIONAL)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # When the row is next due. While sending, the end of the worker's lease.
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    provider_message_id = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f'SMS to {self.recipient} ({self.status})'
+
+    class Meta:
+        verbose_name = 'Outbox SMS'
+        verbose_name_plural = 'Outbox SMS'
+        indexes = [
+            models.Index(
+                fields=['next_attempt_at'],
+                name='notif_outbox_due_idx',
+                condition=models.Q(status__in=['pending', 'sending']),
+            ),
+            models.Index(fields=['provider_message_id'], name='notif_outbox_provider_id_idx'),
+        ]
+
+
+class Broadcast(models.Model):
+    """
+    One message sent to many numbers (e.g. every parent in a school).
+
+    Per-number outcomes live on BroadcastRecipient; the counters here
+    are filled in when sending finishes. ``claimed_at`` is the sending
+    worker's lease, renewed as it goes.
+    """
+    STATUS_QUEUED = 'queued'
+    STATUS_SENDING = 'sending'
+    STATUS_COMPLETED = 'completed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_SENDING, 'Sending'),
+        (STATUS_COMPLETED, 'Completed'),
+    ]
+
+    school = models.ForeignKey(
+        'tenants.School',
+        on_delete=models.CASCADE,
+        related_name='sms_broadcasts'
+    )
+    created_by = models.ForeignKey(
+        'accounts.User',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='sms_broadcasts'
+    )
+    message = models.TextField()
+    sender_id = models.CharField(max_length=11, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    total = models.PositiveIntegerField(default=0)
+    sent = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f'Broadcast to {self.total} recipients ({self.status})'
+
+    class Meta:
+        ordering = ['-created_at']
+
+
+class BroadcastRecipient(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_SENT = 'sent'
+    STATUS_DELIVERED = 'delivered'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_DELIVERED, 'Delivered'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    broadcast = models.ForeignKey(
+        Broadcast,
+        on_delete=models.CASCADE,
+        related_name='recipients'
+    )
+    phone = models.CharField(max_length=20)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    provider_message_id = models.CharField(max_length=100, blank=True)
+    error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f'{self.phone} ({self.status})'
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['broadcast', 'phone'], name='notif_broadcast_unique_phone'),
+        ]
+        indexes = [
+            models.Index(fields=['broadcast', 'status'], name='notif_bcast_recipient_st_idx'),
+            models.Index(fields=['provider_message_id'], name='notif_bcast_provider_id_idx'),
+        ]
+
+
+class DeliveryReport(models.Model):
+    """
+    A delivery report from the SMS gateway, waiting to be applied.
+
+    The webhook only inserts these; the outbox worker applies them to
+    OutboxSMS and BroadcastRecipient in batches and deletes them.
+    """
+    STATUS_DELIVERED = 'delivered'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_DELIVERED, 'Delivered'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    provider_message_id = models.CharField(max_length=100)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES)
+    # The gateway's own status, e.g. UNDELIV or EXPIRED.
+    detail = models.CharField(max_length=50, blank=True)
+    received_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'{self.provider_message_id} {self.status}'
@@ -0,0 +1,210 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from apps.notifications.models import Broadcast, BroadcastRecipient
+from apps.notifications.services.ratelimit import get_rate_limiter
+from apps.notifications.services.sms import (
+    get_sms_backend, normalize_phone, send_bulk_sms, send_sms,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_recipients(numbers):
+    """Normalize numbers, dropping blanks and duplicates (first one wins)."""
+    phones = {}
+    for number in numbers:
+        phone = normalize_phone(str(number or ''))
+        if phone:
+            phones.setdefault(phone, None)
+    return list(phones)
+
+
+@transaction.atomic
+def create_broadcast(school, message, recipients, created_by=None, sender_id=None):
+    """
+    Queue ``message`` for every number in ``recipients``.
+
+    Numbers are normalized and deduplicated first. The outbox worker
+    picks queued broadcasts up; call send_broadcast to send inline.
+    """
+    phones = normalize_recipients(recipients)
+    broadcast = Broadcast.objects.create(
+        school=school, created_by=created_by, message=message,
+        sender_id=sender_id or '', total=len(phones),
+    )
+    BroadcastRecipient.objects.bulk_create(
+        (BroadcastRecipient(broadcast=broadcast, phone=phone) for phone in phones),
+        batch_size=1000,
+    )
+    logger.info(f"Broadcast {broadcast.pk} queued for {len(phones)} recipients in {school.name}")
+    return broadcast
+
+
+def unleased(broadcasts):
+    """``broadcasts`` without those a worker is sending under a live lease."""
+    expired = timezone.now() - timedelta(seconds=settings.SMS_BROADCAST_LEASE_SECONDS)
+    return broadcasts.exclude(status=Broadcast.STATUS_SENDING, claimed_at__gte=expired)
+
+
+def claim_broadcast():
+    """
+    Claim the oldest queued broadcast for this worker, or return None.
+
+    A ``sending`` broadcast whose lease has run out (its worker died) is
+    claimed again; send_broadcast picks up its pending numbers.
+    """
+    with transaction.atomic():
+        broadcast = (
+            unleased(Broadcast.objects.select_for_update(skip_locked=True))
+            .filter(status__in=[Broadcast.STATUS_QUEUED, Broadcast.STATUS_SENDING])
+            .order_by('created_at')
+            .first()
+        )
+        if broadcast:
+            broadcast.status = Broadcast.STATUS_SENDING
+            broadcast.claimed_at = timezone.now()
+            broadcast.save(update_fields=['status', 'claimed_at'])
+    return broadcast
+
+
+def requeue_failed(broadcasts):
+    """
+    Queue the failed numbers of ``broadcasts`` again. Returns how many were requeued.
+
+    Broadcasts a worker is still sending are left alone, so their
+    numbers can't go out twice.
+    """
+    with transaction.atomic():
+        ids = list(
+            unleased(broadcasts.select_for_update(skip_locked=True)).values_list('pk', flat=True)
+        )
+        BroadcastRecipient.objects.filter(
+            broadcast__in=ids, status=BroadcastRecipient.STATUS_FAILED,
+        ).update(status=BroadcastRecipient.STATUS_PENDING, error='')
+        return Broadcast.objects.filter(pk__in=ids).update(
+            status=Broadcast.STATUS_QUEUED, claimed_at=None, completed_at=None,
+        )
+
+
+def send_broadcast(broadcast, executor=None, batch_size=None):
+    """
+    Send a broadcast's pending recipients and record each outcome.
+
+    Numbers go out in gateway batches of SMS_BROADCAST_BATCH_SIZE, sent
+    concurrently on ``executor`` (by default a pool of
+    SMS_BROADCAST_CONCURRENCY threads). Each batch waits for tokens in
+    the rate limiter's bulk lane, within the school's share. Only the
+    gateway calls run on the pool; results are written from the calling
+    thread as batches finish, renewing the broadcast's lease, so a crash
+    part-way leaves the rest pending for the next worker to claim. A
+    batch that raises is recorded as failed, for requeue_failed.
+    """
+    batch_size = batch_size or settings.SMS_BROADCAST_BATCH_SIZE
+    limit = get_rate_limiter().max_cost(priority=False)
+    if limit:
+        batch_size = min(batch_size, limit)
+    pending = dict(
+        broadcast.recipients.filter(status=BroadcastRecipient.STATUS_PENDING)
+        .values_list('phone', 'pk')
+    )
+    phones = list(pending)
+    batches = [phones[i:i + batch_size] for i in range(0, len(phones), batch_size)]
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=settings.SMS_BROADCAST_CONCURRENCY)
+    try:
+        futures = {
+            executor.submit(
+                _send_batch, batch, broadcast.message, broadcast.sender_id or None, broadcast.school_id,
+            ): batch
+            for batch in batches
+        }
+        for future in as_completed(futures):
+            try:
+                outcomes = future.result()
+            except Exception as e:
+                # E.g. the rate limiter's Redis is down; the other batches still go.
+                batch = futures[future]
+                logger.exception(f"Broadcast {broadcast.pk}: batch of {len(batch)} raised")
+                outcomes = dict.fromkeys(batch, _outcome({'message': str(e) or type(e).__name__}))
+            _record(pending, outcomes)
+            Broadcast.objects.filter(pk=broadcast.pk).update(claimed_at=timezone.now())
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+    counts = broadcast.recipients.aggregate(
+        sent=Count('pk', filter=Q(status=BroadcastRecipient.STATUS_SENT)),
+        failed=Count('pk', filter=Q(status=BroadcastRecipient.STATUS_FAILED)),
+    )
+    broadcast.status = Broadcast.STATUS_COMPLETED
+    broadcast.completed_at = timezone.now()
+    broadcast.sent, broadcast.failed = counts['sent'], counts['failed']
+    broadcast.save(update_fields=['status', 'completed_at', 'sent', 'failed'])
+    logger.info(f"Broadcast {broadcast.pk} finished: {broadcast.sent} sent, {broadcast.failed} failed")
+    return broadcast
+
+
+def send_broadcast_in_worker(broadcast):
+    """``send_broadcast`` for worker threads, which keep their own connection."""
+    try:
+        return send_broadcast(broadcast)
+    finally:
+        close_old_connections()
+
+
+def _send_batch(phones, message, sender_id, school_id):
+    """Send one batch; returns ``{phone: (status, provider_message_id, error)}``."""
+    get_rate_limiter().acquire(len(phones), school_id=school_id)
+    if not hasattr(get_sms_backend(), 'send_bulk'):
+        return {phone: _outcome(_send_one(phone, message, sender_id)) for phone in phones}
+    try:
+        result = send_bulk_sms(phones, message, sender_id)
+    except Exception as e:
+        logger.exception(f"Bulk SMS to {len(phones)} recipients raised")
+        result = {'status': 'error', 'message': str(e) or type(e).__name__}
+    if result.get('status') != 'success':
+        failure = _outcome(result)
+        return dict.fromkeys(phones, failure)
+    ids = {
+        str(entry.get('recipient', '')).lstrip('+'): str(entry.get('id', ''))
+        for entry in result.get('data') or []
+    }
+    return {
+        phone: (BroadcastRecipient.STATUS_SENT, ids.get(phone.lstrip('+'), ''), '')
+        for phone in phones
+    }
+
+
+def _send_one(phone, message, sender_id):
+    try:
+        return send_sms(phone, message, sender_id)
+    except Exception as e:
+        return {'status': 'error', 'message': str(e) or type(e).__name__}
+
+
+def _outcome(result):
+    if result.get('status') == 'success':
+        return BroadcastRecipient.STATUS_SENT, str(result.get('message_id', '')), ''
+    return BroadcastRecipient.STATUS_FAILED, '', result.get('message') or 'Gateway error'
+
+
+def _record(pending, outcomes):
+    now = timezone.now()
+    BroadcastRecipient.objects.bulk_update(
+        [
+            BroadcastRecipient(
+                pk=pending[phone], status=status, provider_message_id=provider_id[:100],
+                error=error, sent_at=now if status == BroadcastRecipient.STATUS_SENT else None,
+            )
+            for phone, (status, provider_id, error) in outcomes.items()
+        ],
+        ['status', 'provider_message_id', 'error', 'sent_at'],
+        batch_size=500,
+    )
@@ -0,0 +1,132 @@
+"""
+SMS delivery reports.
+
+The gateway calls the delivery-report webhook once a handset has (or
+hasn't) received a message. The webhook only parses the report and
+inserts DeliveryReport rows — one INSERT per request, no lookups — so it
+keeps up with a broadcast's worth of callbacks. The outbox worker then
+applies them in batches with apply_delivery_reports: a handful of
+UPDATEs per batch, whatever its size.
+"""
+import logging
+from collections import Counter
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from apps.notifications.models import BroadcastRecipient, DeliveryReport, OutboxSMS
+from apps.notifications.services.outbox import REDACTED, retry_delay
+
+logger = logging.getLogger(__name__)
+
+# Gateway statuses (Arkesel and the usual SMPP names) that are final.
+DELIVERED_STATUSES = frozenset(['DELIVERED', 'DELIVRD', 'SUCCESS'])
+FAILED_STATUSES = frozenset([
+    'UNDELIVERED', 'UNDELIV', 'FAILED', 'REJECTED', 'REJECTD', 'EXPIRED', 'DELETED',
+])
+ID_FIELDS = ('id', 'sms_id', 'message_id', 'messageId')
+
+
+def parse_reports(payload):
+    """
+    Turn a webhook payload into unsaved DeliveryReports.
+
+    Accepts one report, a list of them, or ``{'data': [...]}``. Reports
+    without an id, and interim statuses (queued, sent...), are skipped.
+    """
+    if isinstance(payload, dict) and isinstance(payload.get('data'), list):
+        payload = payload['data']
+    if isinstance(payload, dict):
+        payload = [payload]
+    if not isinstance(payload, list):
+        return []
+
+    reports = []
+    for item in payload:
+        if not isinstance(item, dict):
+            continue
+        provider_id = next((str(item[f]) for f in ID_FIELDS if item.get(f)), '')
+        detail = str(item.get('status') or '').strip().upper()
+        if detail in DELIVERED_STATUSES:
+            status = DeliveryReport.STATUS_DELIVERED
+        elif detail in FAILED_STATUSES:
+            status = DeliveryReport.STATUS_FAILED
+        else:
+            continue
+        if provider_id:
+            reports.append(DeliveryReport(
+                provider_message_id=provider_id[:100], status=status, detail=detail[:50],
+            ))
+    return reports
+
+
+def ingest_reports(payload):
+    """Store the reports in ``payload`` for the worker. Returns how many were kept."""
+    reports = parse_reports(payload)
+    if reports:
+        DeliveryReport.objects.bulk_create(reports)
+    return len(reports)
+
+
+def apply_delivery_reports(limit=1000):
+    """
+    Apply up to ``limit`` stored reports, then delete them.
+
+    Delivered messages move from ``sent`` to ``delivered``. Undelivered
+    outbox messages go back to ``pending`` with backoff while they have
+    attempts left, and are ``failed`` after that. Undelivered OTPs fail
+    straight away: by the time a resend arrived the code could be stale
+    or replaced, and the user can ask for a new one. So do messages
+    already redacted by purge_outbox. Delivered messages and failed OTPs
+    are redacted; other failures keep their text for a manual retry
+    until purge_outbox clears it. Broadcast recipients are just marked.
+
+    Returns a Counter of ``delivered``, ``retried``, ``failed`` and
+    ``unmatched`` reports (plus ``claimed``).
+    """
+    outcome = Counter()
+    with transaction.atomic():
+        reports = list(
+            DeliveryReport.objects.select_for_update(skip_locked=True).order_by('pk')[:limit]
+        )
+        outcome['claimed'] = len(reports)
+        if not reports:
+            return outcome
+        DeliveryReport.objects.filter(pk__in=[r.pk for r in reports]).delete()
+
+        # The latest report for a message wins.
+        latest = {r.provider_message_id: r for r in reports}
+        delivered = [pid for pid, r in latest.items() if r.status == DeliveryReport.STATUS_DELIVERED]
+        failed = [pid for pid, r in latest.items() if r.status == DeliveryReport.STATUS_FAILED]
+        now = timezone.now()
+
+        outcome['delivered'] = OutboxSMS.objects.filter(
+            provider_message_id__in=delivered, status=OutboxSMS.STATUS_SENT,
+        ).update(status=OutboxSMS.STATUS_DELIVERED, delivered_at=now, message=REDACTED)
+        outcome['delivered'] += BroadcastRecipient.objects.filter(
+            provider_message_id__in=delivered, status=BroadcastRecipient.STATUS_SENT,
+        ).update(status=BroadcastRecipient.STATUS_DELIVERED)
+
+        if failed:
+            undelivered = OutboxSMS.objects.filter(
+                provider_message_id__in=failed, status=OutboxSMS.STATUS_SENT,
+            )
+            # One retry time per batch (still jittered between batches).
+            outcome['retried'] = undelivered.filter(
+                attempts__lt=settings.SMS_OUTBOX_MAX_ATTEMPTS,
+            ).exclude(kind=OutboxSMS.KIND_OTP).exclude(message=REDACTED).update(
+                status=OutboxSMS.STATUS_PENDING, next_attempt_at=now + retry_delay(1),
+                last_error='Not delivered',
+            )
+            undelivered.filter(kind=OutboxSMS.KIND_OTP).update(message=REDACTED)
+            outcome['failed'] = undelivered.update(
+                status=OutboxSMS.STATUS_FAILED, last_error='Not delivered',
+            )
+            outcome['failed'] += BroadcastRecipient.objects.filter(
+                provider_message_id__in=failed, status=BroadcastRecipient.STATUS_SENT,
+            ).update(status=BroadcastRecipient.STATUS_FAILED, error='Not delivered')
+
+    matched = outcome['delivered'] + outcome['retried'] + outcome['failed']
+    outcome['unmatched'] = max(0, len(latest) - matched)
+    if outcome['unmatched']:
+        logger.warning(f"{outcome['unmatched']} SMS delivery report(s) matched no sent message")
+    return outcome
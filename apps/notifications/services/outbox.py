@@ -0,0 +1,198 @@
+import logging
+import random
+from collections import Counter
+from datetime import timedelta
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+from apps.notifications.models import OutboxSMS
+from apps.notifications.services.ratelimit import get_rate_limiter
+from apps.notifications.services.sms import otp_message, send_sms, welcome_message
+
+logger = logging.getLogger(__name__)
+
+# How long a message may wait for a rate-limit token before it is put
+# back in the queue (without using up an attempt).
+RATE_LIMIT_WAIT_SECONDS = 5
+
+# What ``message`` holds once the text is no longer needed. Redacted rows
+# are never sent again.
+REDACTED = ''
+
+
+# ── Queueing ──────────────────────────────────────────────────────────────
+
+def queue_sms(recipient, message, sender_id=None, kind=OutboxSMS.KIND_TRANSACTIONAL):
+    """
+    Queue an SMS for the outbox worker.
+
+    Call inside the transaction that makes the message true (a new
+    account, an invite...): the row commits or rolls back with it, and
+    the caller never waits on the gateway. With SMS_OUTBOX_EAGER the
+    message is sent right after commit instead, for local development.
+    """
+    sms = OutboxSMS.objects.create(
+        recipient=recipient, message=message, sender_id=sender_id or '', kind=kind,
+    )
+    if settings.SMS_OUTBOX_EAGER:
+        transaction.on_commit(lambda: deliver(sms))
+    return sms
+
+
+def queue_otp_sms(recipient, otp_code):
+    return queue_sms(recipient, otp_message(otp_code), kind=OutboxSMS.KIND_OTP)
+
+
+def queue_welcome_sms(recipient, school_name):
+    return queue_sms(recipient, welcome_message(school_name))
+
+
+# ── Delivery ──────────────────────────────────────────────────────────────
+
+def claim_due(limit):
+    """
+    Claim up to ``limit`` due messages for this worker.
+
+    Claimed rows move to ``sending`` with a lease of
+    SMS_OUTBOX_LEASE_SECONDS; if the worker dies the lease runs out and
+    another worker picks them up (so delivery is at-least-once).
+    ``skip_locked`` lets several workers claim concurrently on Postgres.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            OutboxSMS.objects.select_for_update(skip_locked=True)
+            .filter(
+                status__in=[OutboxSMS.STATUS_PENDING, OutboxSMS.STATUS_SENDING],
+                next_attempt_at__lte=now,
+            )
+            .order_by('next_attempt_at')[:limit]
+        )
+        if batch:
+            OutboxSMS.objects.filter(pk__in=[sms.pk for sms in batch]).update(
+                status=OutboxSMS.STATUS_SENDING,
+                next_attempt_at=now + timedelta(seconds=settings.SMS_OUTBOX_LEASE_SECONDS),
+            )
+    return batch
+
+
+def retry_delay(attempts):
+    """Exponential backoff with jitter: base·2^(n-1), capped, scaled by 0.5–1."""
+    delay = min(
+        settings.SMS_OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1),
+        settings.SMS_OUTBOX_RETRY_MAX_SECONDS,
+    )
+    return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+
+def deliver(sms):
+    """
+    Send one message and record the outcome. Returns the new status.
+
+    Outbox messages (OTPs, invites, welcomes) use the rate limiter's
+    priority lane, ahead of broadcasts. OTP text is redacted once sent
+    or failed; a failed message keeps its text so it can be retried from
+    the admin, until purge_outbox redacts it.
+    """
+    if not get_rate_limiter().acquire(priority=True, timeout=RATE_LIMIT_WAIT_SECONDS):
+        sms.status = OutboxSMS.STATUS_PENDING
+        sms.next_attempt_at = timezone.now() + timedelta(seconds=1)
+        OutboxSMS.objects.filter(pk=sms.pk).update(status=sms.status, next_attempt_at=sms.next_attempt_at)
+        return 'throttled'
+
+    retryable = True
+    try:
+        result = send_sms(sms.recipient, sms.message, sms.sender_id or None)
+        error = None if result.get('status') == 'success' else result.get('message') or 'Gateway error'
+        retryable = result.get('retryable', True)
+    except Exception as e:
+        logger.exception(f"Outbox SMS {sms.pk} raised while sending")
+        error = str(e) or type(e).__name__
+        result = {}
+
+    now = timezone.now()
+    sms.attempts += 1
+    if error is None:
+        sms.status, sms.sent_at, sms.last_error = OutboxSMS.STATUS_SENT, now, ''
+        sms.provider_message_id = str(result.get('message_id') or '')[:100]
+        if sms.kind == OutboxSMS.KIND_OTP:
+            sms.message = REDACTED  # undelivered OTPs are never resent
+    elif not retryable or sms.attempts >= settings.SMS_OUTBOX_MAX_ATTEMPTS:
+        sms.status, sms.last_error = OutboxSMS.STATUS_FAILED, error
+        if sms.kind == OutboxSMS.KIND_OTP:
+            sms.message = REDACTED
+        logger.error(f"Outbox {sms.kind} SMS {sms.pk} to {sms.recipient} failed after {sms.attempts} attempts: {error}")
+    else:
+        sms.status, sms.last_error = OutboxSMS.STATUS_PENDING, error
+        sms.next_attempt_at = now + retry_delay(sms.attempts)
+    OutboxSMS.objects.filter(pk=sms.pk).update(
+        status=sms.status, attempts=sms.attempts, sent_at=sms.sent_at,
+        last_error=sms.last_error, next_attempt_at=sms.next_attempt_at,
+        provider_message_id=sms.provider_message_id, message=sms.message,
+    )
+    return sms.status
+
+
+def retry_messages(messages):
+    """
+    Queue ``messages`` to go out now. Returns how many were queued.
+
+    Rows a worker holds under a live lease, sent or delivered rows, and
+    redacted ones are skipped. Attempts are kept, so a message that has
+    used them up gets one more try before failing again.
+    """
+    now = timezone.now()
+    return (
+        messages.exclude(status__in=[OutboxSMS.STATUS_SENT, OutboxSMS.STATUS_DELIVERED])
+        .exclude(status=OutboxSMS.STATUS_SENDING, next_attempt_at__gt=now)
+        .exclude(message=REDACTED)
+        .update(status=OutboxSMS.STATUS_PENDING, next_attempt_at=now)
+    )
+
+
+def deliver_in_worker(sms):
+    """``deliver`` for pool threads: each keeps its own connection, so honour CONN_MAX_AGE."""
+    try:
+        return deliver(sms)
+    finally:
+        close_old_connections()
+
+
+def drain_outbox(executor, batch_size=100, send=deliver_in_worker):
+    """
+    Claim one batch and ``send`` each message concurrently on ``executor``.
+
+    Returns a Counter of resulting statuses (plus ``claimed``).
+    """
+    batch = claim_due(batch_size)
+    outcome = Counter(executor.map(send, batch))
+    outcome['claimed'] = len(batch)
+    return outcome
+
+
+# ── Retention ─────────────────────────────────────────────────────────────
+
+def purge_outbox():
+    """
+    Redact and delete finished messages. Returns a Counter of ``redacted`` and ``deleted``.
+
+    Sent messages lose their text SMS_OUTBOX_REDACT_AFTER_SECONDS after
+    sending, by which time their delivery report is in, and failed ones
+    that long after their last attempt (no longer worth retrying). Sent,
+    delivered and failed rows are deleted SMS_OUTBOX_RETENTION_DAYS
+    after they were queued.
+    """
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=settings.SMS_OUTBOX_REDACT_AFTER_SECONDS)
+    outcome = Counter()
+    # A failed row's next_attempt_at is the lease taken for its last attempt.
+    outcome['redacted'] = OutboxSMS.objects.filter(
+        Q(status=OutboxSMS.STATUS_SENT, sent_at__lt=cutoff)
+        | Q(status=OutboxSMS.STATUS_FAILED, next_attempt_at__lt=cutoff)
+    ).exclude(message=REDACTED).update(message=REDACTED)
+    outcome['deleted'], _ = OutboxSMS.objects.filter(
+        status__in=[OutboxSMS.STATUS_SENT, OutboxSMS.STATUS_DELIVERED, OutboxSMS.STATUS_FAILED],
+        created_at__lt=now - timedelta(days=settings.SMS_OUTBOX_RETENTION_DAYS),
+    ).delete()
+    return outcome
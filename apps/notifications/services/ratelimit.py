@@ -0,0 +1,159 @@
+"""
+Token-bucket rate limiting for the SMS gateway.
+
+One global bucket (SMS_RATE_PER_SECOND, SMS_RATE_BURST) caps what we
+send to the gateway across every worker. Two lanes share it:
+
+* priority — OTPs and other transactional outbox messages — may drain
+  the bucket completely;
+* bulk — broadcast batches — must leave SMS_PRIORITY_RESERVE of the
+  burst untouched, and also draw from their school's own bucket of
+  SMS_SCHOOL_SHARE of the global rate, so one school's blast can
+  neither starve OTPs nor other schools' broadcasts.
+
+Costs are in messages: a broadcast batch of 100 numbers costs 100.
+
+With the Redis cache the buckets live in Redis and are updated by a Lua
+script, so the check-and-take is atomic across workers and hosts.
+Without Redis (LocMemCache) they are per process.
+"""
+import threading
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+
+KEY_PREFIX = 'sms:bucket'
+
+# KEYS: global bucket[, school bucket]
+# ARGV: rate, burst, reserve, cost[, school rate, school burst]
+# Returns "0" if the tokens were taken, else the seconds to wait.
+TAKE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local function level(key, rate, burst)
+  local d = redis.call('HMGET', key, 'tokens', 'ts')
+  local tokens = tonumber(d[1]) or burst
+  local ts = tonumber(d[2]) or now
+  return math.min(burst, tokens + math.max(0, now - ts) * rate)
+end
+local function store(key, tokens, rate, burst)
+  redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', tostring(now))
+  redis.call('PEXPIRE', key, math.ceil(burst / rate * 1000) + 1000)
+end
+local rate, burst = tonumber(ARGV[1]), tonumber(ARGV[2])
+local reserve, cost = tonumber(ARGV[3]), tonumber(ARGV[4])
+local g = level(KEYS[1], rate, burst)
+local wait = math.max(0, (cost + reserve - g) / rate)
+local s, srate, sburst
+if #KEYS > 1 then
+  srate, sburst = tonumber(ARGV[5]), tonumber(ARGV[6])
+  s = level(KEYS[2], srate, sburst)
+  wait = math.max(wait, (cost - s) / srate)
+end
+if wait > 0 then
+  return tostring(wait)
+end
+store(KEYS[1], g - cost, rate, burst)
+if s then
+  store(KEYS[2], s - cost, srate, sburst)
+end
+return '0'
+"""
+
+
+class RedisBuckets:
+    """Buckets in the Redis cache, taken atomically by TAKE_SCRIPT."""
+
+    def __init__(self, redis_cache):
+        self.cache = redis_cache
+
+    def take(self, buckets, reserve, cost):
+        keys = [self.cache.make_and_validate_key(key) for key, _, _ in buckets]
+        client = self.cache._cache.get_client(keys[0], write=True)
+        # Runs by SHA (EVALSHA), loading the script on first use.
+        script = client.register_script(TAKE_SCRIPT)
+        (_, rate, burst), *school = buckets
+        args = [rate, burst, reserve, cost] + [v for _, r, b in school for v in (r, b)]
+        return float(script(keys=keys, args=args))
+
+
+class LocalBuckets:
+    """Per-process buckets, for caches without atomic scripting."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.state = {}
+
+    def take(self, buckets, reserve, cost):
+        now = time.monotonic()
+        with self.lock:
+            levels = []
+            wait = 0.0
+            for i, (key, rate, burst) in enumerate(buckets):
+                tokens, ts = self.state.get(key, (burst, now))
+                tokens = min(burst, tokens + max(0.0, now - ts) * rate)
+                levels.append(tokens)
+                wait = max(wait, (cost + (reserve if i == 0 else 0) - tokens) / rate)
+            if wait > 0:
+                return wait
+            for (key, _, _), tokens in zip(buckets, levels):
+                self.state[key] = (tokens - cost, now)
+            return 0.0
+
+
+_local_buckets = LocalBuckets()
+
+
+class SMSRateLimiter:
+    def __init__(self, rate, burst, school_share, priority_reserve, buckets):
+        self.rate = rate
+        self.burst = burst
+        self.school_rate = rate * school_share
+        self.school_burst = burst * school_share
+        self.reserve = burst * priority_reserve
+        self.buckets = buckets
+
+    @property
+    def enabled(self):
+        return self.rate > 0
+
+    def max_cost(self, priority=False):
+        """The largest single take that can ever succeed in this lane."""
+        if not self.enabled:
+            return None
+        if priority:
+            return int(self.burst)
+        return int(min(self.burst - self.reserve, self.school_burst))
+
+    def try_acquire(self, cost=1, school_id=None, priority=False):
+        """Take ``cost`` tokens if available. Returns 0, or the seconds to wait."""
+        if not self.enabled:
+            return 0.0
+        if cost > self.max_cost(priority):
+            raise ValueError(f'Cost {cost} exceeds the bucket size ({self.max_cost(priority)}).')
+        buckets = [(f'{KEY_PREFIX}:global', self.rate, self.burst)]
+        if not priority and school_id is not None:
+            buckets.append((f'{KEY_PREFIX}:school:{school_id}', self.school_rate, self.school_burst))
+        return self.buckets.take(buckets, 0 if priority else self.reserve, cost)
+
+    def acquire(self, cost=1, school_id=None, priority=False, timeout=None):
+        """Block until ``cost`` tokens are taken; False if ``timeout`` runs out first."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(cost, school_id, priority)
+            if not wait:
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+def get_rate_limiter():
+    """The limiter for the configured gateway limits and cache."""
+    cache = caches['default']
+    buckets = RedisBuckets(cache) if isinstance(cache, RedisCache) else _local_buckets
+    return SMSRateLimiter(
+        settings.SMS_RATE_PER_SECOND, settings.SMS_RATE_BURST,
+        settings.SMS_SCHOOL_SHARE, settings.SMS_PRIORITY_RESERVE, buckets,
+    )
@@ -1,38 +1,82 @@
+import functools
 from django.conf import settings
 from django.utils.module_loading import import_string
 import logging
+from apps.core.metrics import record_sms_send
 
 logger = logging.getLogger(__name__)
 
 
 def get_sms_backend():
+    """
+    Return the configured backend, one shared instance per process.
+
+    Backends hold pooled HTTP sessions, so they must be safe to share
+    between threads. Instances are keyed by path, so switching
+    SMS_BACKEND (e.g. with override_settings) picks up a new one.
+    """
     backend_path = getattr(settings, 'SMS_BACKEND', 'apps.notifications.backends.console.ConsoleSMSBackend')
+    return _load_backend(backend_path)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_backend(backend_path):
     backend_class = import_string(backend_path)
     return backend_class()
 
 
+def normalize_phone(phone):
+    """Convert Ghana numbers to international format (+233...)."""
+    phone = phone.strip().replace(' ', '').replace('-', '')
+    if phone.startswith('0'):
+        return f'+233{phone[1:]}'
+    if phone.startswith('233'):
+        return f'+{phone}'
+    return phone
+
+
 def send_sms(recipient, message, sender_id=None):
     """
     Send an SMS message using the configured backend.
     Returns dict with status and any relevant data.
     """
     backend = get_sms_backend()
-    return backend.send(recipient, message, sender_id)
+    try:
+        result = backend.send(recipient, message, sender_id)
+    except Exception:
+        record_sms_send(backend, 'exception')
+        raise
+    record_sms_send(backend, result.get('status', 'unknown'))
+    return result
 
 
-def send_otp_sms(recipient, otp_code):
-    """Send OTP verification code via SMS."""
-    message = (
+def send_bulk_sms(recipients, message, sender_id=None):
+    """
+    Send one message to many normalized numbers in a single gateway call
+    (backends that implement ``send_bulk``).
+
+    On success ``data`` may list ``{'recipient', 'id'}`` per number.
+    """
+    backend = get_sms_backend()
+    try:
+        result = backend.send_bulk(recipients, message, sender_id)
+    except Exception:
+        record_sms_send(backend, 'exception')
+        raise
+    record_sms_send(backend, result.get('status', 'unknown'))
+    return result
+
+
+def otp_message(otp_code):
+    return (
         f"Your Ilimi verification code is: {otp_code}\n"
-        f"This code expires in 10 minutes. Do not share it with anyone."
+        f"This code expires in {settings.OTP_TTL_SECONDS // 60} minutes. Do not share it with anyone."
     )
-    return send_sms(recipient, message)
 
 
-def send_welcome_sms(recipient, school_name):
-    """Send welcome SMS after successful onboarding."""
-    message = (
+def welcome_message(school_name):
+    return (
         f"Welcome to Ilimi! Your school '{school_name}' has been successfully set up. "
         f"Your 30-day free trial has started. Visit ilimi.app to get started."
     )
-    return send_sms(recipient, message)
\ No newline at end of file
+
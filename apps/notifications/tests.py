@@ -1,3 +1,540 @@
-from django.test import TestCase
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest.mock import patch
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from apps.accounts.models import User
+from apps.accounts.services.registration import create_user_account
+from apps.notifications.backends.arkesel import ArkeselSMSBackend
+from apps.notifications.backends.routing import ProviderHealth, RoutingSMSBackend
+from apps.tenants.models import School
+from apps.notifications.models import Broadcast, BroadcastRecipient, DeliveryReport, OutboxSMS
+from apps.notifications.services.broadcast import (
+    claim_broadcast, create_broadcast, requeue_failed, send_broadcast,
+)
+from apps.notifications.services.delivery import apply_delivery_reports
+from apps.notifications.services.outbox import (
+    deliver, drain_outbox, purge_outbox, queue_otp_sms, queue_sms,
+)
+from apps.notifications.services.ratelimit import LocalBuckets, SMSRateLimiter
+from apps.notifications.services.sms import get_sms_backend
+from benchmarks.sms_stub import start_stub
 
-# Create your tests here.
+
+class FlakyBackend:
+    """Fails the first ``failures`` sends, then succeeds."""
+    failures = 0
+    retryable = True
+    sent = []
+
+    def send(self, recipient, message, sender_id=None):
+        if FlakyBackend.failures:
+            FlakyBackend.failures -= 1
+            return {'status': 'error', 'message': 'SMS gateway timeout', 'retryable': FlakyBackend.retryable}
+        FlakyBackend.sent.append(recipient)
+        return {'status': 'success', 'message_id': f'msg-{len(FlakyBackend.sent)}'}
+
+
+class InlineExecutor:
+    map = staticmethod(map)
+
+
+@override_settings(
+    SMS_BACKEND='apps.notifications.tests.FlakyBackend', SMS_OUTBOX_EAGER=False,
+    SMS_OUTBOX_MAX_ATTEMPTS=3,
+)
+class OutboxTests(TestCase):
+    def setUp(self):
+        FlakyBackend.failures = 0
+        FlakyBackend.retryable = True
+        FlakyBackend.sent = []
+
+    def drain(self):
+        return drain_outbox(InlineExecutor(), send=deliver)
+
+    def test_registration_queues_instead_of_sending(self):
+        user, code = create_user_account({
+            'email': 'ama@school.test', 'password1': 'S3cure-pass!', 'first_name': 'Ama',
+            'last_name': 'Mensah', 'phone_number': '+233240000001',
+        })
+        sms = OutboxSMS.objects.get()
+        self.assertEqual((sms.recipient, sms.kind), (user.phone_number, OutboxSMS.KIND_OTP))
+        self.assertIn(code, sms.message)
+        self.assertEqual(FlakyBackend.sent, [])
+
+        self.assertEqual(self.drain()['sent'], 1)
+        self.assertEqual(FlakyBackend.sent, [user.phone_number])
+        sms = OutboxSMS.objects.get()
+        self.assertEqual((sms.status, sms.provider_message_id), (OutboxSMS.STATUS_SENT, 'msg-1'))
+        self.assertEqual(sms.message, '')  # the code is redacted once sent
+
+    def test_failures_back_off_then_give_up(self):
+        FlakyBackend.failures = 3
+        queue_sms('+233240000001', 'Hello')
+        outcome = self.drain()
+        self.assertEqual(outcome['pending'], 1)
+        sms = OutboxSMS.objects.get()
+        self.assertEqual((sms.attempts, sms.last_error), (1, 'SMS gateway timeout'))
+        self.assertGreater(sms.next_attempt_at, timezone.now())
+        self.assertEqual(self.drain()['claimed'], 0)  # not due yet
+
+        for expected in (OutboxSMS.STATUS_PENDING, OutboxSMS.STATUS_FAILED):
+            OutboxSMS.objects.update(next_attempt_at=timezone.now())
+            self.drain()
+            self.assertEqual(OutboxSMS.objects.get().status, expected)
+        self.assertEqual(self.drain()['claimed'], 0)
+
+    def test_rejected_messages_are_not_retried(self):
+        FlakyBackend.failures, FlakyBackend.retryable = 1, False
+        queue_sms('+233240000001', 'Hello')
+        self.assertEqual(self.drain()['failed'], 1)
+        self.assertEqual(OutboxSMS.objects.get().message, 'Hello')
+
+    def test_failed_otps_are_redacted(self):
+        FlakyBackend.failures, FlakyBackend.retryable = 1, False
+        queue_otp_sms('+233240000001', '123456')
+        self.assertEqual(self.drain()['failed'], 1)
+        self.assertEqual(OutboxSMS.objects.get().message, '')
+
+    def test_finished_messages_are_redacted_then_purged(self):
+        queue_sms('+233240000001', 'Temp password: Xk29-pq')
+        self.drain()
+        self.assertEqual(OutboxSMS.objects.get().message, 'Temp password: Xk29-pq')
+
+        now = timezone.now()
+        OutboxSMS.objects.update(sent_at=now - timedelta(days=2))
+        queue_sms('+233240000002', 'Hello')
+        OutboxSMS.objects.create(
+            recipient='+233240000003', message='Temp password: Rt55-zz', status=OutboxSMS.STATUS_FAILED,
+            next_attempt_at=now - timedelta(days=2),
+        )
+        self.assertEqual(purge_outbox()['redacted'], 2)
+        self.assertEqual(
+            sorted(OutboxSMS.objects.values_list('message', flat=True)), ['', '', 'Hello'],
+        )
+
+        OutboxSMS.objects.update(created_at=now - timedelta(days=31))
+        self.assertEqual(purge_outbox()['deleted'], 2)  # the pending one stays
+        self.assertEqual(OutboxSMS.objects.get().status, OutboxSMS.STATUS_PENDING)
+
+    def test_expired_lease_is_reclaimed(self):
+        queue_sms('+233240000001', 'Hello')
+        OutboxSMS.objects.update(
+            status=OutboxSMS.STATUS_SENDING, next_attempt_at=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertEqual(self.drain()['sent'], 1)
+
+    def test_deliver_counts_exceptions_as_failures(self):
+        sms = queue_sms('+233240000001', 'Hello')
+        with override_settings(SMS_BACKEND='apps.notifications.backends.missing.Backend'):
+            self.assertEqual(deliver(sms), OutboxSMS.STATUS_PENDING)
+
+    def test_throttled_messages_are_requeued_without_an_attempt(self):
+        sms = queue_sms('+233240000001', 'Hello')
+        limiter = SMSRateLimiter(0.001, 1, 0.5, 0.2, LocalBuckets())
+        with patch('apps.notifications.services.outbox.get_rate_limiter', return_value=limiter), \
+                patch('apps.notifications.services.outbox.RATE_LIMIT_WAIT_SECONDS', 0):
+            self.assertEqual(deliver(sms), OutboxSMS.STATUS_SENT)
+            self.assertEqual(deliver(sms), 'throttled')
+        sms.refresh_from_db()
+        self.assertEqual((sms.status, sms.attempts), (OutboxSMS.STATUS_PENDING, 1))
+
+
+class ArkeselBackendTests(TestCase):
+    def setUp(self):
+        self.stub = start_stub(latency_ms=0, jitter_ms=0, seed=1)
+        self.addCleanup(self.stub.shutdown)
+
+    def test_backend_is_a_process_singleton(self):
+        with override_settings(SMS_BACKEND='apps.notifications.backends.arkesel.ArkeselSMSBackend'):
+            self.assertIs(get_sms_backend(), get_sms_backend())
+            self.assertIsInstance(get_sms_backend(), ArkeselSMSBackend)
+
+    def test_sends_over_one_session(self):
+        backend = ArkeselSMSBackend()
+        with override_settings(ARKESEL_API_URL=self.stub.url):
+            results = [backend.send('0240000001', f'Hello {i}') for i in range(3)]
+        self.assertEqual([r['status'] for r in results], ['success'] * 3)
+        self.assertEqual(len({r['message_id'] for r in results}), 3)
+        self.assertEqual(self.stub.config.stats['recipients'], 3)
+
+    def test_gateway_503_is_retried_by_the_adapter(self):
+        self.stub.config.error_rate = 1.0
+        with override_settings(ARKESEL_API_URL=self.stub.url):
+            result = ArkeselSMSBackend().send('0240000001', 'Hello')
+        self.assertEqual((result['status'], result['retryable']), ('error', True))
+        self.assertEqual(self.stub.config.stats['requests'], 3)
+
+
+class OutboxAdminTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user(
+            'ops@ilimi.test', 'pass12345!', is_staff=True, is_superuser=True,
+        )
+
+    def setUp(self):
+        self.client.force_login(self.staff)
+
+    def retry(self, *messages):
+        return self.client.post('/admin/notifications/outboxsms/', {
+            'action': 'retry_now', '_selected_action': [sms.pk for sms in messages],
+        })
+
+    def test_failed_messages_are_retried_keeping_their_attempts(self):
+        sms = OutboxSMS.objects.create(
+            recipient='+233240000001', message='Hello', status=OutboxSMS.STATUS_FAILED, attempts=3,
+            next_attempt_at=timezone.now() - timedelta(hours=1),
+        )
+        self.assertEqual(self.retry(sms).status_code, 302)
+        sms.refresh_from_db()
+        self.assertEqual((sms.status, sms.attempts), (OutboxSMS.STATUS_PENDING, 3))
+        self.assertLessEqual(sms.next_attempt_at, timezone.now())
+
+    def test_messages_being_sent_or_redacted_are_left_alone(self):
+        lease_end = timezone.now() + timedelta(minutes=2)
+        sending = OutboxSMS.objects.create(
+            recipient='+233240000001', message='Hello', status=OutboxSMS.STATUS_SENDING,
+            attempts=1, next_attempt_at=lease_end,
+        )
+        redacted = OutboxSMS.objects.create(
+            recipient='+233240000002', message='', status=OutboxSMS.STATUS_FAILED, attempts=3,
+        )
+        self.retry(sending, redacted)
+        sending.refresh_from_db()
+        self.assertEqual((sending.status, sending.next_attempt_at), (OutboxSMS.STATUS_SENDING, lease_end))
+        self.assertEqual(OutboxSMS.objects.get(pk=redacted.pk).status, OutboxSMS.STATUS_FAILED)
+
+        OutboxSMS.objects.filter(pk=sending.pk).update(next_attempt_at=timezone.now())
+        self.retry(sending)
+        self.assertEqual(OutboxSMS.objects.get(pk=sending.pk).status, OutboxSMS.STATUS_PENDING)
+
+
+@override_settings(
+    SMS_BACKEND='apps.notifications.backends.arkesel.ArkeselSMSBackend', SMS_BROADCAST_BATCH_SIZE=100,
+    SMS_RATE_PER_SECOND=0,
+)
+class BroadcastTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = School.objects.create(
+            name='Accra Academy', email='info@school.test', phone='0200000000',
+            address='Accra', city='Accra',
+        )
+
+    def setUp(self):
+        self.stub = start_stub(latency_ms=0, jitter_ms=0, seed=1)
+        self.addCleanup(self.stub.shutdown)
+
+    def broadcast(self, numbers):
+        with override_settings(ARKESEL_API_URL=self.stub.url):
+            broadcast = create_broadcast(self.school, 'School closes at noon', numbers)
+            return send_broadcast(broadcast)
+
+    def test_numbers_are_normalized_deduplicated_and_batched(self):
+        numbers = [f'024{i:07d}' for i in range(250)]
+        numbers += [f'+23324{i:07d}' for i in range(50)] + ['233 24 000 0001', '', None]
+        broadcast = self.broadcast(numbers)
+
+        self.assertEqual((broadcast.total, broadcast.sent, broadcast.failed), (250, 250, 0))
+        self.assertEqual(broadcast.status, Broadcast.STATUS_COMPLETED)
+        self.assertEqual(self.stub.config.stats['requests'], 3)
+        self.assertFalse(
+            BroadcastRecipient.objects.filter(broadcast=broadcast, provider_message_id='').exists()
+        )
+
+    def test_failed_batches_are_recorded_per_recipient(self):
+        self.stub.config.error_rate = 1.0
+        broadcast = self.broadcast(['0240000001', '0240000002'])
+        self.assertEqual((broadcast.sent, broadcast.failed), (0, 2))
+        self.assertEqual(
+            set(broadcast.recipients.values_list('status', flat=True)), {BroadcastRecipient.STATUS_FAILED}
+        )
+
+    def test_a_batch_that_raises_fails_alone(self):
+        class BrokenLimiter:
+            calls = 0
+
+            def max_cost(self, priority=False):
+                return None
+
+            def acquire(self, cost=1, school_id=None, **kwargs):
+                BrokenLimiter.calls += 1
+                if BrokenLimiter.calls == 1:
+                    raise ConnectionError('Redis unavailable')
+                return True
+
+        broadcast = create_broadcast(self.school, 'Hello', ['0240000001', '0240000002'])
+        with override_settings(ARKESEL_API_URL=self.stub.url), \
+                patch('apps.notifications.services.broadcast.get_rate_limiter', return_value=BrokenLimiter()), \
+                ThreadPoolExecutor(max_workers=1) as executor:
+            broadcast = send_broadcast(broadcast, executor=executor, batch_size=1)
+
+        self.assertEqual((broadcast.status, broadcast.sent, broadcast.failed), (Broadcast.STATUS_COMPLETED, 1, 1))
+        self.assertEqual(
+            broadcast.recipients.get(status=BroadcastRecipient.STATUS_FAILED).error, 'Redis unavailable',
+        )
+
+    def test_stalled_broadcast_is_reclaimed_after_its_lease(self):
+        broadcast = create_broadcast(self.school, 'Hello', ['0240000001'])
+        self.assertEqual(claim_broadcast(), broadcast)
+        self.assertIsNone(claim_broadcast())
+
+        Broadcast.objects.update(claimed_at=timezone.now() - timedelta(seconds=301))
+        self.assertEqual(claim_broadcast(), broadcast)
+        self.assertIsNone(claim_broadcast())
+
+    def test_requeue_skips_broadcasts_being_sent(self):
+        self.stub.config.error_rate = 1.0
+        done = self.broadcast(['0240000001'])
+        sending = create_broadcast(self.school, 'Hello', ['0240000002'])
+        claim_broadcast()
+        BroadcastRecipient.objects.filter(broadcast=sending).update(status=BroadcastRecipient.STATUS_FAILED)
+
+        self.assertEqual(requeue_failed(Broadcast.objects.all()), 1)
+        done.refresh_from_db()
+        self.assertEqual(done.status, Broadcast.STATUS_QUEUED)
+        self.assertEqual(
+            list(BroadcastRecipient.objects.order_by('phone').values_list('status', flat=True)),
+            [BroadcastRecipient.STATUS_PENDING, BroadcastRecipient.STATUS_FAILED],
+        )
+        self.assertEqual(Broadcast.objects.get(pk=sending.pk).status, Broadcast.STATUS_SENDING)
+
+
+@override_settings(
+    SMS_BACKEND='apps.notifications.tests.FlakyBackend', SMS_OUTBOX_EAGER=False,
+    SMS_OUTBOX_MAX_ATTEMPTS=2, SMS_DELIVERY_REPORT_TOKEN='dlr-secret',
+)
+class DeliveryReportTests(TestCase):
+    url = '/webhooks/sms/delivery-reports?token=dlr-secret'
+
+    def setUp(self):
+        FlakyBackend.failures = 0
+        FlakyBackend.sent = []
+
+    def report(self, payload):
+        return self.client.post(self.url, payload, content_type='application/json')
+
+    def sent_otp(self):
+        sms = queue_otp_sms('+233240000001', '123456')
+        deliver(sms)
+        sms.refresh_from_db()
+        return sms
+
+    def test_webhook_requires_the_token(self):
+        response = self.client.post(
+            '/webhooks/sms/delivery-reports?token=wrong', {'id': 'msg-1', 'status': 'DELIVERED'},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(DeliveryReport.objects.exists())
+
+    def test_webhook_stores_final_reports_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.report([
+                {'id': 'msg-1', 'status': 'DELIVERED'},
+                {'id': 'msg-2', 'status': 'UNDELIV'},
+                {'id': 'msg-3', 'status': 'SENT'},
+                {'status': 'DELIVERED'},
+            ])
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(
+            sorted(DeliveryReport.objects.values_list('provider_message_id', 'status')),
+            [('msg-1', 'delivered'), ('msg-2', 'failed')],
+        )
+
+    def test_query_parameter_reports_are_accepted(self):
+        response = self.client.get(self.url + '&sms_id=msg-1&status=delivered')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(DeliveryReport.objects.get().provider_message_id, 'msg-1')
+
+    def test_delivered_reports_are_applied(self):
+        sms = self.sent_otp()
+        self.report({'id': sms.provider_message_id, 'status': 'DELIVERED'})
+        outcome = apply_delivery_reports()
+        self.assertEqual((outcome['delivered'], outcome['unmatched']), (1, 0))
+        sms.refresh_from_db()
+        self.assertEqual(sms.status, OutboxSMS.STATUS_DELIVERED)
+        self.assertIsNotNone(sms.delivered_at)
+        self.assertFalse(DeliveryReport.objects.exists())
+
+    def test_undelivered_messages_are_resent_until_attempts_run_out(self):
+        sms = queue_sms('+233240000001', 'You have been added to Accra Academy.')
+        deliver(sms)
+        sms.refresh_from_db()
+        self.report({'id': sms.provider_message_id, 'status': 'EXPIRED'})
+        self.assertEqual(apply_delivery_reports()['retried'], 1)
+        sms.refresh_from_db()
+        self.assertEqual(sms.status, OutboxSMS.STATUS_PENDING)
+        self.assertGreater(sms.next_attempt_at, timezone.now())
+
+        deliver(sms)
+        sms.refresh_from_db()
+        self.report({'id': sms.provider_message_id, 'status': 'UNDELIV'})
+        self.assertEqual(apply_delivery_reports()['failed'], 1)
+        sms.refresh_from_db()
+        self.assertEqual((sms.status, sms.attempts), (OutboxSMS.STATUS_FAILED, 2))
+        self.assertEqual(sms.message, 'You have been added to Accra Academy.')  # kept for a manual retry
+        self.assertEqual(FlakyBackend.sent, ['+233240000001'] * 2)
+
+    def test_undelivered_otp_is_not_resent(self):
+        sms = self.sent_otp()
+        self.report({'id': sms.provider_message_id, 'status': 'EXPIRED'})
+        outcome = apply_delivery_reports()
+        self.assertEqual((outcome['retried'], outcome['failed']), (0, 1))
+        sms.refresh_from_db()
+        self.assertEqual((sms.status, sms.message), (OutboxSMS.STATUS_FAILED, ''))
+        self.assertEqual(FlakyBackend.sent, ['+233240000001'])
+
+    def test_broadcast_recipients_are_marked(self):
+        school = School.objects.create(
+            name='Accra Academy', email='info@school.test', phone='0200000000',
+            address='Accra', city='Accra',
+        )
+        broadcast = create_broadcast(school, 'Hello', ['0240000001', '0240000002'])
+        BroadcastRecipient.objects.filter(broadcast=broadcast).update(status=BroadcastRecipient.STATUS_SENT)
+        first, second = broadcast.recipients.order_by('phone')
+        BroadcastRecipient.objects.filter(pk=first.pk).update(provider_message_id='b-1')
+        BroadcastRecipient.objects.filter(pk=second.pk).update(provider_message_id='b-2')
+        self.report({'data': [
+            {'id': 'b-1', 'status': 'DELIVERED'}, {'id': 'b-2', 'status': 'REJECTED'},
+            {'id': 'unknown', 'status': 'DELIVERED'},
+        ]})
+        outcome = apply_delivery_reports()
+        self.assertEqual((outcome['delivered'], outcome['failed'], outcome['unmatched']), (1, 1, 1))
+        self.assertEqual(
+            list(broadcast.recipients.order_by('phone').values_list('status', flat=True)),
+            [BroadcastRecipient.STATUS_DELIVERED, BroadcastRecipient.STATUS_FAILED],
+        )
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@override_settings(SMS_CIRCUIT_FAILURES=2, SMS_CIRCUIT_COOLDOWN_SECONDS=30)
+class RoutingBackendTests(SimpleTestCase):
+    def setUp(self):
+        self.slow = start_stub(latency_ms=30, jitter_ms=0, seed=1)
+        self.fast = start_stub(latency_ms=0, jitter_ms=0, seed=1)
+        self.addCleanup(self.slow.shutdown)
+        self.addCleanup(self.fast.shutdown)
+        self.clock = FakeClock()
+        arkesel = 'apps.notifications.backends.arkesel.ArkeselSMSBackend'
+        self.router = RoutingSMSBackend({
+            'slow': {'BACKEND': arkesel, 'OPTIONS': {'api_url': self.slow.url, 'retries': 0}},
+            'fast': {'BACKEND': arkesel, 'OPTIONS': {'api_url': self.fast.url, 'retries': 0}},
+        }, clock=self.clock)
+
+    def send(self, count=1):
+        return [self.router.send('0240000001', 'Hello') for _ in range(count)]
+
+    def health(self, name):
+        return next(health for provider, _, health in self.router.providers if provider == name)
+
+    def test_prefers_the_fastest_provider(self):
+        results = self.send(6)
+        self.assertEqual([r['provider'] for r in results[:2]], ['slow', 'fast'])
+        self.assertEqual({r['provider'] for r in results[2:]}, {'fast'})
+        self.assertEqual(self.slow.config.stats['requests'], 1)
+
+    def test_fails_over_and_opens_the_circuit(self):
+        self.fast.config.error_rate = 1.0
+        self.send()  # measures slow first
+        results = self.send(4)
+        self.assertEqual({r['provider'] for r in results}, {'slow'})
+        self.assertEqual(self.fast.config.stats['requests'], 2)
+        self.assertEqual(self.health('fast').state, ProviderHealth.OPEN)
+        self.assertEqual(self.health('fast').error_rate, 1.0)
+
+    def test_half_open_probe_closes_the_circuit_on_success(self):
+        self.fast.config.error_rate = 1.0
+        self.send(3)
+        self.fast.config.error_rate = 0.0
+        self.clock.now += 30
+        self.assertEqual(self.health('fast').state, ProviderHealth.HALF_OPEN)
+        self.assertEqual(self.send()[0]['provider'], 'fast')
+        self.assertEqual(self.health('fast').state, ProviderHealth.CLOSED)
+
+    def test_failed_probe_reopens_the_circuit(self):
+        self.fast.config.error_rate = 1.0
+        self.send(3)
+        self.clock.now += 30
+        self.assertEqual(self.send()[0]['provider'], 'slow')
+        self.assertEqual(self.health('fast').state, ProviderHealth.OPEN)
+
+    def test_probe_result_is_not_taken_by_another_send(self):
+        health = ProviderHealth('fast', failure_threshold=2, cooldown=30, clock=self.clock)
+        for _ in range(2):
+            health.record(False, 0.1, health.allow())
+        self.clock.now += 30
+        probe = health.allow()
+        self.assertTrue(probe)
+        self.assertFalse(health.allow())  # one probe at a time
+
+        health.record(False, 0.1)  # a send that started before the circuit opened
+        self.clock.now += 30
+        self.assertFalse(health.allow())  # the probe is still in flight
+        health.record(True, 0.1, probe)
+        self.assertEqual(health.state, ProviderHealth.CLOSED)
+
+    def test_all_providers_down_is_a_retryable_error(self):
+        self.slow.config.error_rate = self.fast.config.error_rate = 1.0
+        self.send(2)
+        requests_before = self.slow.config.stats['requests'] + self.fast.config.stats['requests']
+        result = self.send()[0]
+        self.assertEqual((result['status'], result['retryable']), ('error', True))
+        self.assertEqual(result['message'], 'No SMS provider available')
+        self.assertEqual(
+            self.slow.config.stats['requests'] + self.fast.config.stats['requests'], requests_before,
+        )
+
+    def test_bulk_sends_are_routed(self):
+        self.fast.config.error_rate = 1.0
+        result = self.router.send_bulk(['+233240000001', '+233240000002'], 'Hello')
+        self.assertEqual((result['status'], len(result['data'])), ('success', 2))
+
+
+class RateLimiterTests(SimpleTestCase):
+    def limiter(self):
+        # 10/s, burst 100: bulk must leave 20 for OTPs; each school gets 50.
+        return SMSRateLimiter(10, 100, school_share=0.5, priority_reserve=0.2, buckets=LocalBuckets())
+
+    def test_bulk_leaves_the_priority_reserve(self):
+        limiter = self.limiter()
+        self.assertEqual(limiter.try_acquire(50, school_id=1), 0)
+        self.assertEqual(limiter.try_acquire(30, school_id=2), 0)
+        self.assertGreater(limiter.try_acquire(1, school_id=3), 0)
+        self.assertEqual(limiter.try_acquire(20, priority=True), 0)
+
+    def test_each_school_gets_a_share(self):
+        limiter = self.limiter()
+        self.assertEqual(limiter.try_acquire(50, school_id=1), 0)
+        self.assertGreater(limiter.try_acquire(10, school_id=1), 0)
+        self.assertEqual(limiter.try_acquire(10, school_id=2), 0)
+
+    def test_denied_takes_consume_nothing(self):
+        limiter = self.limiter()
+        self.assertEqual(limiter.try_acquire(50, school_id=1), 0)
+        self.assertGreater(limiter.try_acquire(40, school_id=2), 0)
+        self.assertEqual(limiter.try_acquire(30, school_id=2), 0)
+
+    def test_oversized_costs_are_rejected(self):
+        limiter = self.limiter()
+        self.assertEqual(limiter.max_cost(), 50)
+        with self.assertRaises(ValueError):
+            limiter.try_acquire(51, school_id=1)
+
+    def test_acquire_times_out(self):
+        limiter = self.limiter()
+        limiter.try_acquire(100, priority=True)
+        self.assertFalse(limiter.acquire(priority=True, timeout=0.01))
+
+    def test_zero_rate_disables_limiting(self):
+        limiter = SMSRateLimiter(0, 0, 0.5, 0.2, LocalBuckets())
+        self.assertIsNone(limiter.max_cost())
+        self.assertEqual(limiter.try_acquire(10_000), 0)
@@ -1,3 +1,39 @@
-from django.shortcuts import render
+import hmac
+import json
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseBadRequest
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+from apps.notifications.services.delivery import ingest_reports
 
-# Create your views here.
+
+@csrf_exempt
+@require_http_methods(['GET', 'POST'])
+def sms_delivery_report_view(request):
+    """
+    Delivery-report webhook for the SMS gateway.
+
+    Register it with the gateway as
+    ``/webhooks/sms/delivery-reports?token=<SMS_DELIVERY_REPORT_TOKEN>``.
+    Takes a JSON body (one report or a list), form fields or query
+    parameters, stores the final statuses and answers 202; the outbox
+    worker applies them. Without a token it is only served in DEBUG.
+    """
+    token = settings.SMS_DELIVERY_REPORT_TOKEN
+    if token:
+        supplied = request.GET.get('token') or request.headers.get('X-Webhook-Token', '')
+        if not hmac.compare_digest(supplied.encode(), token.encode()):
+            raise Http404
+    elif not settings.DEBUG:
+        raise Http404
+
+    if request.content_type == 'application/json':
+        try:
+            payload = json.loads(request.body or b'null')
+        except ValueError:
+            return HttpResponseBadRequest('Invalid JSON')
+    else:
+        payload = (request.POST if request.method == 'POST' else request.GET).dict()
+        payload.pop('token', None)
+    ingest_reports(payload)
+    return HttpResponse(status=202)
@@ -36,8 +36,8 @@ class BranchCreateSerializer(serializers.ModelSerializer):
         ]
 
     def validate_branch_code(self, value):
-        school = self.context.get("school")
-        qs = Branch.objects.filter(school=school, branch_code__iexact=value)
+        school_id = self.context.get("school_id")
+        qs = Branch.objects.filter(school_id=school_id, branch_code__iexact=value)
         if self.instance:
             qs = qs.exclude(pk=self.instance.pk)
         if qs.exists():
@@ -4,6 +4,7 @@ from .views import (
     BranchListCreateView,
     BranchDetailView,
     MemberListInviteView,
+    MemberExportView,
 )
 
 app_name = "tenants-v1"
@@ -11,6 +12,7 @@ app_name = "tenants-v1"
 urlpatterns = [
     path("me/", SchoolMeView.as_view(), name="school-me"),
     path("me/branches/", BranchListCreateView.as_view(), name="branch-list-create"),
-    path("me/branches/<uuid:pk>/", BranchDetailView.as_view(), name="branch-detail"),
+    path("me/branches/<int:pk>/", BranchDetailView.as_view(), name="branch-detail"),
     path("me/members/", MemberListInviteView.as_view(), name="member-list-invite"),
+    path("me/members/export/", MemberExportView.as_view(), name="member-export"),
 ]
\ No newline at end of file
@@ -6,8 +6,10 @@ from rest_framework.exceptions import NotFound
 
 from drf_spectacular.utils import extend_schema
 
+from apps.core.mixins import ExportMixin, ListResponseMixin, SchoolScopedMixin
+from apps.core.permissions import IsSchoolMemberOrBranchEditor
 from apps.core.renderers import IlimiAPIRenderer
-from apps.tenants.models import School, Branch, SchoolMember
+from apps.tenants.models import Branch, SchoolMember
 
 from .serializers import (
     SchoolSerializer,
@@ -19,18 +21,6 @@ from .serializers import (
 )
 
 
-# ── Mixin ─────────────────────────────────────────────────────────────────
-
-class SchoolScopedMixin:
-    def get_school(self):
-        member = SchoolMember.objects.filter(
-            user=self.request.user, is_active=True
-        ).select_related("school").first()
-        if not member:
-            raise NotFound("No school found for your account.")
-        return member.school
-
-
 # ── School ────────────────────────────────────────────────────────────────
 
 @extend_schema(tags=["Schools"])
@@ -38,6 +28,7 @@ class SchoolMeView(SchoolScopedMixin, GenericAPIView):
     permission_classes = [IsAuthenticated]
     renderer_classes = [IlimiAPIRenderer]
     serializer_class = SchoolSerializer
+    verify_user_for_writes = True
 
     def get(self, request, *args, **kwargs):
         school = self.get_school()
@@ -60,24 +51,24 @@ class SchoolMeView(SchoolScopedMixin, GenericAPIView):
 # ── Branches ──────────────────────────────────────────────────────────────
 
 @extend_schema(tags=["Schools"])
-class BranchListCreateView(SchoolScopedMixin, GenericAPIView):
+class BranchListCreateView(SchoolScopedMixin, ListResponseMixin, GenericAPIView):
     permission_classes = [IsAuthenticated]
     renderer_classes = [IlimiAPIRenderer]
     serializer_class = BranchSerializer
+    cursor_ordering = ("name", "id")
 
     def get(self, request, *args, **kwargs):
-        school = self.get_school()
-        branches = Branch.objects.filter(school=school)
-        serializer = BranchSerializer(branches, many=True)
-        return Response({"branches": serializer.data, "count": branches.count()})
+        school_id = self.get_school_id()
+        branches = Branch.objects.filter(school_id=school_id)
+        return self.list_response(branches, BranchSerializer, "branches")
 
     def post(self, request, *args, **kwargs):
-        school = self.get_school()
+        school_id = self.get_school_id()
         serializer = BranchCreateSerializer(
-            data=request.data, context={"school": school}
+            data=request.data, context={"school_id": school_id}
         )
         serializer.is_valid(raise_exception=True)
-        branch = serializer.save(school=school)
+        branch = serializer.save(school_id=school_id)
         return Response(
             {
                 "message": f"Branch '{branch.name}' created successfully.",
@@ -89,29 +80,30 @@ class BranchListCreateView(SchoolScopedMixin, GenericAPIView):
 
 @extend_schema(tags=["Schools"])
 class BranchDetailView(SchoolScopedMixin, GenericAPIView):
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, IsSchoolMemberOrBranchEditor]
+    permission_branch_kwarg = "pk"
     renderer_classes = [IlimiAPIRenderer]
     serializer_class = BranchSerializer
 
-    def get_branch(self, school, pk):
+    def get_branch(self, school_id, pk):
         try:
-            return Branch.objects.get(school=school, pk=pk)
+            return Branch.objects.get(school_id=school_id, pk=pk)
         except Branch.DoesNotExist:
             raise NotFound("Branch not found.")
 
     def get(self, request, pk, *args, **kwargs):
-        school = self.get_school()
-        branch = self.get_branch(school, pk)
+        school_id = self.get_school_id()
+        branch = self.get_branch(school_id, pk)
         return Response(BranchSerializer(branch).data)
 
     def patch(self, request, pk, *args, **kwargs):
-        school = self.get_school()
-        branch = self.get_branch(school, pk)
+        school_id = self.get_school_id()
+        branch = self.get_branch(school_id, pk)
         serializer = BranchCreateSerializer(
             branch,
             data=request.data,
             partial=True,
-            context={"school": school},
+            context={"school_id": school_id},
         )
         serializer.is_valid(raise_exception=True)
         serializer.save()
@@ -126,18 +118,18 @@ class BranchDetailView(SchoolScopedMixin, GenericAPIView):
 # ── Members ───────────────────────────────────────────────────────────────
 
 @extend_schema(tags=["Schools"])
-class MemberListInviteView(SchoolScopedMixin, GenericAPIView):
+class MemberListInviteView(SchoolScopedMixin, ListResponseMixin, GenericAPIView):
     permission_classes = [IsAuthenticated]
     renderer_classes = [IlimiAPIRenderer]
     serializer_class = SchoolMemberSerializer
+    verify_user_for_writes = True
 
     def get(self, request, *args, **kwargs):
-        school = self.get_school()
-        members = SchoolMember.objects.filter(school=school).select_related(
+        school_id = self.get_school_id()
+        members = SchoolMember.objects.filter(school_id=school_id).select_related(
             "user", "branch"
         )
-        serializer = SchoolMemberSerializer(members, many=True)
-        return Response({"members": serializer.data, "count": members.count()})
+        return self.list_response(members, SchoolMemberSerializer, "members")
 
     def post(self, request, *args, **kwargs):
         school = self.get_school()
@@ -156,4 +148,18 @@ class MemberListInviteView(SchoolScopedMixin, GenericAPIView):
         return Response(
             {"message": result["message"]},
             status=status.HTTP_201_CREATED,
-    )
\ No newline at end of file
+        )
+
+
+@extend_schema(tags=["Schools"])
+class MemberExportView(SchoolScopedMixin, ExportMixin, GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [IlimiAPIRenderer]
+    serializer_class = SchoolMemberSerializer
+
+    def get(self, request, *args, **kwargs):
+        school_id = self.get_school_id()
+        members = SchoolMember.objects.filter(school_id=school_id).select_related(
+            "user", "branch"
+        ).order_by("id")
+        return self.export_response(members, SchoolMemberSerializer, "Members export.")
@@ -0,0 +1,152 @@
+from apps.tenants.models import SchoolMember
+from apps.tenants.services.roles import RoleSet, get_role_set
+
+_UNRESOLVED = object()
+
+
+class TenantContext:
+    """
+    The current user's school memberships, resolved once per request.
+
+    Attached to every request as ``request.tenant`` by TenantContextMiddleware.
+    Memberships and the role set are loaded lazily on first access and
+    re-resolved only if ``request.user`` changes (e.g. when DRF swaps the
+    session user for a JWT user inside the view).
+
+    Role checks go through ``role_set``, which comes from the shared cache,
+    so permission classes never need the membership rows themselves.
+    ``current_period`` likewise gives the school's current year and term.
+    """
+
+    def __init__(self, request):
+        self._request = request
+        self._user_id = _UNRESOLVED
+        self._memberships = None
+        self._role_set = None
+        self._current_period = None
+
+    def _current_user_id(self):
+        user = getattr(self._request, 'user', None)
+        user_id = user.pk if user is not None and user.is_authenticated else None
+        if user_id != self._user_id:
+            self._user_id = user_id
+            self._memberships = None
+            self._role_set = None
+            self._current_period = None
+        return user_id
+
+    def _resolve(self):
+        user_id = self._current_user_id()
+        if self._memberships is None:
+            self._memberships = self._load(user_id) if user_id else []
+        return self._memberships
+
+    def _load(self, user_id):
+        return list(
+            SchoolMember.objects.filter(user_id=user_id, is_active=True)
+            .select_related('school', 'branch')
+            .order_by('id')
+        )
+
+    @property
+    def memberships(self):
+        """All active memberships for the user, across every school."""
+        return self._resolve()
+
+    @property
+    def membership(self):
+        """The active membership used to scope the request, or None."""
+        memberships = self._resolve()
+        return memberships[0] if memberships else None
+
+    @property
+    def school(self):
+        membership = self.membership
+        return membership.school if membership else None
+
+    @property
+    def branch(self):
+        membership = self.membership
+        return membership.branch if membership else None
+
+    @property
+    def role_set(self):
+        """The user's RoleSet, cached per request and in the shared cache."""
+        user_id = self._current_user_id()
+        if self._role_set is None:
+            # Token-authenticated principals carry their roles as claims.
+            claimed = getattr(self._request.user, 'role_set', None) if user_id else None
+            if claimed is not None:
+                self._role_set = claimed
+            else:
+                self._role_set = get_role_set(user_id) if user_id else RoleSet(())
+        return self._role_set
+
+    @property
+    def roles(self):
+        """Set of the user's active roles within the current school."""
+        return self.role_set.roles()
+
+    @property
+    def current_period(self):
+        """The school's CurrentPeriod (year and term ids), from the shared cache."""
+        # Imported here so tenants doesn't depend on academics at import time.
+        from apps.academics.services.calendar import get_current_period
+        self._current_user_id()
+        if self._current_period is None:
+            self._current_period = get_current_period(self.role_set.school_id)
+        return self._current_period
+
+    @property
+    def academic_year_id(self):
+        return self.current_period.academic_year_id
+
+    @property
+    def term_id(self):
+        return self.current_period.term_id
+
+    def peek(self):
+        """
+        Return ``(school_id, roles)`` from whatever is already resolved.
+
+        Never queries, so it is safe for logging after the response: falls
+        back to token claims, then loaded memberships, then ``(None, ())``.
+        """
+        user_id = self._current_user_id()
+        role_set = self._role_set
+        if role_set is None and user_id:
+            role_set = getattr(self._request.user, 'role_set', None)
+        if role_set is not None:
+            return role_set.school_id, role_set.roles()
+        if self._memberships:
+            school_id = self._memberships[0].school_id
+            return school_id, frozenset(m.role for m in self._memberships if m.school_id == school_id)
+        return None, ()
+
+    def has_role(self, *roles, branch_id=None):
+        return self.role_set.has_role(*roles, branch_id=branch_id)
+
+    def membership_for_role(self, *roles):
+        """Return the first active membership holding any of ``roles``."""
+        for membership in self._resolve():
+            if membership.role in roles:
+                return membership
+        return None
+
+    def __bool__(self):
+        return bool(self._resolve())
+
+
+def get_tenant_context(request):
+    """
+    Return the TenantContext for a request.
+
+    Works with both Django and DRF requests, and falls back to building a
+    context when the middleware did not run (e.g. in request factories).
+    """
+    request = getattr(request, '_request', request)
+    context = getattr(request, 'tenant', None)
+    if context is None:
+        context = TenantContext(request)
+        request.tenant = context
+    return context
@@ -0,0 +1,6 @@
+from apps.tenants.context import get_tenant_context
+
+
+def tenant(request):
+    """Expose the request's TenantContext to templates as ``tenant``."""
+    return {'tenant': get_tenant_context(request)}
@@ -0,0 +1,152 @@
+import json
+import subprocess
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from apps.accounts.models import User
+from apps.notifications.services.outbox import drain_outbox
+from apps.tenants.management.commands.seed_tenants import DOMAIN
+from benchmarks.api import SCENARIOS, HTTPTransport, InProcessTransport, pin_otp_codes, run_benchmark
+from benchmarks.sms_stub import start_stub
+
+ARKESEL_BACKEND = 'apps.notifications.backends.arkesel.ArkeselSMSBackend'
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the v1 API with concurrent simulated clients against data from '
+        'seed_tenants. Reports p50/p95/p99 latency, throughput and queries per '
+        'request for each endpoint, optionally saving the results as JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=10, help='Concurrent simulated clients.')
+        parser.add_argument('--iterations', type=int, default=5, help='Scenario loops per client.')
+        parser.add_argument(
+            '--scenarios', default='auth,schools,academics',
+            help=f'Comma-separated subset of: {", ".join(SCENARIOS)}.',
+        )
+        parser.add_argument('--password', default='synthetic-pass', help='Password given to seed_tenants.')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--base-url', help='Benchmark a running server over HTTP instead of in-process.')
+        parser.add_argument('--output', help='Write the JSON report to this path.')
+        parser.add_argument(
+            '--sms-stub', action='store_true',
+            help='In-process only: send SMS through the Arkesel backend to a local gateway stub.',
+        )
+        parser.add_argument('--sms-latency-ms', type=float, default=100)
+        parser.add_argument('--sms-jitter-ms', type=float, default=50)
+        parser.add_argument('--sms-error-rate', type=float, default=0.0)
+        parser.add_argument(
+            '--sms-eager', action='store_true',
+            help='Send SMS in the request (SMS_OUTBOX_EAGER) instead of draining the outbox afterwards.',
+        )
+
+    def handle(self, *args, **options):
+        scenarios = [s.strip() for s in options['scenarios'].split(',') if s.strip()]
+        unknown = set(scenarios) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f'Unknown scenarios: {", ".join(sorted(unknown))}')
+
+        accounts = list(User.objects.filter(
+            email__startswith='admin.', email__endswith=f'@{DOMAIN}'
+        ).order_by('email').values_list('email', flat=True))
+        if not accounts:
+            raise CommandError('No synthetic schools found. Run seed_tenants first.')
+
+        if options['base_url']:
+            transport_factory = lambda: HTTPTransport(options['base_url'])  # noqa: E731
+        else:
+            transport_factory = InProcessTransport
+
+        stub = None
+        sms_settings = {}
+        if options['sms_stub']:
+            if options['base_url']:
+                raise CommandError(
+                    '--sms-stub only applies in-process. Start `python -m benchmarks.sms_stub` '
+                    'and point the server at it with SMS_BACKEND and ARKESEL_API_URL.'
+                )
+            stub = start_stub(
+                latency_ms=options['sms_latency_ms'], jitter_ms=options['sms_jitter_ms'],
+                error_rate=options['sms_error_rate'], seed=options['seed'],
+            )
+            sms_settings = {
+                'SMS_BACKEND': ARKESEL_BACKEND, 'ARKESEL_API_URL': stub.url,
+                'SMS_OUTBOX_EAGER': options['sms_eager'],
+            }
+
+        self.stdout.write(
+            f'Benchmarking {", ".join(scenarios)} with {options["clients"]} clients × '
+            f'{options["iterations"]} iterations over {len(accounts)} schools...'
+        )
+        otp_codes = nullcontext() if options['base_url'] else pin_otp_codes()
+        with override_settings(**sms_settings), otp_codes:
+            report = run_benchmark(
+                transport_factory, accounts, options['password'], DOMAIN,
+                clients=options['clients'], iterations=options['iterations'],
+                scenarios=scenarios, seed=options['seed'],
+            )
+            if stub and not options['sms_eager']:
+                report['sms_outbox'] = self.drain_outbox()
+        if stub:
+            stub.shutdown()
+            report['sms_stub'] = stub.config.stats
+
+        report = {
+            'started_at': datetime.now(timezone.utc).isoformat(),
+            'git_commit': self.git_commit(),
+            'transport': options['base_url'] or 'in-process',
+            'database': settings.DATABASES['default']['ENGINE'].rsplit('.', 1)[-1],
+            **report,
+        }
+        self.print_report(report)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'Report written to {options["output"]}'))
+
+    def drain_outbox(self, concurrency=8):
+        """Send everything the run queued, as the outbox worker would."""
+        totals = Counter()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            while True:
+                outcome = drain_outbox(executor)
+                if not outcome['claimed']:
+                    break
+                totals.update(outcome)
+        return {**totals, 'duration_s': round(time.perf_counter() - started, 3)}
+
+    def git_commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def print_report(self, report):
+        header = f'{"endpoint":<26}{"reqs":>7}{"errs":>6}{"rps":>9}{"p50":>9}{"p95":>9}{"p99":>9}{"queries":>9}'
+        self.stdout.write(header)
+        self.stdout.write('─' * len(header))
+        for name, stats in report['endpoints'].items():
+            latency = stats['latency_ms']
+            queries = stats['queries']['mean'] if stats['queries'] else '-'
+            self.stdout.write(
+                f'{name:<26}{stats["requests"]:>7}{stats["errors"]:>6}{stats["throughput_rps"]:>9}'
+                f'{latency["p50"]:>9}{latency["p95"]:>9}{latency["p99"]:>9}{queries:>9}'
+            )
+        self.stdout.write(
+            f'\n{report["requests"]} requests in {report["duration_s"]}s '
+            f'({report["throughput_rps"]} req/s). Latencies in ms.'
+        )
+        if 'sms_stub' in report:
+            self.stdout.write(f'SMS stub: {report["sms_stub"]}')
+        if 'sms_outbox' in report:
+            self.stdout.write(f'SMS outbox drained after the run: {report["sms_outbox"]}')
@@ -0,0 +1,244 @@
+import random
+import time
+from datetime import date, timedelta
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from apps.accounts.models import User
+from apps.tenants.models import Branch, School, SchoolMember
+from apps.academics.models import (
+    AcademicYear, ClassLevel, ClassRoom, Subject, SubjectAssignment, Term
+)
+
+DOMAIN = 'synthetic.ilimi.test'
+
+CITIES = ['Accra', 'Kumasi', 'Tamale', 'Takoradi', 'Cape Coast', 'Tema', 'Ho', 'Koforidua', 'Sunyani', 'Wa']
+FIRST_NAMES = ['Ama', 'Kofi', 'Akosua', 'Kwame', 'Abena', 'Yaw', 'Efua', 'Kojo', 'Adwoa', 'Kwesi', 'Afia', 'Fiifi']
+LAST_NAMES = ['Mensah', 'Boateng', 'Owusu', 'Asante', 'Osei', 'Addo', 'Agyeman', 'Appiah', 'Ofori', 'Quaye']
+
+# Staff roles after the school admin, weighted towards teachers.
+STAFF_ROLES = ['teacher'] * 8 + ['branch_manager', 'accountant', 'receptionist']
+
+# Ghana school shapes, as contiguous runs of ClassLevel.LEVEL_CHOICES.
+BASIC_LEVELS = [name for name, _ in ClassLevel.LEVEL_CHOICES if name[:3] in ('nur', 'kin', 'pri', 'jhs')]
+SHS_LEVELS = ['shs_1', 'shs_2', 'shs_3']
+
+CORE_SUBJECTS = [
+    ('Mathematics', 'MATH'), ('English Language', 'ENG'), ('Integrated Science', 'SCI'),
+    ('Social Studies', 'SOC'), ('Religious and Moral Education', 'RME'), ('Computing', 'ICT'),
+    ('French', 'FRE'), ('Ghanaian Language', 'GHL'), ('Creative Arts', 'CRA'),
+    ('Career Technology', 'CTE'), ('Physical Education', 'PE'),
+]
+ELECTIVE_SUBJECTS = [
+    ('Elective Mathematics', 'EMATH', 'science'), ('Physics', 'PHY', 'science'),
+    ('Chemistry', 'CHEM', 'science'), ('Biology', 'BIO', 'science'),
+    ('Economics', 'ECON', 'business'), ('Financial Accounting', 'ACC', 'business'),
+    ('Literature in English', 'LIT', 'arts'), ('History', 'HIST', 'arts'),
+    ('Geography', 'GEO', 'arts'), ('Food and Nutrition', 'FN', 'home_economics'),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate synthetic schools with staff, academic years, classrooms and '
+        'subject assignments for load and scale testing. Output is deterministic '
+        'for a given --seed. Each school\'s admin logs in as admin.<NNNNN>@'
+        f'{DOMAIN} with --password.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--schools', type=int, default=10)
+        parser.add_argument('--branches', type=int, default=2, help='Branches per school.')
+        parser.add_argument('--staff', type=int, default=30, help='Staff members per school.')
+        parser.add_argument('--years', type=int, default=1, help='Academic years per school, ending with the current one.')
+        parser.add_argument('--current-year', type=int, help='Start year of the current academic year (default: from today).')
+        parser.add_argument('--sections', type=int, default=2, help='Classrooms per class level and year.')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--chunk', type=int, default=100, help='Schools generated per transaction.')
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--password', default='synthetic-pass', help='Password for every generated user.')
+        parser.add_argument('--clear', action='store_true', help='Delete previously generated data first.')
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.batch_size = options['batch_size']
+        if options['clear']:
+            self.clear()
+        elif School.objects.filter(email__endswith=f'@{DOMAIN}').exists():
+            raise CommandError('Synthetic data already exists. Re-run with --clear to replace it.')
+
+        # Hashing is slow by design; every user shares one hash.
+        self.password = make_password(options['password'])
+        self.counts = dict.fromkeys(
+            ['schools', 'branches', 'users', 'members', 'years', 'terms',
+             'class_levels', 'classrooms', 'subjects', 'assignments'], 0
+        )
+        started = time.monotonic()
+        total = options['schools']
+        for start in range(0, total, options['chunk']):
+            indexes = range(start, min(start + options['chunk'], total))
+            with transaction.atomic():
+                self.generate_chunk(indexes)
+            self.stdout.write(f'  {indexes.stop}/{total} schools, {sum(self.counts.values())} rows')
+
+        elapsed = time.monotonic() - started
+        summary = ', '.join(f'{count} {name}' for name, count in self.counts.items())
+        self.stdout.write(self.style.SUCCESS(f'Generated {summary} in {elapsed:.1f}s.'))
+
+    def clear(self):
+        # Cascades to branches, members and all academics rows.
+        School.objects.filter(email__endswith=f'@{DOMAIN}').delete()
+        User.objects.filter(email__endswith=f'@{DOMAIN}').delete()
+        self.stdout.write('Cleared previous synthetic data.')
+
+    def bulk(self, model, objects, counter):
+        created = model.objects.bulk_create(objects, batch_size=self.batch_size)
+        self.counts[counter] += len(created)
+        return created
+
+    def generate_chunk(self, indexes):
+        opts = self.options
+        # One generator per school keeps output stable whatever --chunk is.
+        rngs = {i: random.Random(opts['seed'] * 1_000_003 + i) for i in indexes}
+
+        schools = self.bulk(School, [
+            School(
+                name=f'Synthetic School {i:05d}', slug=f'synthetic-{i:05d}',
+                email=f'school{i:05d}@{DOMAIN}', phone=f'+2333{i:08d}',
+                address=f'{rngs[i].randint(1, 200)} Independence Avenue',
+                city=rngs[i].choice(CITIES), subscription_status='active',
+                onboarding_complete=True, onboarding_step=4,
+            )
+            for i in indexes
+        ], 'schools')
+
+        branches = self.bulk(Branch, [
+            Branch(
+                school=school, name='Main Campus' if b == 0 else f'Campus {b + 1}',
+                branch_code=f'B{b + 1:02d}', address=school.address, city=school.city,
+                is_main_branch=b == 0,
+            )
+            for school in schools for b in range(opts['branches'])
+        ], 'branches')
+        branches_by_school = {}
+        for branch in branches:
+            branches_by_school.setdefault(branch.school_id, []).append(branch)
+
+        users = self.bulk(User, [
+            User(
+                email=f'{"admin" if s == 0 else f"staff{s:04d}"}.{i:05d}@{DOMAIN}',
+                phone_number=f'+2332{i * opts["staff"] + s:08d}',
+                first_name=rngs[i].choice(FIRST_NAMES), last_name=rngs[i].choice(LAST_NAMES),
+                password=self.password, is_phone_verified=True,
+            )
+            for i in indexes for s in range(opts['staff'])
+        ], 'users')
+
+        members = []
+        for n, user in enumerate(users):
+            school = schools[n // opts['staff']]
+            rng = rngs[indexes[n // opts['staff']]]
+            if n % opts['staff'] == 0:
+                role, branch = 'school_admin', None
+            else:
+                role = rng.choice(STAFF_ROLES)
+                branch = rng.choice(branches_by_school.get(school.pk) or [None])
+            members.append(SchoolMember(
+                user=user, school=school, branch=branch, role=role,
+                is_active=role == 'school_admin' or rng.random() > 0.05,
+            ))
+        members = self.bulk(SchoolMember, members, 'members')
+        teachers_by_school = {}
+        for member in members:
+            if member.role == 'teacher' and member.is_active:
+                teachers_by_school.setdefault(member.school_id, []).append(member.pk)
+
+        self.generate_academics(schools, rngs, indexes, teachers_by_school)
+
+    def generate_academics(self, schools, rngs, indexes, teachers_by_school):
+        opts = self.options
+        today = date.today()
+        this_year = opts['current_year'] or (today.year if today.month >= 9 else today.year - 1)
+        first_year = this_year - opts['years'] + 1
+
+        levels, subjects, years = [], [], []
+        for school, i in zip(schools, indexes):
+            rng = rngs[i]
+            shape = SHS_LEVELS if rng.random() < 0.2 else BASIC_LEVELS
+            levels += [
+                ClassLevel(school=school, name=name, order=order)
+                for order, name in enumerate(shape)
+            ]
+            electives = ELECTIVE_SUBJECTS if shape is SHS_LEVELS else []
+            subjects += [
+                Subject(school=school, name=name, code=code, subject_type='core')
+                for name, code in CORE_SUBJECTS
+            ] + [
+                Subject(school=school, name=name, code=code, subject_type='elective', elective_group=group)
+                for name, code, group in electives
+            ]
+            years += [
+                AcademicYear(
+                    school=school, name=f'{y}/{y + 1}', start_date=date(y, 9, 1),
+                    end_date=date(y + 1, 7, 31), is_current=y == this_year,
+                )
+                for y in range(first_year, this_year + 1)
+            ]
+        levels = self.bulk(ClassLevel, levels, 'class_levels')
+        subjects = self.bulk(Subject, subjects, 'subjects')
+        years = self.bulk(AcademicYear, years, 'years')
+
+        # Three terms per year: Sep–Dec, Jan–Apr, May–Jul.
+        terms = self.bulk(Term, [
+            Term(academic_year=year, name=name, start_date=start, end_date=end)
+            for year in years
+            for name, start, end in (
+                ('term_1', year.start_date, date(year.start_date.year, 12, 18)),
+                ('term_2', date(year.end_date.year, 1, 8), date(year.end_date.year, 4, 10)),
+                ('term_3', date(year.end_date.year, 5, 4), year.end_date - timedelta(days=7)),
+            )
+        ], 'terms')
+
+        levels_by_school = _group(levels, 'school_id')
+        subjects_by_school = _group(subjects, 'school_id')
+        terms_by_year = _group(terms, 'academic_year_id')
+        rng_by_school = {school.pk: rngs[i] for school, i in zip(schools, indexes)}
+
+        classrooms = []
+        for year in years:
+            rng = rng_by_school[year.school_id]
+            teachers = teachers_by_school.get(year.school_id) or [None]
+            classrooms += [
+                ClassRoom(
+                    school_id=year.school_id, academic_year=year, class_level=level,
+                    section_name=chr(ord('A') + s), form_teacher_id=rng.choice(teachers),
+                    capacity=rng.choice([30, 35, 40, 45]),
+                )
+                for level in levels_by_school[year.school_id]
+                for s in range(self.options['sections'])
+            ]
+        classrooms = self.bulk(ClassRoom, classrooms, 'classrooms')
+
+        assignments = []
+        for classroom in classrooms:
+            rng = rng_by_school[classroom.school_id]
+            teachers = teachers_by_school.get(classroom.school_id) or [None]
+            for term in terms_by_year[classroom.academic_year_id]:
+                assignments += [
+                    SubjectAssignment(
+                        classroom=classroom, subject=subject, term=term,
+                        teacher_id=rng.choice(teachers), periods_per_week=rng.randint(2, 6),
+                    )
+                    for subject in subjects_by_school[classroom.school_id]
+                ]
+            if len(assignments) >= self.batch_size * 5:
+                self.bulk(SubjectAssignment, assignments, 'assignments')
+                assignments = []
+        self.bulk(SubjectAssignment, assignments, 'assignments')
+
+
+def _group(rows, attr):
+    grouped = {}
+    for row in rows:
+        grouped.setdefault(getattr(row, attr), []).append(row)
+    return grouped
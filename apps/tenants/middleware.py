@@ -1,6 +1,11 @@
 import logging
 from django.shortcuts import redirect
 from django.urls import reverse
+from apps.tenants.context import TenantContext, get_tenant_context
+from apps.tenants.services.onboarding import (
+    get_cached_onboarding_required,
+    set_cached_onboarding_required,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +19,23 @@ EXEMPT_URLS = [
 ]
 
 
+class TenantContextMiddleware:
+    """
+    Attaches ``request.tenant`` — a lazily resolved TenantContext — so that
+    middleware, permissions, views and templates share one membership lookup
+    per request.
+
+    Must run after AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.tenant = TenantContext(request)
+        return self.get_response(request)
+
+
 class OnboardingMiddleware:
     """
     Redirects authenticated school admins to the onboarding flow
@@ -45,20 +67,22 @@ class OnboardingMiddleware:
         return True
 
     def _get_redirect(self, request):
-        """Return redirect URL if onboarding is incomplete, else None."""
-        try:
-            membership = request.user.school_memberships.filter(
-                role='school_admin', is_active=True
-            ).select_related('school').first()
+        """
+        Return redirect URL if onboarding is incomplete, else None.
 
-            if not membership:
+        The answer is cached per user, so once a school is set up this
+        check costs no database queries.
+        """
+        required = get_cached_onboarding_required(request.user.pk)
+        if required is None:
+            try:
+                membership = get_tenant_context(request).membership_for_role('school_admin')
+                required = bool(membership and not membership.school.onboarding_complete)
+            except Exception as e:
+                logger.warning(f"OnboardingMiddleware error for {request.user}: {e}")
                 return None
+            set_cached_onboarding_required(request.user.pk, required)
 
-            school = membership.school
-            if not school.onboarding_complete:
-                return reverse('tenants:onboarding_branch')
-
-        except Exception as e:
-            logger.warning(f"OnboardingMiddleware error for {request.user}: {e}")
-
-        return None
\ No newline at end of file
+        if required:
+            return reverse('tenants:onboarding_branch')
+        return None
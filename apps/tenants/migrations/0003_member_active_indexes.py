@@ -0,0 +1,23 @@
+# Generated by Django 5.0 on 2026-10-18 13:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenants', '0002_school_onboarding_complete_school_onboarding_step'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='schoolmember',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['user', 'role'], name='tenants_member_active_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schoolmember',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['school', 'role'], name='tenants_member_active_sch_idx'),
+        ),
+    ]
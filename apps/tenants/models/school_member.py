@@ -1,6 +1,36 @@
 from django.db import models
 
 
+class SchoolMemberQuerySet(models.QuerySet):
+    """
+    Bulk writes skip the post_save/post_delete signals that retire cached
+    role sets (apps.tenants.signals), so these do it themselves.
+    """
+
+    def update(self, **kwargs):
+        user_ids = set(self.values_list('user_id', flat=True))
+        rows = super().update(**kwargs)
+        _memberships_changed(user_ids)
+        return rows
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        _memberships_changed({obj.user_id for obj in objs})
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        _memberships_changed({obj.user_id for obj in objs})
+        return rows
+
+
+def _memberships_changed(user_ids):
+    # Imported here: the signals module imports this one.
+    from apps.tenants.signals import memberships_changed
+    memberships_changed(user_ids)
+
+
 class SchoolMember(models.Model):
     ROLE_CHOICES = [
         ('school_admin', 'School Administrator'),
@@ -31,6 +61,8 @@ class SchoolMember(models.Model):
     is_active = models.BooleanField(default=True)
     joined_at = models.DateTimeField(auto_now_add=True)
 
+    objects = SchoolMemberQuerySet.as_manager()
+
     def __str__(self):
         return f'{self.user.full_name} - {self.get_role_display()} at {self.school.name}'
 
@@ -45,4 +77,16 @@ class SchoolMember(models.Model):
     class Meta:
         verbose_name = 'School Member'
         verbose_name_plural = 'School Members'
-        unique_together = ['user', 'school', 'role']
\ No newline at end of file
+        unique_together = ['user', 'school', 'role']
+        indexes = [
+            # Role-set and tenant-context lookups: user_id=? AND is_active
+            models.Index(
+                fields=['user', 'role'], condition=models.Q(is_active=True),
+                name='tenants_member_active_user_idx',
+            ),
+            # Member counts and admin lookups per school
+            models.Index(
+                fields=['school', 'role'], condition=models.Q(is_active=True),
+                name='tenants_member_active_sch_idx',
+            ),
+        ]
\ No newline at end of file
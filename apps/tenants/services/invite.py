@@ -4,7 +4,7 @@ import string
 from django.db import transaction
 from django.contrib.auth import get_user_model
 from apps.tenants.models import SchoolMember, Branch
-from apps.notifications.services.sms import send_sms
+from apps.notifications.services.outbox import queue_sms
 
 logger = logging.getLogger(__name__)
 
@@ -96,7 +96,7 @@ def invite_member(school, invited_by, data):
 
 
 def _notify_existing_user(user, school, role, invited_by):
-    """Notify an existing platform user they've been added to a school."""
+    """Queue an SMS telling an existing platform user they've been added to a school."""
     role_display = dict(SchoolMember.ROLE_CHOICES).get(role, role) if hasattr(SchoolMember, 'ROLE_CHOICES') else role
     message = (
         f"Hi {user.first_name}, you have been added to {school.name} "
@@ -104,14 +104,11 @@ def _notify_existing_user(user, school, role, invited_by):
         f"Log in at ilimi.app to get started."
     )
     if user.phone_number:
-        try:
-            send_sms(user.phone_number, message)
-        except Exception as e:
-            logger.warning(f"Failed to notify existing user {user.email}: {e}")
+        queue_sms(user.phone_number, message)
 
 
 def _notify_new_user(user, school, role, temp_password, invited_by):
-    """Send login credentials to a newly invited user via SMS."""
+    """Queue an SMS with login credentials for a newly invited user."""
     message = (
         f"Hi {user.first_name or 'there'}, you have been invited to join {school.name} "
         f"on Ilimi as {role}. "
@@ -119,10 +116,7 @@ def _notify_new_user(user, school, role, temp_password, invited_by):
         f"Please change your password after first login."
     )
     if user.phone_number:
-        try:
-            send_sms(user.phone_number, message)
-        except Exception as e:
-            logger.warning(f"Failed to notify new user {user.email}: {e}")
+        queue_sms(user.phone_number, message)
     else:
         # No phone number — log credentials for dev visibility
         logger.info(
@@ -1,12 +1,41 @@
 import logging
+from django.core.cache import cache
 from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
 from apps.tenants.models import School, Branch, SchoolMember, SubscriptionPlan
-from apps.notifications.services.sms import send_welcome_sms
+from apps.notifications.services.outbox import queue_welcome_sms
 
 logger = logging.getLogger(__name__)
 
+# Onboarding only ever moves from incomplete to complete, so the
+# middleware's per-user answer can be cached for a long time. It is
+# dropped when a school finishes onboarding (complete_onboarding) and on
+# every SchoolMember save or delete (apps.tenants.signals). Invalidation
+# only reaches other workers through a shared cache, which CoreConfig
+# requires outside DEBUG.
+ONBOARDING_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def onboarding_cache_key(user_id):
+    return f'tenants:onboarding_required:{user_id}'
+
+
+def get_cached_onboarding_required(user_id):
+    """Return the cached True/False answer for a user, or None on a miss."""
+    return cache.get(onboarding_cache_key(user_id))
+
+
+def set_cached_onboarding_required(user_id, required):
+    cache.set(onboarding_cache_key(user_id), required, ONBOARDING_CACHE_TIMEOUT)
+
+
+def invalidate_onboarding_cache(user_ids):
+    """Drop cached onboarding answers once the surrounding transaction commits."""
+    keys = [onboarding_cache_key(pk) for pk in user_ids]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
 
 @transaction.atomic
 def create_school_with_owner(user, school_data):
@@ -71,11 +100,16 @@ def create_main_branch(school, branch_data):
 @transaction.atomic
 def complete_onboarding(school, user):
     """
-    Mark onboarding as complete and send welcome SMS.
+    Mark onboarding as complete and queue the welcome SMS.
     """
     school.onboarding_complete = True
     school.onboarding_step = 3
     school.save(update_fields=['onboarding_complete', 'onboarding_step'])
 
-    send_welcome_sms(user.phone_number, school.name)
+    admin_ids = SchoolMember.objects.filter(
+        school=school, role='school_admin'
+    ).values_list('user_id', flat=True)
+    invalidate_onboarding_cache(set(admin_ids) | {user.pk})
+
+    queue_welcome_sms(user.phone_number, school.name)
     logger.info(f"Onboarding completed for school: {school.name}")
\ No newline at end of file
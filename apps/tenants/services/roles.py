@@ -0,0 +1,100 @@
+import uuid
+from collections import namedtuple
+from django.core.cache import cache
+from django.db import transaction
+from apps.tenants.models import SchoolMember
+
+# Role sets are cached under a per-user version token. Any membership
+# change swaps the token, so stale entries are never read again and
+# simply expire. A revoked role is only dropped everywhere if every worker
+# reads the same token, so the cache must be shared: CoreConfig refuses
+# a per-process one outside DEBUG.
+ROLE_CACHE_TIMEOUT = 60 * 60
+VERSION_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+RoleGrant = namedtuple('RoleGrant', ['membership_id', 'school_id', 'branch_id', 'role'])
+
+
+class RoleSet:
+    """
+    A user's active role grants, checked in memory.
+
+    Grants are ordered by membership id, so the first grant's school is
+    the same "current school" that TenantContext and the API views use.
+    """
+
+    def __init__(self, grants):
+        self.grants = tuple(sorted(grants))
+
+    @property
+    def school_id(self):
+        return self.grants[0].school_id if self.grants else None
+
+    @property
+    def school_ids(self):
+        return frozenset(g.school_id for g in self.grants)
+
+    def roles(self, school_id=None):
+        """Roles held in ``school_id`` (defaults to the current school)."""
+        school_id = school_id or self.school_id
+        return frozenset(g.role for g in self.grants if g.school_id == school_id)
+
+    def has_role(self, *roles, school_id=None, branch_id=None):
+        """
+        Return True if the user holds any of ``roles`` in the school.
+
+        With ``branch_id``, only grants for that branch or school-level
+        grants (no branch) count — e.g. a branch_manager of branch X.
+        """
+        school_id = school_id or self.school_id
+        for grant in self.grants:
+            if grant.school_id != school_id or grant.role not in roles:
+                continue
+            if branch_id is None or grant.branch_id in (None, branch_id):
+                return True
+        return False
+
+    def __bool__(self):
+        return bool(self.grants)
+
+
+def _version_key(user_id):
+    return f'tenants:roles_version:{user_id}'
+
+
+def _roles_key(user_id, version):
+    return f'tenants:roles:{user_id}:{version}'
+
+
+def _get_version(user_id):
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.set(_version_key(user_id), version, VERSION_CACHE_TIMEOUT)
+    return version
+
+
+def load_role_set(user_id):
+    """Load a user's active role grants in one query, bypassing the cache."""
+    rows = SchoolMember.objects.filter(
+        user_id=user_id, is_active=True
+    ).values_list('id', 'school_id', 'branch_id', 'role')
+    return RoleSet(RoleGrant(*row) for row in rows)
+
+
+def get_role_set(user_id):
+    """Return a user's RoleSet from the shared cache, loading it on a miss."""
+    key = _roles_key(user_id, _get_version(user_id))
+    grants = cache.get(key)
+    if grants is None:
+        role_set = load_role_set(user_id)
+        cache.set(key, [tuple(g) for g in role_set.grants], ROLE_CACHE_TIMEOUT)
+        return role_set
+    return RoleSet(RoleGrant(*g) for g in grants)
+
+
+def invalidate_role_set(user_id):
+    """Retire a user's cached role set once the current transaction commits."""
+    transaction.on_commit(
+        lambda: cache.set(_version_key(user_id), uuid.uuid4().hex, VERSION_CACHE_TIMEOUT)
+    )
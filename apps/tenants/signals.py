@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from apps.tenants.models import SchoolMember
+from apps.tenants.services.onboarding import invalidate_onboarding_cache
+from apps.tenants.services.roles import invalidate_role_set
+
+
+def memberships_changed(user_ids):
+    """Retire the cached role sets and onboarding answers of ``user_ids``."""
+    for user_id in user_ids:
+        invalidate_role_set(user_id)
+    invalidate_onboarding_cache(user_ids)
+
+
+@receiver(post_save, sender=SchoolMember)
+@receiver(post_delete, sender=SchoolMember)
+def school_member_changed(sender, instance, **kwargs):
+    """
+    Any membership change invalidates the user's cached role set and
+    onboarding answer, however it was made (services, admin, shell).
+    Bulk writes go through SchoolMemberQuerySet instead.
+    """
+    memberships_changed([instance.user_id])
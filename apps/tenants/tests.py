@@ -1,3 +1,277 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.urls import URLPattern, URLResolver, reverse
+from rest_framework.test import APIClient
+from apps.accounts.models import User
+from apps.core.testing import QUERY_BUDGETS, QueryBudgetMixin
+from apps.tenants.context import TenantContext
+from apps.tenants.models import Branch, School, SchoolMember
+from apps.tenants.services.onboarding import (
+    complete_onboarding, get_cached_onboarding_required, set_cached_onboarding_required,
+)
+from apps.tenants.services.roles import RoleGrant, RoleSet, get_role_set
 
-# Create your tests here.
+
+def _route_methods(patterns, namespace=None):
+    """Yield ``(route name, allowed methods)`` for every named API route."""
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _route_methods(pattern.url_patterns, pattern.namespace or namespace)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            view = pattern.callback.view_class
+            methods = {
+                method.upper() for method in view.http_method_names
+                if method not in ('head', 'options') and hasattr(view, method)
+            }
+            yield f'{namespace}:{pattern.name}' if namespace else pattern.name, methods
+
+
+class QueryBudgetRegistryTests(SimpleTestCase):
+    def test_every_api_route_has_a_budget(self):
+        from config.api_urls import urlpatterns
+        routes = dict(_route_methods(urlpatterns))
+        self.assertEqual(set(QUERY_BUDGETS) - set(routes), set(), 'Budgets for unknown routes')
+        for route, methods in routes.items():
+            with self.subTest(route=route):
+                self.assertEqual(set(QUERY_BUDGETS.get(route, ())), methods)
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    """School endpoints stay within their query budgets as data grows."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'admin@school.test', 'pass12345!', first_name='Ama', last_name='Mensah'
+        )
+        cls.school = School.objects.create(
+            name='Accra Academy', email='info@school.test', phone='0200000000',
+            address='Accra', city='Accra', onboarding_complete=True,
+        )
+        SchoolMember.objects.create(user=cls.user, school=cls.school, role='school_admin')
+        cls.branch = Branch.objects.create(
+            school=cls.school, name='Main', branch_code='MAIN', address='Accra', city='Accra',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def seed(self, n):
+        """Grow branches and staff members to ``n`` each."""
+        have = Branch.objects.filter(school=self.school).count()
+        new = range(have, n)
+        branches = Branch.objects.bulk_create(
+            Branch(
+                school=self.school, name=f'Branch {i}', branch_code=f'B{i}',
+                address='Accra', city='Accra',
+            )
+            for i in new
+        )
+        users = User.objects.bulk_create(
+            User(email=f'teacher{i}@school.test', first_name='Kofi', last_name='Boateng')
+            for i in new
+        )
+        SchoolMember.objects.bulk_create(
+            SchoolMember(user=user, school=self.school, branch=branch, role='teacher')
+            for user, branch in zip(users, branches)
+        )
+
+    def assertGetBudget(self, route, url):
+        self.assertBudgetAtScale(route, 'GET', self.seed, lambda: self.client.get(url))
+
+    def test_school(self):
+        self.assertGetBudget('tenants-v1:school-me', '/api/v1/schools/me/')
+
+    def test_branches(self):
+        self.assertGetBudget('tenants-v1:branch-list-create', '/api/v1/schools/me/branches/')
+        self.assertGetBudget(
+            'tenants-v1:branch-detail', f'/api/v1/schools/me/branches/{self.branch.pk}/'
+        )
+
+    def test_members(self):
+        self.assertGetBudget('tenants-v1:member-list-invite', '/api/v1/schools/me/members/')
+        self.assertGetBudget('tenants-v1:member-export', '/api/v1/schools/me/members/export/')
+
+    def assertWrite(self, route, method, url, data):
+        call = getattr(self.client, method.lower())
+        self.assertWriteBudget(route, method, self.seed, lambda: call(url, data, format='json'))
+
+    def test_writes(self):
+        self.assertWrite('tenants-v1:school-me', 'PATCH', '/api/v1/schools/me/', {'city': 'Tema'})
+        self.assertWrite('tenants-v1:branch-list-create', 'POST', '/api/v1/schools/me/branches/', {
+            'name': 'Annex', 'branch_code': 'ANX', 'address': 'Tema', 'city': 'Tema',
+        })
+        self.assertWrite(
+            'tenants-v1:branch-detail', 'PATCH',
+            f'/api/v1/schools/me/branches/{self.branch.pk}/', {'city': 'Tema'},
+        )
+        self.assertWrite('tenants-v1:member-list-invite', 'POST', '/api/v1/schools/me/members/', {
+            'email': 'new@school.test', 'role': 'teacher', 'branch_id': self.branch.pk,
+            'first_name': 'Yaw', 'last_name': 'Owusu', 'phone_number': '+233244000001',
+        })
+
+
+class TenantContextTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = School.objects.create(
+            name='Accra Academy', email='info@school.test', phone='0200000000',
+            address='Accra', city='Accra',
+        )
+        cls.other_school = School.objects.create(
+            name='Tema High', email='info@tema.test', phone='0200000001',
+            address='Tema', city='Tema',
+        )
+        cls.admin = User.objects.create_user('admin@school.test', 'pass12345!')
+        cls.teacher = User.objects.create_user('teacher@tema.test', 'pass12345!')
+        SchoolMember.objects.create(user=cls.admin, school=cls.school, role='school_admin')
+        SchoolMember.objects.create(user=cls.teacher, school=cls.other_school, role='teacher')
+
+    def context(self, user):
+        request = RequestFactory().get('/')
+        request.user = user
+        return request, TenantContext(request)
+
+    def test_memberships_load_once_per_request(self):
+        _, tenant = self.context(self.admin)
+        with self.assertNumQueries(1):
+            self.assertEqual(tenant.school, self.school)
+            self.assertEqual(tenant.membership.role, 'school_admin')
+            self.assertEqual(len(tenant.memberships), 1)
+            self.assertIsNotNone(tenant.membership_for_role('school_admin'))
+            self.assertTrue(tenant)
+
+    def test_replacing_the_user_re_resolves(self):
+        request, tenant = self.context(AnonymousUser())
+        with self.assertNumQueries(0):
+            self.assertIsNone(tenant.school)
+        request.user = self.teacher  # as DRF does after token authentication
+        with self.assertNumQueries(1):
+            self.assertEqual(tenant.school, self.other_school)
+            self.assertEqual(tenant.membership.role, 'teacher')
+        request.user = self.admin
+        self.assertEqual(tenant.school, self.school)
+
+
+class RoleSetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = School.objects.create(
+            name='Accra Academy', email='info@school.test', phone='0200000000',
+            address='Accra', city='Accra', onboarding_complete=True,
+        )
+        cls.main, cls.annex = Branch.objects.bulk_create([
+            Branch(school=cls.school, name=name, branch_code=name.upper(), address='Accra', city='Accra')
+            for name in ('Main', 'Annex')
+        ])
+        cls.admin = User.objects.create_user('admin@school.test', 'pass12345!')
+        cls.manager = User.objects.create_user('manager@school.test', 'pass12345!')
+        SchoolMember.objects.create(user=cls.admin, school=cls.school, role='school_admin')
+        cls.grant = SchoolMember.objects.create(
+            user=cls.manager, school=cls.school, branch=cls.main, role='branch_manager',
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_branch_grants_only_cover_their_branch(self):
+        role_set = RoleSet([
+            RoleGrant(1, 7, None, 'teacher'),
+            RoleGrant(2, 7, 3, 'branch_manager'),
+        ])
+        self.assertEqual(role_set.school_id, 7)
+        self.assertEqual(role_set.roles(), {'teacher', 'branch_manager'})
+        self.assertTrue(role_set.has_role('branch_manager'))
+        self.assertTrue(role_set.has_role('branch_manager', branch_id=3))
+        self.assertFalse(role_set.has_role('branch_manager', branch_id=4))
+        self.assertTrue(role_set.has_role('teacher', branch_id=4))  # school-level grant
+        self.assertFalse(role_set.has_role('teacher', school_id=8))
+        self.assertFalse(RoleSet([]))
+
+    def test_role_set_is_cached_until_memberships_change(self):
+        with self.assertNumQueries(1):
+            get_role_set(self.manager.pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(get_role_set(self.manager.pk).has_role('branch_manager'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.grant.role = 'teacher'
+            self.grant.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(get_role_set(self.manager.pk).roles(), {'teacher'})
+
+    def test_bulk_updates_invalidate_too(self):
+        self.assertTrue(get_role_set(self.manager.pk))
+        with self.captureOnCommitCallbacks(execute=True):
+            SchoolMember.objects.filter(user=self.manager).update(is_active=False)
+        self.assertFalse(get_role_set(self.manager.pk))
+
+    def test_branch_writes_need_a_grant_for_that_branch(self):
+        client = APIClient()
+        client.force_authenticate(self.manager)
+        for branch, expected in ((self.annex, 403), (self.main, 200)):
+            url = reverse('tenants-v1:branch-detail', kwargs={'pk': branch.pk})
+            self.assertEqual(client.get(url).status_code, 200)
+            self.assertEqual(client.patch(url, {'city': 'Tema'}).status_code, expected)
+        client.force_authenticate(self.admin)
+        url = reverse('tenants-v1:branch-detail', kwargs={'pk': self.annex.pk})
+        self.assertEqual(client.patch(url, {'city': 'Tema'}).status_code, 200)
+
+
+class OnboardingMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = School.objects.create(
+            name='Accra Academy', email='info@school.test', phone='0200000000',
+            address='Accra', city='Accra', onboarding_complete=False,
+        )
+        cls.user = User.objects.create_user('admin@school.test', 'pass12345!')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+        self.onboarding_url = reverse('tenants:onboarding_branch')
+
+    def redirected(self):
+        return self.client.get('/dashboard/').get('Location') == self.onboarding_url
+
+    def make_admin(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return SchoolMember.objects.create(user=self.user, school=self.school, role='school_admin')
+
+    def test_admin_of_incomplete_school_is_redirected_and_answer_cached(self):
+        self.make_admin()
+        self.assertTrue(self.redirected())
+        self.assertIs(get_cached_onboarding_required(self.user.pk), True)
+
+    def test_cached_answer_is_used(self):
+        self.make_admin()
+        set_cached_onboarding_required(self.user.pk, False)
+        self.assertFalse(self.redirected())
+
+    def test_new_membership_drops_a_cached_false(self):
+        self.assertFalse(self.redirected())
+        self.assertIs(get_cached_onboarding_required(self.user.pk), False)
+        self.make_admin()  # e.g. granted in the admin, outside the services
+        self.assertIsNone(get_cached_onboarding_required(self.user.pk))
+        self.assertTrue(self.redirected())
+
+    def test_role_change_and_removal_invalidate(self):
+        member = self.make_admin()
+        self.assertTrue(self.redirected())
+        with self.captureOnCommitCallbacks(execute=True):
+            member.role = 'teacher'
+            member.save()
+        self.assertFalse(self.redirected())
+        with self.captureOnCommitCallbacks(execute=True):
+            member.delete()
+        self.assertIsNone(get_cached_onboarding_required(self.user.pk))
+
+    def test_completing_onboarding_invalidates(self):
+        self.make_admin()
+        self.assertTrue(self.redirected())
+        with self.captureOnCommitCallbacks(execute=True):
+            complete_onboarding(self.school, self.user)
+        self.assertFalse(self.redirected())
@@ -2,6 +2,7 @@ import logging
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from apps.tenants.context import get_tenant_context
 from apps.tenants.forms import BranchSetupForm
 
 logger = logging.getLogger(__name__)
@@ -10,9 +11,7 @@ logger = logging.getLogger(__name__)
 @login_required(login_url='accounts:login')
 def onboarding_branch(request):
     """Onboarding step — set up first branch."""
-    membership = request.user.school_memberships.filter(
-        role='school_admin', is_active=True
-    ).select_related('school').first()
+    membership = get_tenant_context(request).membership_for_role('school_admin')
 
     if not membership:
         messages.error(request, 'No school found for your account.')
@@ -46,9 +45,7 @@ def onboarding_branch(request):
 @login_required(login_url='accounts:login')
 def onboarding_complete(request):
     """Onboarding complete — welcome screen."""
-    membership = request.user.school_memberships.filter(
-        role='school_admin', is_active=True
-    ).select_related('school').first()
+    membership = get_tenant_context(request).membership_for_role('school_admin')
 
     school = membership.school if membership else None
 
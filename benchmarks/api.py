@@ -0,0 +1,278 @@
+"""
+End-to-end benchmark for the v1 API.
+
+Simulated clients log in as the admins of schools generated by
+``manage.py seed_tenants`` and drive the auth, schools and academics
+endpoints concurrently. Per endpoint it reports p50/p95/p99 latency,
+throughput, error count and queries per request.
+
+Run it through ``manage.py benchmark_api``. By default requests go
+through Django in-process (so queries can be counted); ``--base-url``
+sends real HTTP to a running server instead.
+"""
+import itertools
+import json
+import random
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from unittest.mock import patch
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+SCENARIOS = ('auth', 'schools', 'academics', 'registration', 'invites')
+
+# Every OTP issued during an in-process run (see pin_otp_codes), so the
+# registration scenario can verify without reading the SMS.
+BENCHMARK_OTP_CODE = '246810'
+
+
+@contextmanager
+def pin_otp_codes():
+    """Issue BENCHMARK_OTP_CODE as every new OTP in this process."""
+    with patch('apps.accounts.services.otp.generate_code', return_value=BENCHMARK_OTP_CODE):
+        yield
+
+
+# ── Transports ────────────────────────────────────────────────────────────
+
+class InProcessTransport:
+    """Calls the API through Django's test client; counts queries per request."""
+    counts_queries = True
+    otp_code = BENCHMARK_OTP_CODE
+
+    def __init__(self):
+        # Server errors are recorded as 500s rather than raised.
+        self.client = Client(SERVER_NAME='localhost', raise_request_exception=False)
+
+    def request(self, method, path, data=None, token=None):
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method.lower())(
+                path, data=data and json.dumps(data), content_type='application/json', **headers
+            )
+            if getattr(response, 'streaming', False):
+                b''.join(response.streaming_content)
+                body = None
+            elif response.get('Content-Type', '').startswith('application/json'):
+                body = response.json()
+            else:
+                body = None  # e.g. the HTML debug page for a 500
+        return response.status_code, body, len(queries)
+
+    def close(self):
+        connection.close()
+
+
+class HTTPTransport:
+    """
+    Sends real HTTP requests to ``base_url``; query counts are unavailable,
+    and so are OTP codes, which the server really sends.
+    """
+    counts_queries = False
+    otp_code = None
+
+    def __init__(self, base_url):
+        import requests
+        self.base_url = base_url.rstrip('/')
+        self.session = requests.Session()
+
+    def request(self, method, path, data=None, token=None):
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        response = self.session.request(
+            method, self.base_url + path, json=data, headers=headers, timeout=60
+        )
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        return response.status_code, body, None
+
+    def close(self):
+        self.session.close()
+
+
+# ── Recording ─────────────────────────────────────────────────────────────
+
+def _percentile(values, p):
+    """Nearest-rank percentile of a sorted list."""
+    if not values:
+        return None
+    rank = max(0, min(len(values) - 1, round(p / 100 * len(values) + 0.5) - 1))
+    return values[rank]
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(list)
+
+    def add(self, endpoint, seconds, status, queries):
+        with self.lock:
+            self.samples[endpoint].append((seconds, status, queries))
+
+    def summary(self, wall_seconds):
+        results = {}
+        for endpoint, samples in sorted(self.samples.items()):
+            latencies = sorted(s[0] * 1000 for s in samples)
+            queries = [s[2] for s in samples if s[2] is not None]
+            results[endpoint] = {
+                'requests': len(samples),
+                'errors': sum(1 for s in samples if s[1] >= 400),
+                'throughput_rps': round(len(samples) / wall_seconds, 2) if wall_seconds else None,
+                'latency_ms': {
+                    'mean': round(sum(latencies) / len(latencies), 2),
+                    'p50': round(_percentile(latencies, 50), 2),
+                    'p95': round(_percentile(latencies, 95), 2),
+                    'p99': round(_percentile(latencies, 99), 2),
+                    'max': round(latencies[-1], 2),
+                },
+                'queries': {
+                    'mean': round(sum(queries) / len(queries), 2),
+                    'max': max(queries),
+                } if queries else None,
+            }
+        return results
+
+
+# ── Simulated client ──────────────────────────────────────────────────────
+
+class SimulatedClient:
+    """One user session: logs in as a school admin, then loops over scenarios."""
+
+    def __init__(self, transport, recorder, email, password, scenarios, domain, unique):
+        self.transport = transport
+        self.recorder = recorder
+        self.email = email
+        self.password = password
+        self.scenarios = scenarios
+        self.domain = domain
+        self.unique = unique
+        self.access = self.refresh = None
+        self.year_id = None
+
+    def call(self, endpoint, method, path, data=None, auth=True):
+        started = time.perf_counter()
+        status, body, queries = self.transport.request(
+            method, path, data, self.access if auth else None
+        )
+        self.recorder.add(endpoint, time.perf_counter() - started, status, queries)
+        payload = body.get('data') if isinstance(body, dict) else None
+        return status, payload or {}
+
+    def login(self):
+        status, data = self.call('auth:token-obtain', 'POST', '/api/v1/auth/token/', {
+            'email': self.email, 'password': self.password,
+        }, auth=False)
+        if status != 200:
+            raise RuntimeError(f'Login failed for {self.email} ({status}). Was seed_tenants run?')
+        self.access, self.refresh = data['access'], data['refresh']
+
+    def run(self, iterations):
+        self.login()
+        for _ in range(iterations):
+            for scenario in self.scenarios:
+                getattr(self, f'scenario_{scenario}')()
+
+    def scenario_auth(self):
+        status, data = self.call('auth:token-refresh', 'POST', '/api/v1/auth/token/refresh/', {
+            'refresh': self.refresh,
+        }, auth=False)
+        if status == 200:
+            self.access = data['access']
+            self.refresh = data.get('refresh', self.refresh)
+
+    def scenario_schools(self):
+        self.call('schools:me', 'GET', '/api/v1/schools/me/')
+        self.call('schools:branches', 'GET', '/api/v1/schools/me/branches/')
+        self.call('schools:members', 'GET', '/api/v1/schools/me/members/')
+
+    def scenario_academics(self):
+        _, data = self.call('academics:years', 'GET', '/api/v1/academics/years/')
+        years = data.get('academic_years') or []
+        if years and self.year_id is None:
+            current = [y for y in years if y['is_current']] or years
+            self.year_id = current[0]['id']
+        if self.year_id:
+            self.call('academics:classrooms', 'GET', f'/api/v1/academics/years/{self.year_id}/classrooms/')
+        self.call('academics:subjects', 'GET', '/api/v1/academics/subjects/')
+        self.call('academics:assignments', 'GET', '/api/v1/academics/assignments/')
+
+    def scenario_registration(self):
+        token = self.unique()
+        phone = f'+2339{int(token, 16) % 10 ** 8:08d}'
+        password = f'Bench-{token[:12]}!'
+        status, _ = self.call('auth:register-step1', 'POST', '/api/v1/auth/register/step1/', {
+            'first_name': 'Bench', 'last_name': 'User', 'email': f'bench-{token}@{self.domain}',
+            'phone_number': phone, 'password': password, 'confirm_password': password,
+        }, auth=False)
+        if status != 201:
+            return
+        self.call('auth:register-step2', 'POST', '/api/v1/auth/register/step2/', {
+            'phone_number': phone, 'school_name': f'Bench School {token[:8]}',
+            'school_email': f'bench-school-{token}@{self.domain}',
+            'school_phone': phone, 'city': 'Accra',
+        }, auth=False)
+        if self.transport.otp_code is None:
+            return
+        self.call('auth:otp-verify', 'POST', '/api/v1/auth/verify/otp/', {
+            'phone_number': phone, 'otp_code': self.transport.otp_code,
+        }, auth=False)
+
+    def scenario_invites(self):
+        token = self.unique()
+        self.call('schools:member-invite', 'POST', '/api/v1/schools/me/members/', {
+            'email': f'invite-{token}@{self.domain}', 'role': 'teacher',
+            'first_name': 'Invited', 'last_name': 'Teacher',
+            'phone_number': f'+2338{int(token, 16) % 10 ** 8:08d}',
+        })
+
+
+def run_benchmark(transport_factory, accounts, password, domain, clients=10,
+                  iterations=5, scenarios=SCENARIOS, seed=1):
+    """
+    Run ``clients`` concurrent simulated clients for ``iterations`` loops.
+
+    ``accounts`` is the list of admin emails to log in as; clients are
+    spread over a ``seed``-shuffled copy of it. Returns the
+    JSON-serialisable report.
+    """
+    accounts = list(accounts)
+    random.Random(seed).shuffle(accounts)
+    recorder = Recorder()
+    counter = itertools.count()
+
+    def unique():
+        return f'{next(counter):06x}{uuid.uuid4().hex[:10]}'
+
+    def worker(index):
+        transport = transport_factory()
+        try:
+            SimulatedClient(
+                transport, recorder, accounts[index % len(accounts)], password,
+                scenarios, domain, unique,
+            ).run(iterations)
+        finally:
+            transport.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        for future in [pool.submit(worker, i) for i in range(clients)]:
+            future.result()
+    wall = time.perf_counter() - started
+
+    endpoints = recorder.summary(wall)
+    total = sum(e['requests'] for e in endpoints.values())
+    return {
+        'clients': clients,
+        'iterations': iterations,
+        'scenarios': list(scenarios),
+        'duration_s': round(wall, 3),
+        'requests': total,
+        'throughput_rps': round(total / wall, 2) if wall else None,
+        'endpoints': endpoints,
+    }
@@ -0,0 +1,108 @@
+"""
+Micro-benchmark for IlimiAPIRenderer.
+
+Renders 10k-row classroom and subject-assignment payloads shaped like the
+serializer output, once with the stdlib encoder and once with orjson (if
+installed), and reports time and peak memory per render.
+
+    python -m benchmarks.renderer [--rows 10000] [--repeat 20]
+"""
+import argparse
+import datetime
+import decimal
+import os
+import statistics
+import time
+import tracemalloc
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
+
+import django  # noqa: E402
+
+django.setup()
+
+from apps.core import renderers  # noqa: E402
+from apps.core.renderers import IlimiAPIRenderer  # noqa: E402
+
+
+def classroom_rows(n):
+    return [
+        {
+            'id': i,
+            'full_name': f'JHS {i % 3 + 1} Section {i}',
+            'class_level': i % 17 + 1,
+            'class_level_display': f'JHS {i % 3 + 1}',
+            'section_name': f'Section {i}',
+            'elective_group': '',
+            'form_teacher': i % 90 + 1,
+            'form_teacher_name': 'Kwame Asante',
+            'branch': i % 4 + 1,
+            'branch_name': 'Main Campus',
+            'capacity': 40,
+            'is_active': True,
+        }
+        for i in range(n)
+    ]
+
+
+def assignment_rows(n):
+    return [
+        {
+            'id': i,
+            'subject': i % 15 + 1,
+            'subject_name': 'Integrated Science',
+            'classroom': i % 600 + 1,
+            'classroom_name': f'Primary {i % 6 + 1} Nkrumah',
+            'teacher': i % 90 + 1,
+            'teacher_name': 'Abena Owusu',
+            'term': i % 3 + 1,
+            'term_display': f'Term {i % 3 + 1}',
+            'periods_per_week': 5,
+            # Types the stdlib encoder can't handle without a default hook.
+            'fee_weight': decimal.Decimal('12.50'),
+            'updated': datetime.date(2026, 9, 1),
+        }
+        for i in range(n)
+    ]
+
+
+def bench(renderer, payload, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        renderer.render(payload)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    body = renderer.render(payload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    encoders = {'stdlib': renderers._stdlib_dumps}
+    if renderers.orjson is not None:
+        encoders['orjson'] = renderers._orjson_dumps
+
+    payloads = {
+        'classrooms': {'classrooms': classroom_rows(args.rows), 'count': args.rows},
+        'assignments': {'assignments': assignment_rows(args.rows), 'count': args.rows},
+    }
+
+    print(f'{"payload":<12} {"encoder":<8} {"median ms":>10} {"peak KiB":>10} {"body KiB":>10}')
+    for name, payload in payloads.items():
+        for label, encoder in encoders.items():
+            renderer = IlimiAPIRenderer()
+            renderer.dumps = encoder
+            median, peak, size = bench(renderer, payload, args.repeat)
+            print(f'{name:<12} {label:<8} {median * 1000:>10.2f} {peak / 1024:>10.0f} {size / 1024:>10.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""
+SMS gateway client benchmark.
+
+Sends the same bulk workload through the Arkesel backend twice against
+benchmarks.sms_stub:
+
+* ``per-send`` — a new backend (and so a new connection) for every
+  message, which is what every send cost before backends were pooled;
+* ``pooled`` — the process-wide backend from get_sms_backend(), reusing
+  keep-alive connections.
+
+Run it through ``manage.py benchmark_sms``.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.api import Recorder
+
+MODES = ('per-send', 'pooled')
+
+
+def run_sms_benchmark(make_backend, shared_backend, messages=500, concurrency=8):
+    """
+    Send ``messages`` SMS per mode on ``concurrency`` threads.
+
+    ``make_backend`` builds a fresh backend; ``shared_backend`` is the
+    pooled one. Returns the JSON-serialisable report, one entry per mode.
+    """
+    results = {}
+    for mode in MODES:
+        recorder = Recorder()
+
+        def send(i):
+            backend = make_backend() if mode == 'per-send' else shared_backend
+            started = time.perf_counter()
+            result = backend.send(f'+23320{i:07d}', f'Benchmark message {i}')
+            recorder.add(mode, time.perf_counter() - started, 200 if result['status'] == 'success' else 500, None)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(send, range(messages)))
+        results[mode] = recorder.summary(time.perf_counter() - started)[mode]
+    return {'messages': messages, 'concurrency': concurrency, 'modes': results}
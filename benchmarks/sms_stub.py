@@ -0,0 +1,121 @@
+"""
+Local stand-in for the Arkesel SMS gateway.
+
+Accepts the same POST body as https://sms.arkesel.com/api/v2/sms/send,
+waits a configurable latency and fails a configurable share of requests,
+so registration and invite flows can be load-tested offline:
+
+    python -m benchmarks.sms_stub --port 8025 --latency-ms 150 --error-rate 0.02
+
+then run the server with
+
+    SMS_BACKEND=apps.notifications.backends.arkesel.ArkeselSMSBackend
+    ARKESEL_API_URL=http://127.0.0.1:8025/api/v2/sms/send
+
+No Django required. ``manage.py benchmark_api --sms-stub`` starts one
+in-process.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubConfig:
+    def __init__(self, latency_ms=100, jitter_ms=50, error_rate=0.0, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'sent': 0, 'failed': 0, 'recipients': 0}
+
+    def draw(self):
+        """Return (delay in seconds, whether to fail) for one request."""
+        with self.lock:
+            delay = max(0.0, self.random.gauss(self.latency_ms, self.jitter_ms)) / 1000
+            return delay, self.random.random() < self.error_rate
+
+    def count(self, **increments):
+        with self.lock:
+            for key, value in increments.items():
+                self.stats[key] += value
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are separate writes; with Nagle on, keep-alive
+    # clients would wait out a delayed ACK on every response.
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        config = self.server.config
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        try:
+            payload = json.loads(body or b'{}')
+        except ValueError:
+            return self._reply(400, {'status': 'error', 'message': 'Invalid JSON'})
+
+        delay, fail = config.draw()
+        time.sleep(delay)
+        recipients = payload.get('recipients') or []
+        config.count(requests=1)
+        if fail:
+            config.count(failed=1)
+            return self._reply(503, {'status': 'error', 'message': 'Simulated gateway failure'})
+
+        config.count(sent=1, recipients=len(recipients))
+        self._reply(200, {
+            'status': 'success',
+            'data': [{'recipient': r, 'id': str(uuid.uuid4())} for r in recipients],
+        })
+
+    def _reply(self, status, data):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub(port=0, **config):
+    """Start the stub on a daemon thread. Returns the server; ``server.url`` is the send URL."""
+    server = ThreadingHTTPServer(('127.0.0.1', port), StubHandler)
+    server.daemon_threads = True
+    server.config = StubConfig(**config)
+    server.url = f'http://127.0.0.1:{server.server_address[1]}/api/v2/sms/send'
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--port', type=int, default=8025)
+    parser.add_argument('--latency-ms', type=float, default=100)
+    parser.add_argument('--jitter-ms', type=float, default=50)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+
+    server = start_stub(
+        args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate, seed=args.seed,
+    )
+    print(f'SMS stub listening on {server.url} '
+          f'(latency {args.latency_ms}±{args.jitter_ms}ms, error rate {args.error_rate:.0%})')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print(json.dumps(server.config.stats))
+
+
+if __name__ == '__main__':
+    main()
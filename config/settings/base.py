@@ -31,6 +31,7 @@ THIRD_PARTY_APPS = [
 ]
 
 LOCAL_APPS = [
+    'apps.core',
     'apps.public',
     'apps.accounts',
     'apps.tenants',
@@ -50,10 +51,13 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'apps.core.middleware.RequestTimingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.tenants.middleware.TenantContextMiddleware',
+    'apps.core.middleware.ProfilingMiddleware',
     'apps.tenants.middleware.OnboardingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
@@ -72,6 +76,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'apps.tenants.context_processors.tenant',
             ],
         },
     },
@@ -121,10 +126,28 @@ MEDIA_ROOT = BASE_DIR / 'media'
 # Default primary key
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# ── Cache ──────────────────────────────────────────────────────────────────
+# Shared across gunicorn workers when REDIS_URL is set; per-process otherwise,
+# which is only fit for a single-process dev server (production requires it).
+REDIS_URL = env('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # ── Django REST Framework ──────────────────────────────────────────────────
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.accounts.authentication.TenantClaimsJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -134,13 +157,15 @@ REST_FRAMEWORK = {
         'apps.core.renderers.IlimiAPIRenderer',
     ],
     'EXCEPTION_HANDLER': 'apps.core.exceptions.ilimi_exception_handler',
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'apps.core.pagination.IlimiCursorPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
 
 # ── SimpleJWT ──────────────────────────────────────────────────────────────
 SIMPLE_JWT = {
+    # Access tokens carry school/branch/role claims (apps.accounts.tokens),
+    # so this lifetime also bounds how long a revoked role stays usable.
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': True,
@@ -161,11 +186,100 @@ SPECTACULAR_SETTINGS = {
     },
 }
 
+# ── Phone OTPs ─────────────────────────────────────────────────────────────
+# Codes are hashed in the cache (see apps.accounts.services.otp); the
+# PhoneVerificationOTP table is an optional audit trail.
+OTP_TTL_SECONDS = 10 * 60
+OTP_MAX_ATTEMPTS = 3
+OTP_RESEND_SECONDS = 60
+OTP_AUDIT_TO_DB = env.bool('OTP_AUDIT_TO_DB', default=True)
+
 # ── SMS ────────────────────────────────────────────────────────────────────
-SMS_BACKEND = 'apps.notifications.backends.console.ConsoleSMSBackend'
+SMS_BACKEND = env('SMS_BACKEND', default='apps.notifications.backends.console.ConsoleSMSBackend')
 SMS_API_KEY = env('SMS_API_KEY', default='')
 SMS_SENDER_ID = env('SMS_SENDER_ID', default='Ilimi')
+# Point at benchmarks.sms_stub to exercise the Arkesel backend offline.
+ARKESEL_API_URL = env('ARKESEL_API_URL', default='https://sms.arkesel.com/api/v2/sms/send')
+# Gateway HTTP client: seconds to connect / to wait for the response, and
+# keep-alive connections per process (match the outbox worker's --concurrency).
+SMS_CONNECT_TIMEOUT = env.float('SMS_CONNECT_TIMEOUT', default=3.05)
+SMS_READ_TIMEOUT = env.float('SMS_READ_TIMEOUT', default=10)
+SMS_HTTP_POOL_SIZE = env.int('SMS_HTTP_POOL_SIZE', default=16)
+# With SMS_BACKEND=apps.notifications.backends.routing.RoutingSMSBackend, sends
+# go to the fastest healthy provider below and fail over to the next. Keep
+# retries and timeouts low here: failing over beats waiting on a sick gateway.
+SMS_PROVIDERS = {
+    'arkesel': {
+        'BACKEND': 'apps.notifications.backends.arkesel.ArkeselSMSBackend',
+        'OPTIONS': {'retries': 0, 'read_timeout': 5},
+    },
+}
+# Circuit breaker: recent sends tracked per provider, consecutive failures
+# (or failing share of a full window) that open it, and seconds until a probe.
+SMS_ROUTING_WINDOW = 50
+SMS_CIRCUIT_FAILURES = env.int('SMS_CIRCUIT_FAILURES', default=5)
+SMS_CIRCUIT_ERROR_RATE = 0.5
+SMS_CIRCUIT_COOLDOWN_SECONDS = env.int('SMS_CIRCUIT_COOLDOWN_SECONDS', default=30)
+# Broadcasts: numbers per gateway request, and requests in flight at once.
+SMS_BROADCAST_BATCH_SIZE = env.int('SMS_BROADCAST_BATCH_SIZE', default=100)
+SMS_BROADCAST_CONCURRENCY = env.int('SMS_BROADCAST_CONCURRENCY', default=4)
+# A worker's claim on a broadcast, renewed as batches finish; a 'sending'
+# broadcast whose lease runs out (the worker died) is picked up again.
+SMS_BROADCAST_LEASE_SECONDS = env.int('SMS_BROADCAST_LEASE_SECONDS', default=300)
+# Gateway rate limit (token bucket, shared through Redis when REDIS_URL is set).
+# Broadcasts leave SMS_PRIORITY_RESERVE of the burst for OTPs and other outbox
+# messages, and each school's broadcasts get SMS_SCHOOL_SHARE of the rate.
+# SMS_RATE_PER_SECOND=0 disables limiting.
+SMS_RATE_PER_SECOND = env.float('SMS_RATE_PER_SECOND', default=50)
+SMS_RATE_BURST = env.float('SMS_RATE_BURST', default=250)
+SMS_SCHOOL_SHARE = env.float('SMS_SCHOOL_SHARE', default=0.5)
+SMS_PRIORITY_RESERVE = env.float('SMS_PRIORITY_RESERVE', default=0.2)
+# Outbox: messages queued in a transaction are sent by `manage.py sms_outbox_worker`.
+# SMS_OUTBOX_EAGER sends right after commit instead (no worker needed).
+SMS_OUTBOX_EAGER = env.bool('SMS_OUTBOX_EAGER', default=False)
+SMS_OUTBOX_MAX_ATTEMPTS = env.int('SMS_OUTBOX_MAX_ATTEMPTS', default=6)
+SMS_OUTBOX_RETRY_BASE_SECONDS = 15
+SMS_OUTBOX_RETRY_MAX_SECONDS = 30 * 60
+SMS_OUTBOX_LEASE_SECONDS = 120
+# Message text (OTP codes, temporary passwords) is cleared once a row won't
+# be sent again; sent and failed rows are cleared after this long (failed
+# ones can be retried from the admin until then). Finished rows are deleted
+# after the retention period.
+SMS_OUTBOX_REDACT_AFTER_SECONDS = env.int('SMS_OUTBOX_REDACT_AFTER_SECONDS', default=24 * 60 * 60)
+SMS_OUTBOX_RETENTION_DAYS = env.int('SMS_OUTBOX_RETENTION_DAYS', default=30)
+# Shared secret in the delivery-report webhook URL (?token=...).
+SMS_DELIVERY_REPORT_TOKEN = env('SMS_DELIVERY_REPORT_TOKEN', default='')
 
 # ── Paystack ───────────────────────────────────────────────────────────────
 PAYSTACK_PUBLIC_KEY = env('PAYSTACK_PUBLIC_KEY', default='')
-PAYSTACK_SECRET_KEY = env('PAYSTACK_SECRET_KEY', default='')
\ No newline at end of file
+PAYSTACK_SECRET_KEY = env('PAYSTACK_SECRET_KEY', default='')
+# ── Metrics ────────────────────────────────────────────────────────────────
+# /metrics needs this bearer token; without one it is only served in DEBUG.
+# Under gunicorn also set PROMETHEUS_MULTIPROC_DIR (see config/gunicorn.py).
+METRICS_TOKEN = env('METRICS_TOKEN', default='')
+# School ids with their own tenant label; the rest share this many
+# buckets, so tenant series stay bounded across workers and restarts.
+METRICS_TENANTS = env.list('METRICS_TENANTS', cast=int, default=[])
+METRICS_TENANT_BUCKETS = env.int('METRICS_TENANT_BUCKETS', default=16)
+
+# ── Logging ────────────────────────────────────────────────────────────────
+# One line per request from RequestTimingMiddleware, at INFO. Only
+# production logs them by default (see production.py); set
+# REQUEST_LOG_LEVEL=INFO to see them locally.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'plain': {'format': '%(asctime)s %(levelname)s %(name)s %(message)s'},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'plain'},
+    },
+    'loggers': {
+        'ilimi.requests': {
+            'handlers': ['console'],
+            'level': env('REQUEST_LOG_LEVEL', default='WARNING'),
+            'propagate': False,
+        },
+    },
+}
@@ -12,4 +12,7 @@ DATABASES = {
     }
 }
 
-EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
\ No newline at end of file
+EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+
+# Print SMS as soon as the request commits, without running the outbox worker.
+SMS_OUTBOX_EAGER = env.bool('SMS_OUTBOX_EAGER', default=True)
@@ -1,13 +1,22 @@
+from django.core.exceptions import ImproperlyConfigured
 from .base import *
 
 DEBUG = False
 
 ALLOWED_HOSTS = env.list('ALLOWED_HOSTS')
 
+# OTP codes, their attempt counters and resend throttles live only in the
+# cache; a per-process cache would let each worker verify (and count
+# guesses) on its own.
+if not REDIS_URL:
+    raise ImproperlyConfigured('Set REDIS_URL: production needs a cache shared by every worker.')
+
 # Security settings
 SECURE_SSL_REDIRECT = True
 SECURE_HSTS_SECONDS = 31536000
 SECURE_HSTS_INCLUDE_SUBDOMAINS = True
 SECURE_HSTS_PRELOAD = True
 SESSION_COOKIE_SECURE = True
-CSRF_COOKIE_SECURE = True
\ No newline at end of file
+CSRF_COOKIE_SECURE = True
+# Log every request (RequestTimingMiddleware).
+LOGGING['loggers']['ilimi.requests']['level'] = env('REQUEST_LOG_LEVEL', default='INFO')